@@ -0,0 +1,210 @@
+"""
+Stub Local da API Pokémon
+
+Este módulo sobe um servidor HTTP local que imita os endpoints usados pela
+coleta (`/login`, `/health`, `/pokemon`, `/pokemon/<id>` e `/combats`),
+servindo dados sintéticos (com gzip quando o cliente aceita). Permite injetar
+latência e erros para medir o comportamento da ingestão sem depender da API
+real.
+
+Uso:
+    servidor, url = iniciar_stub(df_atributos, df_combates, latencia_ms=5)
+    os.environ["BASE_URL"] = url
+    ...
+    servidor.shutdown()
+"""
+
+import base64
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TOKEN_STUB = "token-stub"
+
+
+# ------------------ Handler HTTP ------------------ #
+
+
+class _HandlerStub(BaseHTTPRequestHandler):
+    """Responde às rotas da API a partir dos dados do servidor."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # silencia o log padrão por requisição
+
+    def _responder(self, status: int, corpo: dict):
+        conteudo = json.dumps(corpo).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            conteudo = gzip.compress(conteudo)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(conteudo)))
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def _simular_rede(self) -> bool:
+        """
+        Aplica a latência configurada e sorteia falhas.
+
+        Retorna:
+            bool: True se a requisição deve falhar com erro 500.
+        """
+        config = self.server.config
+        if config["latencia_ms"]:
+            time.sleep(config["latencia_ms"] / 1000)
+        self.server.requisicoes += 1
+        return random.random() < config["taxa_erro"]
+
+    def _emitir_token(self) -> str:
+        """Emite TOKEN_STUB ou, com validade configurada, um JWT com 'exp'."""
+        validade = self.server.config["validade_token_s"]
+        if not validade:
+            return TOKEN_STUB
+
+        def b64(dados: dict) -> str:
+            bruto = json.dumps(dados).encode("utf-8")
+            return base64.urlsafe_b64encode(bruto).decode().rstrip("=")
+
+        exp = time.time() + validade
+        payload = {"sub": "stub", "exp": exp, "n": self.server.logins}
+        token = f"{b64({'alg': 'none'})}.{b64(payload)}.stub"
+        self.server.tokens[token] = exp
+        return token
+
+    def _autorizado(self) -> bool:
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        if token == TOKEN_STUB:
+            return True
+        return self.server.tokens.get(token, 0) > time.time()
+
+    def do_POST(self):
+        tamanho = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(tamanho)
+        if self._simular_rede():
+            return self._responder(500, {"detail": "erro injetado"})
+        if urlparse(self.path).path == "/login":
+            self.server.logins += 1
+            return self._responder(200, {"access_token": self._emitir_token()})
+        self._responder(404, {"detail": "não encontrado"})
+
+    def do_GET(self):
+        if self._simular_rede():
+            return self._responder(500, {"detail": "erro injetado"})
+        if not self._autorizado():
+            return self._responder(401, {"detail": "não autorizado"})
+
+        url = urlparse(self.path)
+        partes = [p for p in url.path.split("/") if p]
+        query = parse_qs(url.query)
+        pagina = int(query.get("page", ["1"])[0])
+        por_pagina = int(query.get("per_page", ["50"])[0])
+
+        if partes == ["health"]:
+            return self._responder(200, {"status": "ok", "stub": True})
+        if partes == ["pokemon"]:
+            return self._responder(
+                200, self._pagina("pokemons", self.server.pokemons, pagina, por_pagina)
+            )
+        if len(partes) == 2 and partes[0] == "pokemon":
+            detalhe = self.server.detalhes.get(int(partes[1]))
+            if detalhe is None:
+                return self._responder(404, {"detail": "Pokémon não encontrado"})
+            return self._responder(200, detalhe)
+        if partes == ["combats"]:
+            return self._responder(
+                200, self._pagina("combats", self.server.combates, pagina, por_pagina)
+            )
+        self._responder(404, {"detail": "não encontrado"})
+
+    def _pagina(self, chave: str, itens: list, pagina: int, por_pagina: int) -> dict:
+        """Fatia `itens` e anexa metadados de paginação (total, páginas, next)."""
+        por_pagina = max(1, min(por_pagina, self.server.config["por_pagina_max"]))
+        inicio = (pagina - 1) * por_pagina
+        total_paginas = -(-len(itens) // por_pagina)
+        return {
+            chave: itens[inicio : inicio + por_pagina],
+            "page": pagina,
+            "per_page": por_pagina,
+            "total": len(itens),
+            "total_pages": total_paginas,
+            "next": pagina + 1 if pagina < total_paginas else None,
+        }
+
+
+# ------------------ Inicialização ------------------ #
+
+
+def iniciar_stub(
+    df_atributos,
+    df_combates,
+    latencia_ms=0,
+    taxa_erro=0.0,
+    porta=0,
+    host="127.0.0.1",
+    por_pagina_max=100,
+    validade_token_s=None,
+):
+    """
+    Sobe o stub da API em uma thread daemon.
+
+    Args:
+        df_atributos (pd.DataFrame): Atributos (de `gerador_sintetico.gerar_atributos`).
+        df_combates (pd.DataFrame): Combates servidos em '/combats'.
+        latencia_ms (float, optional): Latência artificial por requisição.
+        taxa_erro (float, optional): Probabilidade (0–1) de responder com erro 500.
+        porta (int, optional): Porta TCP; 0 escolhe uma porta livre.
+        host (str, optional): Endereço de escuta.
+        por_pagina_max (int, optional): Limite de `per_page` aplicado pelo servidor.
+        validade_token_s (float, optional): Se informado, o login emite JWTs que
+            expiram após esse tempo (requisições com token vencido recebem 401).
+
+    Returns:
+        tuple: (servidor, url_base). Use `servidor.shutdown()` para encerrar.
+    """
+    servidor = ThreadingHTTPServer((host, porta), _HandlerStub)
+    servidor.daemon_threads = True
+    servidor.config = {
+        "latencia_ms": latencia_ms,
+        "taxa_erro": taxa_erro,
+        "por_pagina_max": por_pagina_max,
+        "validade_token_s": validade_token_s,
+    }
+    servidor.requisicoes = 0
+    servidor.logins = 0
+    servidor.tokens = {}
+
+    registros = df_atributos.to_dict("records")
+    servidor.pokemons = [{"id": int(r["ID"]), "name": r["Nome"]} for r in registros]
+    servidor.detalhes = {
+        int(r["ID"]): {
+            "id": int(r["ID"]),
+            "name": r["Nome"],
+            "hp": int(r["Hp"]),
+            "attack": int(r["Attack"]),
+            "defense": int(r["Defense"]),
+            "sp_attack": int(r["Sp_attack"]),
+            "sp_defense": int(r["Sp_defense"]),
+            "speed": int(r["Speed"]),
+            "generation": int(r["Generation"]),
+            "legendary": bool(r["Legendary"]),
+            "types": r["Types"],
+        }
+        for r in registros
+    }
+    servidor.combates = [
+        {"first_pokemon": int(a), "second_pokemon": int(b), "winner": int(w)}
+        for a, b, w in df_combates[
+            ["first_pokemon", "second_pokemon", "winner"]
+        ].itertuples(index=False)
+    ]
+
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://{host}:{servidor.server_address[1]}"
+    print(f"🧪 Stub da API ativo em {url}")
+    return servidor, url
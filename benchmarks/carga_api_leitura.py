@@ -0,0 +1,224 @@
+"""
+Teste de Carga da API de Leitura
+
+Sobe `src/api_leitura.py` em um processo separado (ou usa --url de uma
+instância já em execução) e dispara requisições concorrentes por um tempo
+fixo, com conexões keep-alive e `Accept-Encoding: gzip` (metade das
+requisições nas rotas agregadas, metade em qualquer rota). Uma fração das
+requisições repete o ETag já recebido (If-None-Match), como um cliente com
+cache faria.
+
+Reporta requisições/s e latências p50/p99 no total e por tipo de resposta
+(200 com gzip, 200 sem gzip, 304).
+
+Requer um snapshot publicado (etapa `analyze`) ou o banco configurado no
+diretório de trabalho.
+
+Uso:
+    python benchmarks/carga_api_leitura.py --diretorio /caminho/do/projeto
+    python benchmarks/carga_api_leitura.py --url http://127.0.0.1:8090 --clientes 16
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import quote, urlparse
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROTAS_FIXAS = [
+    "/v1/top10/vitorias",
+    "/v1/top10/derrotas",
+    "/v1/atributos/comparativo",
+    "/v1/atributos/top10",
+    "/v1/pokemons",
+    "/v1/versao",
+]
+
+
+# ------------------ Servidor ------------------ #
+
+
+def _porta_livre() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def iniciar_servidor(diretorio: str, espera_s: float = 30.0):
+    """
+    Inicia a API de leitura em um subprocesso e aguarda /saude responder.
+
+    Args:
+        diretorio (str): Diretório de trabalho (com 'out/snapshots').
+        espera_s (float, optional): Tempo máximo de inicialização.
+
+    Returns:
+        tuple: (subprocess.Popen, url base).
+    """
+    porta = _porta_livre()
+    ambiente = {**os.environ, "API_LEITURA_PORTA": str(porta)}
+    processo = subprocess.Popen(
+        [sys.executable, os.path.join(RAIZ, "src", "api_leitura.py")],
+        cwd=diretorio,
+        env=ambiente,
+        stdout=subprocess.DEVNULL,
+    )
+    limite = time.monotonic() + espera_s
+    while time.monotonic() < limite:
+        try:
+            conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=1)
+            conexao.request("GET", "/saude")
+            if conexao.getresponse().status == 200:
+                return processo, f"http://127.0.0.1:{porta}"
+        except OSError:
+            time.sleep(0.1)
+    processo.terminate()
+    raise RuntimeError("❌ API de leitura não respondeu a tempo.")
+
+
+# ------------------ Carga ------------------ #
+
+
+def rotas_disponiveis(url: str) -> list:
+    """Rotas fixas mais uma rota por Pokémon listado em /v1/pokemons."""
+    destino = urlparse(url)
+    conexao = http.client.HTTPConnection(destino.hostname, destino.port, timeout=10)
+    conexao.request("GET", "/v1/pokemons")
+    resposta = conexao.getresponse()
+    corpo = resposta.read()
+    if resposta.status != 200:
+        raise RuntimeError(f"❌ /v1/pokemons respondeu {resposta.status}: {corpo!r}")
+    nomes = [linha["Pokemon"] for linha in json.loads(corpo)["itens"]]
+    return ROTAS_FIXAS + [f"/v1/pokemons/{quote(str(nome))}" for nome in nomes]
+
+
+def _cliente(url, rotas, fim, revalidacao, semente, amostras):
+    destino = urlparse(url)
+    aleatorio = random.Random(semente)
+    conexao = http.client.HTTPConnection(destino.hostname, destino.port, timeout=10)
+    etags = {}
+    while time.monotonic() < fim:
+        # Metade das requisições nas rotas agregadas, mais acessadas
+        rota = aleatorio.choice(ROTAS_FIXAS if aleatorio.random() < 0.5 else rotas)
+        cabecalhos = {"Accept-Encoding": "gzip"}
+        if rota in etags and aleatorio.random() < revalidacao:
+            cabecalhos["If-None-Match"] = etags[rota]
+        inicio = time.perf_counter()
+        try:
+            conexao.request("GET", rota, headers=cabecalhos)
+            resposta = conexao.getresponse()
+            resposta.read()
+        except (OSError, http.client.HTTPException):
+            conexao.close()
+            amostras.append(("erro", time.perf_counter() - inicio))
+            continue
+        duracao = time.perf_counter() - inicio
+        if resposta.getheader("ETag"):
+            etags[rota] = resposta.getheader("ETag")
+        if resposta.status == 200:
+            tipo = "200_gzip" if resposta.getheader("Content-Encoding") else "200"
+        else:
+            tipo = str(resposta.status)
+        amostras.append((tipo, duracao))
+
+
+def _percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def executar_carga(
+    url: str, clientes: int, duracao_s: float, revalidacao: float
+) -> dict:
+    """
+    Dispara requisições concorrentes e resume as latências.
+
+    Args:
+        url (str): URL base da API.
+        clientes (int): Conexões concorrentes.
+        duracao_s (float): Duração do teste.
+        revalidacao (float): Fração de requisições com If-None-Match (0 a 1).
+
+    Returns:
+        dict: Total, requisições/s e p50/p99 (ms), no geral e por tipo.
+    """
+    rotas = rotas_disponiveis(url)
+    amostras = []
+    fim = time.monotonic() + duracao_s
+    threads = [
+        threading.Thread(
+            target=_cliente, args=(url, rotas, fim, revalidacao, i, amostras)
+        )
+        for i in range(clientes)
+    ]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    decorrido = time.perf_counter() - inicio
+
+    def resumir(latencias):
+        return {
+            "requisicoes": len(latencias),
+            "p50_ms": round(_percentil(latencias, 50) * 1000, 3),
+            "p99_ms": round(_percentil(latencias, 99) * 1000, 3),
+        }
+
+    resultado = {
+        "rotas": len(rotas),
+        "clientes": clientes,
+        "requisicoes_s": round(len(amostras) / decorrido, 1),
+        **resumir([d for _, d in amostras]),
+        "por_tipo": {},
+    }
+    for tipo in sorted({t for t, _ in amostras}):
+        resultado["por_tipo"][tipo] = resumir([d for t, d in amostras if t == tipo])
+    return resultado
+
+
+# ------------------ Execução ------------------ #
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga da API de leitura.")
+    parser.add_argument("--url", help="API já em execução (padrão: sobe uma local)")
+    parser.add_argument("--diretorio", default=".", help="Diretório com 'out/'")
+    parser.add_argument("--clientes", type=int, default=8)
+    parser.add_argument("--duracao", type=float, default=10.0)
+    parser.add_argument("--revalidacao", type=float, default=0.5)
+    args = parser.parse_args()
+
+    processo = None
+    url = args.url
+    if not url:
+        processo, url = iniciar_servidor(os.path.abspath(args.diretorio))
+    try:
+        resultado = executar_carga(url, args.clientes, args.duracao, args.revalidacao)
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+    print(
+        f"📊 {resultado['requisicoes']} requisições em {args.duracao:.0f}s "
+        f"({resultado['clientes']} clientes, {resultado['rotas']} rotas): "
+        f"{resultado['requisicoes_s']:,.0f} req/s, "
+        f"p50 {resultado['p50_ms']:.2f} ms, p99 {resultado['p99_ms']:.2f} ms"
+    )
+    for tipo, dados in resultado["por_tipo"].items():
+        print(
+            f"   {tipo}: {dados['requisicoes']} requisições, "
+            f"p50 {dados['p50_ms']:.2f} ms, p99 {dados['p99_ms']:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,584 @@
+"""
+Suíte de Benchmarks do Pipeline Pokémon
+
+Executa o pipeline completo sobre dados sintéticos, sem a API real e sem o
+PostgreSQL remoto, cronometrando cada etapa:
+
+- geracao: criação do dataset sintético
+- ingestao: coleta via stub local da API (com latência/erros injetáveis)
+- csv_escrita / csv_leitura: I/O de CSV dos combates
+- csv_escritor_*: vazão de `escrita_csv` por motor/compressão vs DictWriter
+- similaridade_*: índice de vizinhos por atributos (construção e consultas)
+  vs varredura bruta com pandas
+- decodificacao_*: páginas JSON da API decodificadas em registros (json + dict
+  por registro vs `decodificacao`), sem e com gzip
+- parquet_escrita / parquet_leitura: I/O de Parquet dos combates
+- carga_banco: inserção das tabelas (SQLite local ou PostgreSQL via --db-url)
+- carga_merge_*: recarga incremental de atributos_pokemon vs substituição completa
+- estatisticas: análise completa em lotes (`inicializar_dados`): estatísticas,
+  segmentos, top 10, comparativo, resumo e figuras
+- relatorio: geração do dashboard HTML
+
+Os resultados são acrescentados em 'benchmarks/resultados/historico.jsonl' e
+comparados com a execução anterior de mesmos parâmetros para detectar regressões.
+
+Uso:
+    python benchmarks/executar_benchmarks.py --combates 100000
+    python benchmarks/executar_benchmarks.py --combates 1000 --latencia-ms 20 --taxa-erro 0.01
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+HISTORICO = os.path.join(RAIZ, "benchmarks", "resultados", "historico.jsonl")
+LIMITE_COMBATES_API = 50_000  # combates servidos pelo stub (mantém a etapa HTTP curta)
+
+
+# ------------------ Utilitários ------------------ #
+
+
+@contextmanager
+def cronometrar(etapa: str, resultados: dict):
+    """
+    Mede o tempo de parede de uma etapa e o registra em `resultados`.
+
+    Args:
+        etapa (str): Nome da etapa.
+        resultados (dict): Dicionário {etapa: segundos} a ser preenchido.
+    """
+    print(f"⏱️  {etapa}...")
+    inicio = time.perf_counter()
+    yield
+    resultados[etapa] = round(time.perf_counter() - inicio, 4)
+    print(f"   {etapa}: {resultados[etapa]:.3f}s")
+
+
+def commit_atual():
+    """
+    Retorna o hash curto do commit atual, se disponível.
+
+    Returns:
+        str ou None: Hash do commit.
+    """
+    try:
+        return subprocess.check_output(
+            ["git", "-C", RAIZ, "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ------------------ Etapas ------------------ #
+
+
+def benchmark_ingestao(df_atributos, df_combates, args, resultados):
+    """
+    Executa a coleta completa (pokemons, atributos e combates) contra o stub.
+
+    Args:
+        df_atributos (pd.DataFrame): Atributos servidos pelo stub.
+        df_combates (pd.DataFrame): Combates servidos pelo stub.
+        args (argparse.Namespace): Parâmetros do benchmark.
+        resultados (dict): Tempos por etapa.
+    """
+    from api_stub import iniciar_stub
+
+    servidor, url = iniciar_stub(
+        df_atributos,
+        df_combates.head(LIMITE_COMBATES_API),
+        latencia_ms=args.latencia_ms,
+        taxa_erro=args.taxa_erro,
+    )
+    os.environ["BASE_URL"] = url
+    os.environ["API_PAUSA_PAGINA"] = "0"
+    os.environ["API_PAUSA_DETALHE"] = "0"
+    os.environ.setdefault("API_USERNAME", "stub")
+    os.environ.setdefault("API_PASSWORD", "stub")
+
+    import obtencao_dados
+
+    try:
+        with cronometrar("ingestao", resultados):
+            token = obtencao_dados.criar_gerenciador_token()
+            lista_pokemon = obtencao_dados.obter_dados_pokemon(token)
+            obtencao_dados.transformar_csv(lista_pokemon, "pokemons")
+            lista_atributos = obtencao_dados.obter_atributos_pokemon(token)
+            obtencao_dados.transformar_csv(lista_atributos, "atributos_pokemon")
+            lista_combates = obtencao_dados.obter_dados_combate(token)
+            obtencao_dados.transformar_csv(lista_combates, "combates")
+        resultados["ingestao_requisicoes"] = servidor.requisicoes
+    finally:
+        servidor.shutdown()
+
+
+def benchmark_io(diretorio, resultados):
+    """
+    Mede leitura e escrita dos combates em CSV e Parquet.
+
+    Args:
+        diretorio (str): Diretório com 'combates.csv'.
+        resultados (dict): Tempos por etapa.
+    """
+    import pandas as pd
+
+    caminho_csv = os.path.join(diretorio, "combates.csv")
+    with cronometrar("csv_leitura", resultados):
+        df = pd.read_csv(caminho_csv)
+    with cronometrar("csv_escrita", resultados):
+        df.to_csv(os.path.join(diretorio, "combates_copia.csv"), index=False)
+
+    try:
+        caminho_parquet = os.path.join(diretorio, "combates.parquet")
+        with cronometrar("parquet_escrita", resultados):
+            df.to_parquet(caminho_parquet, index=False)
+        with cronometrar("parquet_leitura", resultados):
+            pd.read_parquet(caminho_parquet)
+    except ImportError:
+        print("⚠️ pyarrow não instalado; benchmark de Parquet ignorado.")
+
+
+def benchmark_escrita_csv(diretorio, resultados):
+    """
+    Mede a vazão (linhas/s) de `escrita_csv.escrever_csv` em cada motor e
+    compressão, contra o escritor anterior (`csv.DictWriter`, um `writerow`
+    por registro).
+
+    Args:
+        diretorio (str): Diretório com 'combates.csv'.
+        resultados (dict): Tempos por etapa.
+    """
+    import csv
+    import pandas as pd
+    from escrita_csv import escrever_csv
+
+    df_combates = pd.read_csv(os.path.join(diretorio, "combates.csv"))
+    registros = df_combates.to_dict("records")
+    tuplas = list(df_combates.itertuples(index=False, name=None))
+    destino = os.path.join(diretorio, "escrita_csv")
+    os.makedirs(destino, exist_ok=True)
+
+    with cronometrar("csv_escritor_dictwriter", resultados):
+        with open(
+            os.path.join(destino, "dictwriter.csv"), "w", newline="", encoding="utf-8"
+        ) as arquivo:
+            writer = csv.DictWriter(
+                arquivo, fieldnames=["first_pokemon", "second_pokemon", "winner"]
+            )
+            writer.writeheader()
+            for item in registros:
+                writer.writerow(item)
+
+    variantes = [("csv", "nenhuma"), ("arrow", "nenhuma"), ("arrow", "gzip")]
+    try:
+        import zstandard  # noqa: F401
+
+        variantes.append(("arrow", "zstd"))
+    except ImportError:
+        print("⚠️ zstandard não instalado; variante zstd ignorada.")
+    for motor, compressao in variantes:
+        with cronometrar(f"csv_escritor_{motor}_{compressao}", resultados):
+            escrever_csv(tuplas, "combates", destino, motor, compressao)
+
+    referencia = resultados["csv_escritor_dictwriter"]
+    for etapa in [e for e in resultados if e.startswith("csv_escritor_")]:
+        vazao = len(registros) / resultados[etapa]
+        print(
+            f"   {etapa}: {vazao:,.0f} linhas/s ({referencia / resultados[etapa]:.1f}x)"
+        )
+
+
+def benchmark_decodificacao(diretorio, resultados, paginas=500, por_pagina=100):
+    """
+    Mede a decodificação de páginas de combates da API: `json.loads` e um
+    dicionário novo por registro (coleta anterior) contra `decodificacao`
+    (decodificador rápido + tuplas por esquema), sobre corpos crus e gzip.
+
+    Args:
+        diretorio (str): Diretório com 'combates.csv'.
+        resultados (dict): Tempos por etapa.
+        paginas (int, optional): Páginas simuladas.
+        por_pagina (int, optional): Combates por página.
+    """
+    import gzip
+    import pandas as pd
+    from decodificacao import DECODIFICADOR, decodificar_json, registros
+
+    df_combates = pd.read_csv(os.path.join(diretorio, "combates.csv"))
+    itens = df_combates.to_dict("records")
+    total = paginas * por_pagina
+    itens = (itens * (total // max(1, len(itens)) + 1))[:total]
+    corpos = [
+        json.dumps(
+            {"combats": itens[i : i + por_pagina], "page": i // por_pagina + 1}
+        ).encode("utf-8")
+        for i in range(0, total, por_pagina)
+    ]
+    comprimidos = [gzip.compress(corpo) for corpo in corpos]
+
+    def anterior(corpo):
+        return [
+            {
+                "first_pokemon": c.get("first_pokemon"),
+                "second_pokemon": c.get("second_pokemon"),
+                "winner": c.get("winner"),
+            }
+            for c in json.loads(corpo.decode("utf-8")).get("combats", [])
+        ]
+
+    def atual(corpo):
+        return registros(decodificar_json(corpo).get("combats", []), "combates")
+
+    for nome, decodificar in (("json_dict", anterior), (DECODIFICADOR, atual)):
+        with cronometrar(f"decodificacao_{nome}", resultados):
+            for corpo in corpos:
+                decodificar(corpo)
+        with cronometrar(f"decodificacao_{nome}_gzip", resultados):
+            for corpo in comprimidos:
+                decodificar(gzip.decompress(corpo))
+
+    bruto, reduzido = sum(map(len, corpos)), sum(map(len, comprimidos))
+    print(
+        f"   {paginas} páginas x {por_pagina}: {bruto / 1e6:.1f} MB crus, "
+        f"{reduzido / 1e6:.1f} MB com gzip ({bruto / reduzido:.1f}x menos na rede)"
+    )
+    referencia = resultados["decodificacao_json_dict"]
+    for etapa in [e for e in resultados if e.startswith("decodificacao_")]:
+        print(
+            f"   {etapa}: {total / resultados[etapa]:,.0f} registros/s "
+            f"({referencia / resultados[etapa]:.1f}x)"
+        )
+
+
+def benchmark_banco(diretorio, resultados):
+    """
+    Mede a carga das três tabelas base no banco configurado em DATABASE_URL.
+
+    Args:
+        diretorio (str): Diretório com os CSVs.
+        resultados (dict): Tempos por etapa.
+    """
+    import pandas as pd
+    from tratamento_dados import remover_duplicados, conectar_banco
+
+    dfs = {
+        nome: pd.read_csv(os.path.join(diretorio, f"{nome}.csv"))
+        for nome in ["pokemons", "atributos_pokemon", "combates"]
+    }
+    dfs["combates"] = remover_duplicados(dfs["combates"])
+    with cronometrar("carga_banco", resultados):
+        for nome, df in dfs.items():
+            conectar_banco(df, nome)
+
+
+def benchmark_carga_merge(diretorio, resultados):
+    """
+    Mede a recarga de atributos_pokemon por merge (sem mudanças e com 1% das
+    linhas alteradas) contra a substituição completa da tabela. Verifica também
+    que recarregar as mesmas linhas com outro dtype (Hp como float) não marca
+    nenhuma como atualizada.
+
+    Args:
+        diretorio (str): Diretório com os CSVs.
+        resultados (dict): Tempos por etapa.
+    """
+    import pandas as pd
+    from banco_conexao import obter_engine
+    from tratamento_dados import mesclar_dados, inserir_dados
+
+    engine = obter_engine()
+    df = pd.read_csv(os.path.join(diretorio, "atributos_pokemon.csv"))
+    with cronometrar("carga_merge_sem_mudancas", resultados):
+        mesclar_dados(df, engine, "atributos_pokemon")
+    with cronometrar("carga_merge_outro_dtype", resultados):
+        recarga = mesclar_dados(
+            df.astype({"Hp": "float64"}), engine, "atributos_pokemon"
+        )
+    if recarga["atualizadas"]:
+        raise RuntimeError(
+            f"❌ Recarga sem mudanças marcou {recarga['atualizadas']} linhas "
+            "como atualizadas (hash dependente do dtype)."
+        )
+    alterado = df.copy()
+    linhas = max(1, len(df) // 100)
+    alterado.loc[alterado.index[:linhas], "Hp"] = -1
+    with cronometrar("carga_merge_1pct", resultados):
+        mesclar_dados(alterado, engine, "atributos_pokemon")
+    with cronometrar("carga_replace_atributos", resultados):
+        inserir_dados(df, engine, "atributos_pokemon_replace")
+
+
+def benchmark_analise(resultados):
+    """
+    Mede a análise (o mesmo caminho em lotes da etapa `analyze`) e a geração
+    do relatório HTML.
+
+    Args:
+        resultados (dict): Tempos por etapa.
+    """
+    import analisar_dados_banco as analise
+
+    with cronometrar("estatisticas", resultados):
+        analise.inicializar_dados(recalcular=True)
+    with cronometrar("relatorio", resultados):
+        analise.gerar_dashboard()
+
+
+def benchmark_intermediarios(resultados):
+    """
+    Mede a análise completa em cada modo de persistência de combates_com_nomes.
+
+    Args:
+        resultados (dict): Tempos por etapa.
+    """
+    import analisar_dados_banco as analise
+
+    for modo in analise.MODOS_INTERMEDIARIOS:
+        os.environ["ANALISE_INTERMEDIARIOS"] = modo
+        with cronometrar(f"intermediarios_{modo}", resultados):
+            analise.inicializar_dados(recalcular=True)
+    os.environ.pop("ANALISE_INTERMEDIARIOS")
+
+    tempo_tabela = resultados["intermediarios_tabela"]
+    for modo in ("view", "nenhum"):
+        economia = tempo_tabela - resultados[f"intermediarios_{modo}"]
+        print(f"   economia do modo {modo} vs tabela: {economia:.3f}s")
+
+
+def benchmark_segmentos(diretorio, resultados):
+    """
+    Mede as estatísticas por segmento com 1 processo e com todos os núcleos.
+
+    Args:
+        diretorio (str): Diretório com os CSVs.
+        resultados (dict): Tempos por etapa.
+    """
+    import pandas as pd
+    import analise_paralela
+    from analise_paralela import estatisticas_segmentos, PROCESSOS
+
+    df_attr = pd.read_csv(os.path.join(diretorio, "atributos_pokemon.csv"))
+    df_combates = pd.read_csv(os.path.join(diretorio, "combates.csv"))
+    analise_paralela.LIMIAR_PARALELO = 0  # mede o pool mesmo em bases pequenas
+    with cronometrar("segmentos_1proc", resultados):
+        estatisticas_segmentos(df_combates, df_attr, processos=1)
+    if PROCESSOS > 1:
+        with cronometrar(f"segmentos_{PROCESSOS}proc", resultados):
+            estatisticas_segmentos(df_combates, df_attr, processos=PROCESSOS)
+
+
+def benchmark_elo(diretorio, resultados):
+    """
+    Mede o rating Elo completo contra a retomada com 1% de combates novos.
+
+    Args:
+        diretorio (str): Diretório com os CSVs.
+        resultados (dict): Tempos por etapa.
+    """
+    import pandas as pd
+    from rating_elo import EstadoElo
+
+    df_combates = pd.read_csv(os.path.join(diretorio, "combates.csv"))
+    corte = len(df_combates) - max(1, len(df_combates) // 100)
+    with cronometrar("elo_completo", resultados):
+        EstadoElo().consumir([df_combates])
+    estado = EstadoElo()
+    estado.consumir([df_combates.iloc[:corte]])
+    with cronometrar("elo_incremental_1pct", resultados):
+        estado.consumir([df_combates])
+
+
+def benchmark_similaridade(diretorio, resultados, consultas=500):
+    """
+    Mede o índice de similaridade: construção e consultas "mais parecidos com
+    X" e "contrapartes do top 10", contra uma varredura bruta com pandas
+    (padronização e distância a todos os Pokémon em cada consulta).
+
+    Args:
+        diretorio (str): Diretório com 'atributos_pokemon.csv'.
+        resultados (dict): Tempos por etapa.
+        consultas (int, optional): Consultas "mais parecidos com X".
+    """
+    import random
+    import pandas as pd
+    from resumo_dashboard import ATRIBUTOS
+    from similaridade import construir_indice_similaridade
+
+    df_attr = pd.read_csv(os.path.join(diretorio, "atributos_pokemon.csv"))
+    with cronometrar("similaridade_construcao", resultados):
+        indice = construir_indice_similaridade(df_attr)
+    sorteados = random.Random(0).choices(indice.ids.tolist(), k=consultas)
+    top10 = sorteados[:10]
+
+    def varredura(pokemon_id, k):
+        valores = df_attr.drop_duplicates("ID").set_index("ID")[ATRIBUTOS]
+        padronizado = (valores - valores.mean()) / valores.std(ddof=0)
+        distancias = ((padronizado - padronizado.loc[pokemon_id]) ** 2).sum(
+            axis=1
+        ) ** 0.5
+        return distancias.drop(pokemon_id).nsmallest(k)
+
+    with cronometrar("similaridade_consultas_indice", resultados):
+        for pokemon_id in sorteados:
+            indice.vizinhos_de(pokemon_id, 10)
+    with cronometrar("similaridade_consultas_pandas", resultados):
+        for pokemon_id in sorteados:
+            varredura(pokemon_id, 10)
+    with cronometrar("similaridade_top10_indice", resultados):
+        indice.contrapartes(top10, k=3)
+    with cronometrar("similaridade_top10_pandas", resultados):
+        for pokemon_id in top10:
+            varredura(pokemon_id, 3)
+
+    for metodo in ("indice", "pandas"):
+        por_consulta = resultados[f"similaridade_consultas_{metodo}"] / consultas
+        print(f"   {metodo}: {por_consulta * 1e6:,.1f} µs por consulta (k=10)")
+    ganho = (
+        resultados["similaridade_consultas_pandas"]
+        / resultados["similaridade_consultas_indice"]
+    )
+    print(f"   índice {ganho:,.0f}x mais rápido que a varredura com pandas")
+
+
+# ------------------ Histórico ------------------ #
+
+
+def comparar_com_historico(registro: dict, limite: float) -> list:
+    """
+    Compara os tempos com a última execução de mesmos parâmetros.
+
+    Args:
+        registro (dict): Resultado da execução atual.
+        limite (float): Aumento relativo tolerado (ex.: 0.2 = 20%).
+
+    Returns:
+        list[str]: Etapas que regrediram além do limite.
+    """
+    anterior = None
+    if os.path.exists(HISTORICO):
+        with open(HISTORICO, encoding="utf-8") as f:
+            for linha in f:
+                item = json.loads(linha)
+                if item["parametros"] == registro["parametros"]:
+                    anterior = item
+
+    if anterior is None:
+        print("ℹ️ Sem execução anterior com os mesmos parâmetros para comparar.")
+        return []
+
+    regressoes = []
+    print(f"\n📊 Comparação com {anterior.get('commit')} ({anterior['data']}):")
+    for etapa, tempo in registro["tempos"].items():
+        tempo_anterior = anterior["tempos"].get(etapa)
+        if not tempo_anterior or etapa.endswith("_requisicoes"):
+            continue
+        variacao = (tempo - tempo_anterior) / tempo_anterior
+        marcador = "❌" if variacao > limite else "✅"
+        print(
+            f"   {marcador} {etapa}: {tempo_anterior:.3f}s → {tempo:.3f}s ({variacao:+.1%})"
+        )
+        if variacao > limite:
+            regressoes.append(etapa)
+    return regressoes
+
+
+def salvar_historico(registro: dict):
+    """Acrescenta o resultado da execução ao histórico JSONL."""
+    os.makedirs(os.path.dirname(HISTORICO), exist_ok=True)
+    with open(HISTORICO, "a", encoding="utf-8") as f:
+        f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+
+# ------------------ Execução ------------------ #
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do pipeline Pokémon.")
+    parser.add_argument("--pokemons", type=int, default=800)
+    parser.add_argument("--combates", type=int, default=50_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--latencia-ms", type=float, default=0)
+    parser.add_argument("--taxa-erro", type=float, default=0.0)
+    parser.add_argument(
+        "--db-url",
+        default=None,
+        help="URL SQLAlchemy do banco (padrão: SQLite temporário).",
+    )
+    parser.add_argument("--sem-ingestao", action="store_true")
+    parser.add_argument("--limite-regressao", type=float, default=0.2)
+    parser.add_argument("--falhar-em-regressao", action="store_true")
+    args = parser.parse_args()
+
+    from gerador_sintetico import gerar_atributos, gerar_combates, gerar_dataset
+
+    resultados = {}
+    with tempfile.TemporaryDirectory(prefix="kaizen_bench_") as trabalho:
+        os.environ["DATABASE_URL"] = args.db_url or (
+            f"sqlite:///{os.path.join(trabalho, 'bench.db')}"
+        )
+        os.environ.setdefault("KAIZEN_METRICAS_DIR", os.path.join(trabalho, "out"))
+
+        os.chdir(trabalho)
+        with cronometrar("geracao", resultados):
+            gerar_dataset("out", args.pokemons, args.combates, args.semente)
+
+        if not args.sem_ingestao:
+            pasta_ingestao = os.path.join(trabalho, "ingestao")
+            os.makedirs(os.path.join(pasta_ingestao, "out"))
+            os.chdir(pasta_ingestao)
+            df_atributos = gerar_atributos(args.pokemons, args.semente)
+            df_combates = gerar_combates(
+                min(args.combates, LIMITE_COMBATES_API), df_atributos, args.semente
+            )
+            benchmark_ingestao(df_atributos, df_combates, args, resultados)
+            os.chdir(trabalho)
+
+        benchmark_io("out", resultados)
+        benchmark_escrita_csv("out", resultados)
+        benchmark_decodificacao("out", resultados)
+        benchmark_banco("out", resultados)
+        benchmark_carga_merge("out", resultados)
+        benchmark_analise(resultados)
+        benchmark_intermediarios(resultados)
+        benchmark_segmentos("out", resultados)
+        benchmark_elo("out", resultados)
+        benchmark_similaridade("out", resultados)
+        os.chdir(RAIZ)
+
+    registro = {
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit_atual(),
+        "maquina": platform.node(),
+        "python": platform.python_version(),
+        "parametros": {
+            "pokemons": args.pokemons,
+            "combates": args.combates,
+            "latencia_ms": args.latencia_ms,
+            "taxa_erro": args.taxa_erro,
+            "banco": os.environ["DATABASE_URL"].split(":", 1)[0],
+            "ingestao": not args.sem_ingestao,
+        },
+        "tempos": resultados,
+    }
+    regressoes = comparar_com_historico(registro, args.limite_regressao)
+    salvar_historico(registro)
+    print(f"\n💾 Resultado registrado em '{HISTORICO}'.")
+
+    if regressoes and args.falhar_em_regressao:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Gerador de Dados Sintéticos - Pokémon e Combates
+
+Este módulo gera datasets sintéticos e reprodutíveis (semente fixa) no mesmo
+formato dos CSVs produzidos pela coleta em `out/`, permitindo executar o
+pipeline e os benchmarks sem a API real.
+
+Funcionalidades principais:
+- Geração de Pokémons com atributos, geração, lendário e tipos
+- Geração de combates em escala configurável (de 1 mil a 50 milhões)
+- Escrita em blocos, com memória limitada ao tamanho do bloco
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+TIPOS = [
+    "Normal",
+    "Fire",
+    "Water",
+    "Grass",
+    "Electric",
+    "Ice",
+    "Fighting",
+    "Poison",
+    "Ground",
+    "Flying",
+    "Psychic",
+    "Bug",
+    "Rock",
+    "Ghost",
+    "Dragon",
+    "Dark",
+    "Steel",
+    "Fairy",
+]
+ATRIBUTOS = ["Hp", "Attack", "Defense", "Sp_attack", "Sp_defense", "Speed"]
+TAMANHO_BLOCO = 1_000_000
+
+
+# ------------------ Pokémons ------------------ #
+
+
+def gerar_atributos(n_pokemons: int = 800, semente: int = 42) -> pd.DataFrame:
+    """
+    Gera a tabela de atributos de `n_pokemons` Pokémons sintéticos.
+
+    Args:
+        n_pokemons (int, optional): Quantidade de Pokémons. Padrão: 800.
+        semente (int, optional): Semente do gerador aleatório.
+
+    Returns:
+        pd.DataFrame: Colunas iguais às de 'out/atributos_pokemon.csv'.
+    """
+    rng = np.random.default_rng(semente)
+    ids = np.arange(1, n_pokemons + 1)
+
+    df = pd.DataFrame({"ID": ids, "Nome": [f"Pokemon_{i}" for i in ids]})
+    for atributo in ATRIBUTOS:
+        df[atributo] = rng.integers(5, 200, size=n_pokemons)
+    df["Generation"] = rng.integers(1, 7, size=n_pokemons)
+    df["Legendary"] = rng.random(n_pokemons) < 0.08
+
+    tipo1 = rng.integers(0, len(TIPOS), size=n_pokemons)
+    tipo2 = rng.integers(-len(TIPOS), len(TIPOS), size=n_pokemons)
+    df["Types"] = [
+        TIPOS[a] if b < 0 or b == a else f"{TIPOS[a]}/{TIPOS[b]}"
+        for a, b in zip(tipo1, tipo2)
+    ]
+    return df
+
+
+def gerar_pokemons(df_atributos: pd.DataFrame) -> pd.DataFrame:
+    """
+    Deriva a tabela básica (ID, Nome) a partir dos atributos.
+
+    Args:
+        df_atributos (pd.DataFrame): Atributos gerados por `gerar_atributos`.
+
+    Returns:
+        pd.DataFrame: Colunas iguais às de 'out/pokemons.csv'.
+    """
+    return df_atributos[["ID", "Nome"]].copy()
+
+
+# ------------------ Combates ------------------ #
+
+
+def gerar_blocos_combates(
+    n_combates: int, df_atributos: pd.DataFrame, semente: int = 42, bloco=TAMANHO_BLOCO
+):
+    """
+    Gera combates sintéticos em blocos.
+
+    O vencedor é sorteado com probabilidade proporcional à soma dos atributos,
+    de modo que as estatísticas tenham estrutura (não sejam ruído puro).
+
+    Args:
+        n_combates (int): Quantidade total de combates.
+        df_atributos (pd.DataFrame): Atributos dos Pokémons.
+        semente (int, optional): Semente do gerador aleatório.
+        bloco (int, optional): Quantidade de combates por bloco.
+
+    Yields:
+        pd.DataFrame: Bloco com colunas first_pokemon, second_pokemon, winner.
+    """
+    rng = np.random.default_rng(semente)
+    ids = df_atributos["ID"].to_numpy()
+    forca = np.zeros(ids.max() + 1)
+    forca[ids] = df_atributos[ATRIBUTOS].sum(axis=1).to_numpy()
+
+    gerados = 0
+    while gerados < n_combates:
+        n = min(bloco, n_combates - gerados)
+        first = rng.choice(ids, size=n)
+        second = rng.choice(ids, size=n)
+        iguais = first == second
+        second[iguais] = ids[(np.searchsorted(ids, second[iguais]) + 1) % len(ids)]
+
+        prob_first = forca[first] / (forca[first] + forca[second])
+        winner = np.where(rng.random(n) < prob_first, first, second)
+
+        yield pd.DataFrame(
+            {"first_pokemon": first, "second_pokemon": second, "winner": winner}
+        )
+        gerados += n
+
+
+def gerar_combates(n_combates: int, df_atributos: pd.DataFrame, semente: int = 42):
+    """
+    Gera todos os combates em um único DataFrame.
+
+    Args:
+        n_combates (int): Quantidade de combates.
+        df_atributos (pd.DataFrame): Atributos dos Pokémons.
+        semente (int, optional): Semente do gerador aleatório.
+
+    Returns:
+        pd.DataFrame: Combates sintéticos.
+    """
+    return pd.concat(
+        gerar_blocos_combates(n_combates, df_atributos, semente), ignore_index=True
+    )
+
+
+# ------------------ Exportação ------------------ #
+
+
+def gerar_dataset(
+    diretorio: str, n_pokemons: int = 800, n_combates: int = 50_000, semente: int = 42
+):
+    """
+    Escreve pokemons.csv, atributos_pokemon.csv e combates.csv em `diretorio`.
+
+    Os combates são escritos bloco a bloco, então mesmo 50 milhões de linhas
+    cabem em memória limitada.
+
+    Args:
+        diretorio (str): Diretório de saída (ex.: 'out').
+        n_pokemons (int, optional): Quantidade de Pokémons.
+        n_combates (int, optional): Quantidade de combates.
+        semente (int, optional): Semente do gerador aleatório.
+
+    Returns:
+        pd.DataFrame: Atributos gerados (úteis para o stub da API).
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    df_atributos = gerar_atributos(n_pokemons, semente)
+    gerar_pokemons(df_atributos).to_csv(
+        os.path.join(diretorio, "pokemons.csv"), index=False
+    )
+    df_atributos.assign(
+        Legendary=df_atributos["Legendary"].map(str).str.lower()
+    ).to_csv(os.path.join(diretorio, "atributos_pokemon.csv"), index=False)
+
+    caminho = os.path.join(diretorio, "combates.csv")
+    for i, bloco in enumerate(gerar_blocos_combates(n_combates, df_atributos, semente)):
+        bloco.to_csv(caminho, mode="w" if i == 0 else "a", header=i == 0, index=False)
+
+    print(
+        f"🧪 Dataset sintético gerado em '{diretorio}': {n_pokemons} Pokémons, {n_combates} combates."
+    )
+    return df_atributos
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos de Pokémon.")
+    parser.add_argument("--diretorio", default="out")
+    parser.add_argument("--pokemons", type=int, default=800)
+    parser.add_argument("--combates", type=int, default=50_000)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+    gerar_dataset(args.diretorio, args.pokemons, args.combates, args.semente)
@@ -0,0 +1,201 @@
+"""
+Benchmark de Tempo de Importação por Subcomando
+
+Mede, com `python -X importtime`, quanto cada subcomando de `src/main.py`
+gasta importando módulos antes de começar a trabalhar, comparando com o
+`main.py` de uma revisão de referência (padrão: o primeiro commit do
+repositório, que importava tudo no topo, incluindo plotly.express).
+
+Nada é mantido à mão:
+- "antes": a revisão de referência é extraída com `git archive` para um
+  diretório temporário e seu `main` é importado de lá.
+- subcomandos: as importações de cada etapa são lidas do `src/main.py` atual
+  (AST da função da etapa, das funções auxiliares que ela chama e dos ramos
+  `args.comando == ...` de `main`), seguindo o código conforme ele muda.
+
+Uso:
+    python benchmarks/tempo_importacao.py
+    python benchmarks/tempo_importacao.py --repeticoes 7 --base <revisão>
+"""
+
+import argparse
+import ast
+import io
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(RAIZ, "src")
+PESADOS = ("pandas", "numpy", "plotly", "sqlalchemy", "requests", "duckdb")
+
+
+# ------------------ Importações por Subcomando ------------------ #
+
+
+def _importacoes(no) -> list:
+    """Módulos importados (import/from ... import) dentro de um nó da AST."""
+    modulos = []
+    for filho in ast.walk(no):
+        if isinstance(filho, ast.Import):
+            modulos += [alias.name for alias in filho.names]
+        elif isinstance(filho, ast.ImportFrom) and filho.module and not filho.level:
+            modulos.append(filho.module)
+    return modulos
+
+
+def importacoes_subcomandos(caminho_main: str = os.path.join(SRC, "main.py")) -> dict:
+    """
+    Lê de `main.py` os módulos que cada subcomando importa.
+
+    Args:
+        caminho_main (str, optional): Arquivo do ponto de entrada.
+
+    Returns:
+        dict: Subcomando -> lista de módulos (sempre começando por 'main').
+    """
+    with open(caminho_main, encoding="utf-8") as arquivo:
+        arvore = ast.parse(arquivo.read())
+    funcoes = {no.name: no for no in arvore.body if isinstance(no, ast.FunctionDef)}
+
+    def da_funcao(nome, vistas):
+        # Importações da função e das funções de main.py que ela chama
+        vistas.add(nome)
+        modulos = _importacoes(funcoes[nome])
+        for chamada in ast.walk(funcoes[nome]):
+            alvo = getattr(chamada, "func", None)
+            if (
+                isinstance(chamada, ast.Call)
+                and isinstance(alvo, ast.Name)
+                and alvo.id in funcoes
+                and alvo.id not in vistas
+            ):
+                modulos += da_funcao(alvo.id, vistas)
+        return modulos
+
+    subcomandos = {"--help": ["main"]}
+    for etapa in ("ingest", "load", "analyze", "report"):
+        if etapa in funcoes:
+            subcomandos[etapa] = ["main"] + da_funcao(etapa, {"main"})
+    # Subcomandos despachados direto em main(): `if args.comando == "api": ...`
+    for no in ast.walk(funcoes.get("main", arvore)):
+        teste = getattr(no, "test", None)
+        if (
+            isinstance(no, ast.If)
+            and isinstance(teste, ast.Compare)
+            and isinstance(teste.comparators[0], ast.Constant)
+            and isinstance(teste.comparators[0].value, str)
+        ):
+            modulos = [m for corpo in no.body for m in _importacoes(corpo)]
+            subcomandos[teste.comparators[0].value] = ["main"] + modulos
+    return {nome: list(dict.fromkeys(m)) for nome, m in subcomandos.items()}
+
+
+def extrair_revisao(revisao: str, destino: str) -> str:
+    """
+    Extrai `src/` de uma revisão do git para `destino`.
+
+    Args:
+        revisao (str): Commit, tag ou branch.
+        destino (str): Diretório de destino.
+
+    Returns:
+        str: Caminho do `src/` extraído.
+    """
+    pacote = subprocess.run(
+        ["git", "archive", revisao, "src"], capture_output=True, cwd=RAIZ, check=True
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(pacote)) as tar:
+        tar.extractall(destino)
+    return os.path.join(destino, "src")
+
+
+def revisao_inicial() -> str:
+    """Primeiro commit do repositório (referência padrão)."""
+    return subprocess.run(
+        ["git", "rev-list", "--max-parents=0", "HEAD"],
+        capture_output=True,
+        text=True,
+        cwd=RAIZ,
+        check=True,
+    ).stdout.split()[-1]
+
+
+# ------------------ Medição ------------------ #
+
+
+def medir_importacao(modulos: list, src: str = SRC) -> tuple:
+    """
+    Importa `modulos` em um processo novo com -X importtime.
+
+    Args:
+        modulos (list[str]): Módulos a importar.
+        src (str, optional): Diretório incluído no sys.path (e de trabalho).
+
+    Returns:
+        tuple: (tempo_total_ms, pesados), onde pesados são os pacotes de
+            PESADOS efetivamente carregados.
+    """
+    codigo = f"import sys; sys.path.insert(0, {src!r}); " + "; ".join(
+        f"import {m}" for m in modulos
+    )
+    saida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(src),
+        check=True,
+    ).stderr
+
+    total_us = 0
+    carregados = set()
+    for linha in saida.splitlines():
+        achado = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", linha)
+        if not achado:
+            continue
+        cumulativo, recuo, nome = achado.groups()
+        if len(recuo) == 1:  # módulo de nível superior
+            total_us += int(cumulativo)
+        raiz = nome.split(".")[0]
+        if raiz in PESADOS:
+            carregados.add(raiz)
+    return total_us / 1000, sorted(carregados)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de importação por subcomando.")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument(
+        "--base", help="Revisão de referência (padrão: primeiro commit)"
+    )
+    args = parser.parse_args()
+    base = args.base or revisao_inicial()
+
+    with tempfile.TemporaryDirectory() as temporario:
+        src_base = extrair_revisao(base, temporario)
+        casos = {f"antes ({base[:8]})": (["main"], src_base)}
+        for nome, modulos in importacoes_subcomandos().items():
+            casos[nome] = (modulos, SRC)
+
+        resultados = {}
+        for nome, (modulos, src) in casos.items():
+            medicoes = [medir_importacao(modulos, src) for _ in range(args.repeticoes)]
+            resultados[nome] = (
+                statistics.median(m[0] for m in medicoes),
+                medicoes[0][1],
+            )
+
+    referencia = resultados[f"antes ({base[:8]})"][0]
+    print(f"\n⏱️  Tempo de importação (mediana de {args.repeticoes} execuções)\n")
+    print(f"{'caso':<22}{'ms':>10}{'redução':>10}  módulos pesados")
+    for nome, (tempo, pesados) in resultados.items():
+        reducao = 1 - tempo / referencia
+        print(f"{nome:<22}{tempo:>10.1f}{reducao:>10.0%}  {', '.join(pesados) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,35 +6,67 @@ Permite visualizar:
 - Top 10 vencedores e derrotados
 - Comparativo de atributos dos Pokémon (Top 10 vs Média Geral)
 - Gráficos de barras e radar
+- Ranking por rating Elo (força ajustada pelo oponente)
+- Confrontos tipo x tipo e Pokémon x Pokémon (índice pré-computado)
+- Pokémon semelhantes por atributos e contrapartes do top 10 (índice de similaridade)
+- Exploração paginada das estatísticas e do histórico de combates
 
 Funcionalidades:
-1. Conexão com banco de dados PostgreSQL via SQLAlchemy.
-2. Carregamento de tabelas essenciais para o dashboard.
-3. Criação de gráficos interativos usando Plotly.
+1. Conexão com banco de dados PostgreSQL via SQLAlchemy, ou com um banco
+   embarcado DuckDB/SQLite local (variável ANALISE_BACKEND).
+2. Carregamento do resumo pré-agregado do dashboard (tabela `resumo_dashboard`),
+   com fallback para as tabelas essenciais.
+3. Gráficos Plotly pré-computados por versão do resumo (módulo `figuras`).
 4. Formatação condicional para destacar diferenças nos atributos.
+5. Métricas de tempo de carga e renderização (módulo `instrumentacao`).
+6. Filtros, ordenação e paginação executados no banco (`consultas_paginadas`),
+   com cache por conjunto de parâmetros e versão do resumo.
+7. Quando a etapa `analyze` publicou um snapshot (`snapshot_dashboard`), todos
+   os dados vêm dele, mapeado em memória e compartilhado entre os processos,
+   sem nenhuma conexão de banco; novas versões são adotadas sem reinício.
 """
 
+import os
+import sys
 import streamlit as st
 import pandas as pd
-from src.banco_conexao import obter_engine
-import plotly.graph_objects as go
+
+# Permite importar os módulos de src/ (que usam imports locais entre si)
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+)
+
+from banco_conexao import obter_engine_leitura
+from backend_analitico import ler_sql
+from instrumentacao import medir, exportar_metricas
+from resumo_dashboard import carregar_resumo, resumo_para_dataframes
+from indice_confrontos import carregar_indice
+from similaridade import carregar_indice_similaridade, VIZINHOS
+from figuras import obter_figuras, figura_barras, figura_radar, figura_matriz_tipos
+from consultas_paginadas import (
+    consultar_estatisticas,
+    consultar_combates,
+    ORDENACOES_ESTATISTICAS,
+    POR_PAGINA,
+)
+from snapshot_dashboard import snapshot_atual
 
 
 # ------------------ Funções de dados ------------------ #
 def conectar_banco():
     """
-    Cria e retorna uma conexão com o banco de dados via SQLAlchemy.
+    Cria e retorna uma conexão de leitura com o banco de dados via SQLAlchemy.
 
     Returns:
-        Engine: SQLAlchemy Engine conectado ao banco.
+        Engine: SQLAlchemy Engine de leitura (réplica, se configurada).
     """
-    engine = obter_engine()
+    engine = obter_engine_leitura()
     return engine
 
 
 def carregar_tabela(nome_tabela: str) -> pd.DataFrame:
     """
-    Carrega uma tabela do banco de dados para um DataFrame.
+    Carrega uma tabela do backend analítico (ANALISE_BACKEND) para um DataFrame.
 
     Args:
         nome_tabela (str): Nome da tabela a ser carregada.
@@ -42,111 +74,33 @@ def carregar_tabela(nome_tabela: str) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Dados da tabela. Retorna DataFrame vazio em caso de erro.
     """
-    engine = conectar_banco()
     try:
-        return pd.read_sql(f"SELECT * FROM {nome_tabela}", engine)
+        with medir("dashboard.carregar_tabela", tabela=nome_tabela):
+            return ler_sql(f'SELECT * FROM "{nome_tabela}"')
     except Exception:
         return pd.DataFrame()
 
 
-# ------------------ Funções de Gráficos ------------------ #
-def criar_grafico_barras(comparativo: pd.DataFrame):
+# ------------------ Figuras ------------------ #
+@st.cache_resource(max_entries=4)
+def carregar_figuras_resumo(versao: str, _resumo: dict) -> dict:
     """
-    Cria gráfico de barras comparando os atributos do Top 10 Pokémon com a média geral.
+    Figuras do tema escuro para a versão do resumo (artefato pré-computado).
 
     Args:
-        comparativo (pd.DataFrame): DataFrame contendo colunas 'Atributo', 'Média_Top10', 'Média_Geral'.
+        versao (str): Versão do resumo (chave do cache).
+        _resumo (dict): Resumo atual (não entra na chave do cache).
 
     Returns:
-        plotly.graph_objects.Figure: Figura interativa de barras.
+        dict: {nome: especificação Plotly}.
     """
-    fig = go.Figure()
-    fig.add_trace(
-        go.Bar(
-            x=comparativo["Atributo"],
-            y=comparativo["Média_Top10"],
-            name="Média Top 10",
-            marker_color="#1f77b4",
-            hovertemplate="%{x}: %{y:.2f}<extra></extra>",
-        )
-    )
-    fig.add_trace(
-        go.Bar(
-            x=comparativo["Atributo"],
-            y=comparativo["Média_Geral"],
-            name="Média Geral",
-            marker_color="#ff7f0e",
-            hovertemplate="%{x}: %{y:.2f}<extra></extra>",
-        )
-    )
-    fig.update_layout(
-        barmode="group",
-        title="Comparativo de Atributos: Top 10 vs Média Geral",
-        xaxis_title="Atributos",
-        yaxis_title="Valor Médio",
-        template="plotly_dark",
-        plot_bgcolor="#000000",
-        paper_bgcolor="#000000",
-        font=dict(color="white"),
-    )
-    return fig
+    return obter_figuras(_resumo)["escuro"]
 
 
-def criar_grafico_radar(df_top10_attr: pd.DataFrame, df_attr_geral: pd.DataFrame):
-    """
-    Cria gráfico radar comparando os atributos do Top 10 Pokémon com a média geral.
-
-    Args:
-        df_top10_attr (pd.DataFrame): Atributos detalhados do Top 10 Pokémon.
-        df_attr_geral (pd.DataFrame): Atributos gerais de todos os Pokémon.
-
-    Returns:
-        plotly.graph_objects.Figure: Figura radar interativa.
-    """
-    colunas_attr = df_top10_attr.select_dtypes(include="number").columns
-    df_top10_attr_numeric = df_top10_attr.copy()
-    df_top10_attr_numeric[colunas_attr] = (
-        df_top10_attr_numeric[colunas_attr]
-        .apply(pd.to_numeric, errors="coerce")
-        .round(2)
-    )
-    media_geral = (
-        df_attr_geral[colunas_attr]
-        .apply(pd.to_numeric, errors="coerce")
-        .mean()
-        .round(2)
-    )
-
-    fig = go.Figure()
-    for _, row in df_top10_attr_numeric.iterrows():
-        fig.add_trace(
-            go.Scatterpolar(
-                r=row[colunas_attr].values,
-                theta=colunas_attr,
-                fill="toself",
-                name=row["Nome"],
-                hovertemplate="%{theta}: %{r:.2f}<extra></extra>",
-            )
-        )
-    fig.add_trace(
-        go.Scatterpolar(
-            r=media_geral.values,
-            theta=colunas_attr,
-            fill="toself",
-            name="Média Geral",
-            line=dict(color="white", dash="dash"),
-            hovertemplate="%{theta}: %{r:.2f}<extra></extra>",
-        )
-    )
-    fig.update_layout(
-        polar=dict(radialaxis=dict(visible=True)),
-        title="Radar: Top 10 vs Média Geral",
-        template="plotly_dark",
-        plot_bgcolor="#000000",
-        paper_bgcolor="#000000",
-        font=dict(color="white"),
-    )
-    return fig
+@st.cache_resource(max_entries=2)
+def carregar_figura_matriz_tipos(versao: str) -> dict:
+    """Mapa de calor tipo x tipo, montado uma vez por versão e processo."""
+    return figura_matriz_tipos(carregar_indice_confrontos().matriz_tipos())
 
 
 # ------------------ Função de destaque condicional ------------------ #
@@ -170,7 +124,258 @@ def colorir_diferenca(valor):
         return ""
 
 
+# ------------------ Ranking Elo ------------------ #
+RANKING_ELO_LIMITE = 20
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def buscar_ranking_elo(versao, _snapshot=None):
+    """Primeiras posições do ranking Elo (snapshot ou tabela `ratings_elo`)."""
+    if _snapshot is not None:
+        return _snapshot.ratings(RANKING_ELO_LIMITE)
+    return ler_sql(
+        'SELECT * FROM ratings_elo ORDER BY "Posicao" LIMIT :limite',
+        parametros={"limite": RANKING_ELO_LIMITE},
+    )
+
+
+def exibir_ranking_elo(versao: str, snapshot=None):
+    """
+    Exibe o ranking pelo rating Elo, que pondera a força de cada oponente.
+
+    Args:
+        versao (str): Versão dos dados (chave do cache).
+        snapshot (SnapshotDashboard, optional): Snapshot atual, se publicado.
+    """
+    try:
+        ranking = buscar_ranking_elo(versao, snapshot)
+    except Exception:
+        ranking = None
+    if ranking is None or ranking.empty:
+        return
+    st.subheader("📈 Ranking Elo")
+    st.dataframe(
+        ranking.set_index("Posicao")[["Pokemon", "Rating", "Lutas", "Vitorias"]],
+        use_container_width=True,
+    )
+
+
+# ------------------ Confrontos ------------------ #
+@st.cache_resource
+def carregar_indice_arquivo():
+    """Carrega (uma vez por processo) o índice de 'out/indice_confrontos.npz'."""
+    return carregar_indice()
+
+
+def carregar_indice_confrontos():
+    """
+    Índice de confrontos do snapshot atual ou, sem snapshot, do arquivo .npz.
+
+    Returns:
+        IndiceConfrontos ou None: Índice, ou None se ainda não foi gerado.
+    """
+    snapshot = snapshot_atual()
+    if snapshot is not None:
+        return snapshot.indice_confrontos()
+    return carregar_indice_arquivo()
+
+
+def exibir_confrontos(versao: str):
+    """
+    Exibe consultas de confronto tipo x tipo e Pokémon x Pokémon,
+    respondidas pelo índice pré-computado (sem varrer a tabela de combates).
+
+    Args:
+        versao (str): Versão dos dados (chave do cache da matriz tipo x tipo).
+    """
+    indice = carregar_indice_confrontos()
+    if indice is None:
+        return
+
+    st.subheader("⚔️ Confrontos por Tipo")
+    col1, col2 = st.columns(2)
+    tipo_x = col1.selectbox("Tipo", indice.tipos, key="tipo_x")
+    tipo_y = col2.selectbox("Contra o tipo", indice.tipos, key="tipo_y")
+    resultado = indice.confronto_tipos(tipo_x, tipo_y)
+    st.metric(
+        f"{tipo_x} vs {tipo_y}",
+        (
+            "-"
+            if resultado["taxa_vitoria"] is None
+            else f"{resultado['taxa_vitoria']:.2f}%"
+        ),
+        f"{resultado['lutas']} lutas",
+        delta_color="off",
+    )
+    st.plotly_chart(carregar_figura_matriz_tipos(versao), use_container_width=True)
+
+    st.subheader("🥊 Confronto Direto")
+    nomes = sorted(indice.nomes)
+    col1, col2 = st.columns(2)
+    nome_a = col1.selectbox("Pokémon", nomes, key="pokemon_a")
+    nome_b = col2.selectbox(
+        "Contra", nomes, index=min(1, len(nomes) - 1), key="pokemon_b"
+    )
+    resultado = indice.confronto(indice.id_por_nome(nome_a), indice.id_por_nome(nome_b))
+    if resultado["lutas"] == 0:
+        st.info(f"Nenhum combate registrado entre {nome_a} e {nome_b}.")
+    else:
+        st.metric(
+            f"{nome_a} vs {nome_b}",
+            f"{resultado['taxa_vitoria']:.2f}%",
+            f"{resultado['vitorias']}V / {resultado['derrotas']}D",
+            delta_color="off",
+        )
+
+
+# ------------------ Similaridade ------------------ #
+@st.cache_resource(max_entries=2)
+def carregar_similaridade(versao: str):
+    """Carrega o índice de similaridade uma vez por versão dos dados e processo."""
+    return carregar_indice_similaridade()
+
+
+def exibir_similaridade(versao: str, top10_vitorias: pd.DataFrame):
+    """
+    Exibe os Pokémon mais parecidos pelos atributos de combate e as
+    contrapartes dos top 10 vencedores, a partir do índice pré-computado.
+
+    Args:
+        versao (str): Versão dos dados (chave do cache do índice).
+        top10_vitorias (pd.DataFrame): Top 10 vencedores (coluna 'Pokemon').
+    """
+    indice = carregar_similaridade(versao)
+    if indice is None or not len(indice.ids):
+        return
+
+    st.subheader("🧬 Pokémon Semelhantes")
+    nomes = sorted(indice.nomes)
+    col1, col2 = st.columns([3, 1])
+    nome = col1.selectbox("Semelhantes a", nomes, key="similar_a")
+    quantidade = col2.number_input(
+        "Quantidade", 1, max(1, len(nomes) - 1), min(10, VIZINHOS), key="similares_k"
+    )
+    st.dataframe(
+        indice.similares(indice.id_por_nome(nome), int(quantidade)).set_index("ID"),
+        use_container_width=True,
+    )
+
+    st.subheader("🪞 Contrapartes dos Top 10 Vencedores")
+    ids = [indice.id_por_nome(n) for n in top10_vitorias.get("Pokemon", [])]
+    contrapartes = indice.contrapartes([i for i in ids if i is not None], k=3)
+    st.dataframe(
+        contrapartes.set_index(["Pokemon", "Posicao"]), use_container_width=True
+    )
+
+
+# ------------------ Exploração Paginada ------------------ #
+# O primeiro argumento (versão dos dados) só entra na chave do cache: quando os
+# dados são recalculados, as páginas antigas deixam de ser reaproveitadas.
+# `_snapshot` (fora da chave) responde sem banco quando há snapshot publicado.
+@st.cache_data(max_entries=256, show_spinner=False)
+def buscar_estatisticas(
+    versao, busca, ordenar_por, decrescente, pagina, lutas_min, _snapshot=None
+):
+    """Página de estatísticas em cache por parâmetros (ver `consultar_estatisticas`)."""
+    consultar = (
+        _snapshot.consultar_estatisticas if _snapshot else consultar_estatisticas
+    )
+    return consultar(busca, ordenar_por, decrescente, pagina, None, lutas_min)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def buscar_combates(versao, pokemon_id, oponente_id, pagina, _snapshot=None):
+    """Página de combates em cache por parâmetros (ver `consultar_combates`)."""
+    consultar = _snapshot.consultar_combates if _snapshot else consultar_combates
+    return consultar(pokemon_id, oponente_id, pagina)
+
+
+def seletor_pagina(total: int, chave: str) -> int:
+    """
+    Exibe o seletor de página e retorna a página escolhida.
+
+    Args:
+        total (int): Total de linhas do filtro atual.
+        chave (str): Prefixo das chaves dos widgets.
+
+    Returns:
+        int: Página escolhida (a partir de 1).
+    """
+    paginas = max(1, -(-total // POR_PAGINA))
+    if st.session_state.get(f"{chave}_pagina", 1) > paginas:
+        # O filtro mudou e a página atual deixou de existir
+        st.session_state[f"{chave}_pagina"] = paginas
+        st.rerun()
+    pagina = st.number_input(
+        f"Página (de {paginas})", 1, paginas, 1, key=f"{chave}_pagina"
+    )
+    return int(pagina)
+
+
+def exibir_exploracao(versao: str, snapshot=None):
+    """
+    Exibe as estatísticas e o histórico de combates com filtros, ordenação e
+    paginação executados no banco (ou no snapshot); apenas a página visível
+    é transferida.
+
+    Args:
+        versao (str): Versão dos dados (invalida o cache quando os dados mudam).
+        snapshot (SnapshotDashboard, optional): Snapshot atual, se publicado.
+    """
+    st.subheader("🔎 Explorar")
+    aba_estatisticas, aba_combates = st.tabs(["Estatísticas", "Histórico de combates"])
+
+    with aba_estatisticas:
+        col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+        busca = col1.text_input("Buscar Pokémon", key="exp_busca")
+        ordenar_por = col2.selectbox(
+            "Ordenar por", ORDENACOES_ESTATISTICAS, key="exp_ordem"
+        )
+        decrescente = col3.toggle("Decrescente", True, key="exp_desc")
+        lutas_min = col4.number_input("Lutas mín.", 0, step=10, key="exp_lutas")
+        pagina = st.session_state.get("exp_pagina", 1)
+        try:
+            df, total = buscar_estatisticas(
+                versao,
+                busca,
+                ordenar_por,
+                decrescente,
+                pagina,
+                int(lutas_min),
+                snapshot,
+            )
+        except Exception:
+            st.info("Estatísticas ainda não calculadas.")
+            return
+        st.dataframe(df, hide_index=True, use_container_width=True)
+        st.caption(f"{total} Pokémon encontrados.")
+        seletor_pagina(total, "exp")
+
+    with aba_combates:
+        indice = carregar_indice_confrontos()
+        if indice is None:
+            st.info("Índice de confrontos ainda não gerado.")
+            return
+        nomes = sorted(indice.nomes)
+        col1, col2 = st.columns(2)
+        nome = col1.selectbox("Pokémon", nomes, key="hist_pokemon")
+        nome_oponente = col2.selectbox(
+            "Contra (opcional)", ["Todos"] + nomes, key="hist_oponente"
+        )
+        oponente_id = (
+            None if nome_oponente == "Todos" else indice.id_por_nome(nome_oponente)
+        )
+        pagina = st.session_state.get("hist_pagina", 1)
+        df, total = buscar_combates(
+            versao, indice.id_por_nome(nome), oponente_id, pagina, snapshot
+        )
+        st.dataframe(df, hide_index=True, use_container_width=True)
+        st.caption(f"{total} combates.")
+        seletor_pagina(total, "hist")
+
+
 # ------------------ Streamlit App ------------------ #
+@medir("dashboard.main")
 def main():
     """
     Função principal que inicializa e exibe o dashboard Streamlit.
@@ -179,12 +384,25 @@ def main():
     st.title("📊 Dashboard Pokémon - Top 10")
     st.markdown("---")
 
-    # Carregar dados do banco
-    top10_vitorias = carregar_tabela("top10_vitorias")
-    top10_derrotas = carregar_tabela("top10_derrotas")
-    comparativo = carregar_tabela("comparativo_atributos_top10")
-    df_top10_attr = carregar_tabela("atributos_top10_vencedores")
-    df_attr_geral = carregar_tabela("atributos_pokemon")
+    # Snapshot publicado (sem banco) ou resumo pré-agregado (uma leitura pequena)
+    snapshot = snapshot_atual()
+    resumo = snapshot.resumo if snapshot is not None else carregar_resumo()
+    if resumo is not None:
+        top10_vitorias, top10_derrotas, df_top10_attr, comparativo, media_geral = (
+            resumo_para_dataframes(resumo)
+        )
+    else:
+        top10_vitorias = carregar_tabela("top10_vitorias")
+        top10_derrotas = carregar_tabela("top10_derrotas")
+        comparativo = carregar_tabela("comparativo_atributos_top10")
+        df_top10_attr = carregar_tabela("atributos_top10_vencedores")
+        colunas_attr = df_top10_attr.select_dtypes(include="number").columns
+        media_geral = (
+            carregar_tabela("atributos_pokemon")[colunas_attr]
+            .apply(pd.to_numeric, errors="coerce")
+            .mean()
+        )
+    media_geral = media_geral.round(2)
 
     # ------------------ Ajuste de tipos numéricos ------------------ #
     for df in [top10_vitorias, top10_derrotas]:
@@ -254,13 +472,29 @@ def main():
     )
 
     # ------------------ Gráficos ------------------ #
+    if snapshot is not None:
+        figuras = snapshot.figuras["escuro"]
+    elif resumo is not None:
+        figuras = carregar_figuras_resumo(resumo["versao"], resumo)
+    else:
+        figuras = {
+            "barras": figura_barras(comparativo),
+            "radar": figura_radar(df_top10_attr, media_geral),
+        }
     st.subheader("📊 Gráfico Comparativo de Atributos")
-    st.plotly_chart(criar_grafico_barras(comparativo), use_container_width=True)
+    st.plotly_chart(figuras["barras"], use_container_width=True)
 
     st.subheader("🕸️ Gráfico Radar - Top 10 vs Média Geral")
-    st.plotly_chart(
-        criar_grafico_radar(df_top10_attr, df_attr_geral), use_container_width=True
-    )
+    st.plotly_chart(figuras["radar"], use_container_width=True)
+
+    if snapshot is not None:
+        versao = snapshot.versao
+    else:
+        versao = resumo["versao"] if resumo is not None else "sem-resumo"
+    exibir_ranking_elo(versao, snapshot)
+    exibir_confrontos(versao)
+    exibir_similaridade(versao, top10_vitorias)
+    exibir_exploracao(versao, snapshot)
 
     st.markdown("---")
     st.markdown(
@@ -272,3 +506,4 @@ def main():
 # ------------------ Execução ------------------ #
 if __name__ == "__main__":
     main()
+    exportar_metricas("out/metricas_dashboard")
@@ -7,20 +7,86 @@ de barras e radar, mostrando as estatísticas do top 10 vencedores e atributos
 comparativos com a média geral.
 
 Principais funcionalidades:
-- Conexão e leitura de dados do banco de dados
-- Combinação de tabelas de combates e atributos
+- Conexão e leitura de dados do banco de dados (PostgreSQL, DuckDB ou SQLite)
+- Leitura em lotes (cursor do lado do servidor) das tabelas grandes
+- Combinação de tabelas de combates e atributos (como view, tabela ou não
+  persistida, conforme ANALISE_INTERMEDIARIOS)
 - Cálculo de estatísticas: vitórias, derrotas e taxa de vitória
 - Análise do top 10 Pokémon vencedores e derrotados
 - Comparação de atributos do top 10 com a média geral
-- Geração de gráficos interativos (barras e radar)
+- Taxas de vitória por geração, tipo e status lendário, agregadas em
+  múltiplos processos (módulo `analise_paralela`)
+- Resumo pré-agregado do dashboard (módulo `resumo_dashboard`)
+- Figuras de barras e radar pré-computadas por versão do resumo (módulo `figuras`)
 - Exportação de dashboard HTML completo
+- Métricas de tempo e memória por etapa (módulo `instrumentacao`)
 """
 
 import pandas as pd
 from banco_conexao import obter_engine
-import plotly.graph_objects as go
-import plotly.express as px
+from backend_analitico import (
+    backend_atual,
+    ler_sql,
+    ler_sql_em_lotes,
+    escrever_tabela,
+    estatisticas_sql,
+    criar_view,
+    executar_sql,
+    tipo_objeto,
+)
+from instrumentacao import medir, incrementar
+from analise_paralela import (
+    AVISO_ATRIBUTOS_AUSENTES,
+    estatisticas_segmentos,
+    estatisticas_segmentos_em_lotes,
+    SEGMENTOS,
+)
+from resumo_dashboard import (
+    gerar_resumo,
+    salvar_resumo,
+    carregar_resumo,
+    resumo_para_dataframes,
+)
+from figuras import gerar_figuras, salvar_figuras, obter_figuras
+from tratamento_dados import COLUNAS_CONTROLE
+import json
 import os
+import sys
+import numpy as np
+
+# Tabelas finais publicadas no PostgreSQL quando a análise roda em backend local
+TABELAS_PUBLICADAS = [
+    "estatisticas_pokemon",
+    "top10_vitorias",
+    "top10_derrotas",
+    "atributos_top10_vencedores",
+    "comparativo_atributos_top10",
+    "taxa_vitoria_geracao",
+    "taxa_vitoria_tipo",
+    "taxa_vitoria_lendario",
+    "ratings_elo",
+    "resumo_dashboard",
+]
+
+# Como persistir o intermediário combates_com_nomes (ANALISE_INTERMEDIARIOS):
+# 'view' (padrão, sem cópia), 'tabela' (materializada) ou 'nenhum'
+MODOS_INTERMEDIARIOS = ("view", "tabela", "nenhum")
+SQL_COMBATES_COM_NOMES = """
+    SELECT c.first_pokemon, c.second_pokemon, c.winner,
+           a1."Nome" AS nome_first, a2."Nome" AS nome_second, a3."Nome" AS nome_winner
+    FROM combates c
+    LEFT JOIN atributos_pokemon a1 ON a1."ID" = c.first_pokemon
+    LEFT JOIN atributos_pokemon a2 ON a2."ID" = c.second_pokemon
+    LEFT JOIN atributos_pokemon a3 ON a3."ID" = c.winner
+"""
+
+# Colunas e tipos compactos usados na leitura em lotes dos combates
+TIPOS_COMBATES = {
+    "first_pokemon": "int32",
+    "second_pokemon": "int32",
+    "winner": "int32",
+}
+
 
 # ------------------ Funções de Conexão e Manipulação de Dados ------------------ #
 
@@ -38,7 +104,9 @@ def conectar_banco():
 
 def carregar_tabela(nome_tabela: str) -> pd.DataFrame:
     """
-    Carrega uma tabela do banco de dados para um DataFrame do pandas.
+    Carrega uma tabela do backend analítico para um DataFrame do pandas.
+
+    O backend (PostgreSQL, DuckDB ou SQLite) é definido por ANALISE_BACKEND.
 
     Args:
         nome_tabela (str): Nome da tabela a ser carregada.
@@ -46,116 +114,216 @@ def carregar_tabela(nome_tabela: str) -> pd.DataFrame:
     Retorna:
         pd.DataFrame: Dados da tabela ou None em caso de erro.
     """
-    engine = conectar_banco()
     try:
-        return pd.read_sql(f"SELECT * FROM {nome_tabela}", engine)
+        with medir("banco.carregar_tabela", tabela=nome_tabela):
+            return ler_sql(f'SELECT * FROM "{nome_tabela}"')
     except Exception:
         return None
 
 
-def salvar_tabela(df: pd.DataFrame, nome_tabela: str):
+def carregar_tabela_em_lotes(
+    nome_tabela: str, colunas=None, tipos: dict = None, tamanho_lote: int = None
+):
+    """
+    Lê uma tabela em lotes tipados, sem materializá-la inteira em memória.
+
+    Args:
+        nome_tabela (str): Nome da tabela.
+        colunas (list[str], optional): Colunas a ler (padrão: todas).
+        tipos (dict, optional): Tipos aplicados a cada lote (ex.: TIPOS_COMBATES).
+        tamanho_lote (int, optional): Linhas por lote (padrão: DB_TAMANHO_LOTE_LEITURA).
+
+    Retorna:
+        iterator[pd.DataFrame]: Lotes da tabela.
+    """
+    selecao = ", ".join(f'"{c}"' for c in colunas) if colunas else "*"
+    return ler_sql_em_lotes(
+        f'SELECT {selecao} FROM "{nome_tabela}"', tamanho_lote=tamanho_lote, tipos=tipos
+    )
+
+
+def salvar_tabela(df: pd.DataFrame, nome_tabela: str, substituir: bool = True):
     """
-    Salva um DataFrame em uma tabela do banco de dados, substituindo-a se já existir.
+    Salva um DataFrame em uma tabela do backend analítico, substituindo-a se já existir.
 
     Args:
         df (pd.DataFrame): DataFrame a ser salvo.
         nome_tabela (str): Nome da tabela no banco.
+        substituir (bool, optional): Com False, acrescenta as linhas à tabela.
     """
-    engine = conectar_banco()
-    df.to_sql(nome_tabela, engine, if_exists="replace", index=False, method="multi")
+    with medir("banco.salvar_tabela", tabela=nome_tabela):
+        escrever_tabela(df, nome_tabela, substituir=substituir)
+    incrementar(
+        "bytes_inseridos", int(df.memory_usage(deep=True).sum()), tabela=nome_tabela
+    )
 
 
 # ------------------ Pipeline de Processamento ------------------ #
 
 
-def combinar_tabelas():
+def combinar_tabelas_em_lotes(lotes, df_attr: pd.DataFrame):
     """
-    Combina a tabela de combates com os atributos dos Pokémon,
-    adicionando os nomes de cada Pokémon envolvido no combate.
+    Materializa `combates_com_nomes` (combates com os nomes dos Pokémon) lote a lote.
 
-    Retorna:
-        pd.DataFrame: Combates com nomes dos Pokémon.
-    """
-    df_attr = carregar_tabela("atributos_pokemon")
-    df_combates = carregar_tabela("combates")
+    Os lotes originais são repassados adiante, de modo que a mesma leitura
+    alimenta também a agregação das estatísticas (uma única passada).
 
-    df_merged = (
-        df_combates.merge(
-            df_attr[["ID", "Nome"]], left_on="first_pokemon", right_on="ID", how="left"
-        )
-        .rename(columns={"Nome": "nome_first"})
-        .drop(columns=["ID"])
-        .merge(
-            df_attr[["ID", "Nome"]], left_on="second_pokemon", right_on="ID", how="left"
+    Args:
+        lotes (iterable[pd.DataFrame]): Lotes de combates.
+        df_attr (pd.DataFrame): Atributos (colunas ID e Nome); None se a tabela
+            estiver ausente (os lotes são só repassados).
+
+    Yields:
+        pd.DataFrame: Os mesmos lotes recebidos.
+    """
+    if df_attr is None:
+        print(AVISO_ATRIBUTOS_AUSENTES)
+        yield from lotes
+        return
+
+    # Remove a view antes de abrir a leitura (o SQLite bloqueia DDL com cursor aberto)
+    if tipo_objeto("combates_com_nomes") == "VIEW":
+        executar_sql(['DROP VIEW "combates_com_nomes"'])
+
+    nomes = df_attr.set_index("ID")["Nome"]
+    for i, lote in enumerate(lotes):
+        combinado = lote.assign(
+            nome_first=lote["first_pokemon"].map(nomes),
+            nome_second=lote["second_pokemon"].map(nomes),
+            nome_winner=lote["winner"].map(nomes),
         )
-        .rename(columns={"Nome": "nome_second"})
-        .drop(columns=["ID"])
-        .merge(df_attr[["ID", "Nome"]], left_on="winner", right_on="ID", how="left")
-        .rename(columns={"Nome": "nome_winner"})
-        .drop(columns=["ID"])
-    )
+        salvar_tabela(combinado, "combates_com_nomes", substituir=i == 0)
+        yield lote
+
 
-    salvar_tabela(df_merged, "combates_com_nomes")
-    return df_merged
+def modo_intermediarios() -> str:
+    """
+    Retorna o modo de persistência de `combates_com_nomes` (ANALISE_INTERMEDIARIOS).
+
+    Retorna:
+        str: 'view', 'tabela' ou 'nenhum'.
+    """
+    modo = (os.getenv("ANALISE_INTERMEDIARIOS") or "view").strip().lower()
+    if modo not in MODOS_INTERMEDIARIOS:
+        raise ValueError(
+            f"❌ ANALISE_INTERMEDIARIOS inválido: '{modo}'. Use um de {MODOS_INTERMEDIARIOS}."
+        )
+    return modo
 
 
-def gerar_estatisticas(df: pd.DataFrame):
+def contabilizar_intermediario_evitado(lotes, df_attr: pd.DataFrame, modo: str):
     """
-    Calcula estatísticas de combate para cada Pokémon:
-    vitórias, derrotas, número de lutas e taxa de vitória.
+    Repassa os lotes de combates somando o que `combates_com_nomes` ocuparia.
+
+    O tamanho é o mesmo medido por `salvar_tabela` (memória profunda do
+    DataFrame): os IDs do lote mais as três colunas de nomes.
 
     Args:
-        df (pd.DataFrame): DataFrame de combates com nomes de Pokémon.
+        lotes (iterable[pd.DataFrame]): Lotes de combates.
+        df_attr (pd.DataFrame): Atributos (colunas ID e Nome); None se a tabela
+            estiver ausente (os lotes são só repassados).
+        modo (str): Modo em uso ('view' ou 'nenhum'), para o relatório.
 
-    Retorna:
-        pd.DataFrame: Estatísticas de todos os Pokémon.
+    Yields:
+        pd.DataFrame: Os mesmos lotes recebidos.
     """
-    vitorias = df["nome_winner"].value_counts().reset_index()
-    vitorias.columns = ["Pokemon", "Vitorias"]
+    if df_attr is None:
+        print(AVISO_ATRIBUTOS_AUSENTES)
+        yield from lotes
+        return
+
+    base = int(df_attr["ID"].max()) + 1
+    bytes_nome = np.zeros(base + 1, dtype=np.int64)  # última posição: ID desconhecido
+    bytes_nome[df_attr["ID"].to_numpy()] = [
+        sys.getsizeof(str(nome)) + 8 for nome in df_attr["Nome"]
+    ]
+    bytes_nome[-1] = 8
+    linhas, total = 0, 0
+    for lote in lotes:
+        linhas += len(lote)
+        total += int(lote.memory_usage(deep=True, index=False).sum())
+        for coluna in TIPOS_COMBATES:
+            ids = lote[coluna].to_numpy()
+            total += int(
+                bytes_nome[np.where((ids >= 0) & (ids < base), ids, base)].sum()
+            )
+        yield lote
 
-    participacoes = (
-        pd.concat([df["nome_first"], df["nome_second"]]).value_counts().reset_index()
+    incrementar("linhas_evitadas", linhas, tabela="combates_com_nomes")
+    incrementar("bytes_evitados", total, tabela="combates_com_nomes")
+    print(
+        f"♻️ combates_com_nomes não materializada (modo {modo}): "
+        f"{linhas} linhas e {total / 1024 ** 2:.1f} MB de escrita evitados."
     )
-    participacoes.columns = ["Pokemon", "Lutas"]
 
-    estatisticas = participacoes.merge(vitorias, on="Pokemon", how="left").fillna(0)
-    estatisticas["Derrotas"] = estatisticas["Lutas"] - estatisticas["Vitorias"]
-    estatisticas["Taxa_Vitoria(%)"] = (
-        estatisticas["Vitorias"] / estatisticas["Lutas"] * 100
-    ).round(2)
 
-    salvar_tabela(estatisticas, "estatisticas_pokemon")
-    return estatisticas
+@medir("analise.analisar_segmentos")
+def analisar_segmentos(df_combates, df_attr: pd.DataFrame) -> dict:
+    """
+    Calcula as taxas de vitória por geração, tipo e status lendário.
 
+    Args:
+        df_combates (pd.DataFrame ou iterable[pd.DataFrame]): Combates
+            (first_pokemon, second_pokemon, winner), inteiros em um DataFrame
+            (agregação em múltiplos processos) ou em lotes (agregação incremental).
+        df_attr (pd.DataFrame): Atributos de todos os Pokémon.
 
+    Retorna:
+        dict: Resultado de `estatisticas_segmentos` (tabelas por segmento e
+            matrizes de confronto). As tabelas por segmento são salvas como
+            `taxa_vitoria_<segmento>`.
+    """
+    if isinstance(df_combates, pd.DataFrame):
+        segmentos = estatisticas_segmentos(df_combates, df_attr)
+    else:
+        segmentos = estatisticas_segmentos_em_lotes(df_combates, df_attr)
+    for nome in SEGMENTOS:
+        tabela = segmentos[f"por_{nome}"].assign(
+            Segmento=lambda df: df["Segmento"].astype(str)
+        )
+        salvar_tabela(tabela, f"taxa_vitoria_{nome}")
+    return segmentos
+
+
+@medir("analise.analisar_top10")
 def analisar_top10(df_estatisticas: pd.DataFrame):
     """
     Identifica o top 10 Pokémon por vitórias e derrotas.
 
+    Empates são desfeitos pelo nome do Pokémon, de modo que o top 10 (e a
+    versão do resumo) não depende da ordem em que o backend devolveu as linhas.
+
     Args:
         df_estatisticas (pd.DataFrame): Estatísticas dos Pokémon.
 
     Retorna:
         tuple: (top10_vitorias, top10_derrotas) DataFrames.
     """
-    top10_vitorias = df_estatisticas.nlargest(10, "Vitorias")
-    top10_derrotas = df_estatisticas.nlargest(10, "Derrotas")
+    ordenado = df_estatisticas.sort_values("Pokemon", kind="stable")
+    top10_vitorias = ordenado.nlargest(10, "Vitorias", keep="first")
+    top10_derrotas = ordenado.nlargest(10, "Derrotas", keep="first")
     salvar_tabela(top10_vitorias, "top10_vitorias")
     salvar_tabela(top10_derrotas, "top10_derrotas")
     return top10_vitorias, top10_derrotas
 
 
-def analisar_atributos_top10(top10_vitorias: pd.DataFrame):
+@medir("analise.analisar_atributos_top10")
+def analisar_atributos_top10(top10_vitorias: pd.DataFrame, df_attr=None):
     """
     Compara atributos do top 10 vencedores com a média geral dos Pokémon.
 
     Args:
         top10_vitorias (pd.DataFrame): DataFrame com top 10 vencedores.
+        df_attr (pd.DataFrame, optional): Atributos já carregados; evita
+            recarregar a tabela `atributos_pokemon`.
 
     Retorna:
         tuple: (atributos_top10, comparativo, atributos_geral)
     """
-    df_attr = carregar_tabela("atributos_pokemon")
+    if df_attr is None:
+        df_attr = carregar_tabela("atributos_pokemon")
+    # Colunas de controle da carga por merge não são atributos
+    df_attr = df_attr.drop(columns=list(COLUNAS_CONTROLE), errors="ignore")
     df_top10_attr = df_attr[df_attr["Nome"].isin(top10_vitorias["Pokemon"])]
 
     colunas_attr = df_attr.select_dtypes(include="number").columns
@@ -188,126 +356,111 @@ def analisar_atributos_top10(top10_vitorias: pd.DataFrame):
 # ------------------ Inicialização de Dados ------------------ #
 
 
-def inicializar_dados():
+@medir("analise.inicializar_dados")
+def inicializar_dados(recalcular=False):
     """
-    Carrega dados processados do banco ou gera-os caso não existam.
+    Carrega o resumo pré-agregado do dashboard ou gera-o caso não exista.
+
+    O caminho normal é uma única leitura da tabela `resumo_dashboard`. Sem
+    resumo, as tabelas analíticas são carregadas (ou calculadas, se ausentes)
+    e o resumo é materializado para as próximas execuções. Em backends locais
+    (DuckDB/SQLite) as estatísticas são agregadas diretamente em SQL por
+    `estatisticas_sql`; no PostgreSQL os combates são lidos em lotes e as
+    estatísticas dobradas incrementalmente, com memória limitada ao lote.
+    Apenas agregados são materializados: `combates_com_nomes` vira uma view
+    (ou nem é persistida), salvo com ANALISE_INTERMEDIARIOS=tabela.
+
+    Args:
+        recalcular (bool, optional): Ignora resumo e tabelas existentes e
+            recalcula tudo a partir das tabelas base (após uma nova carga).
 
     Retorna:
-        tuple: DataFrames (top10_vitorias, top10_derrotas, df_top10_attr, comparativo, df_attr_geral)
+        tuple: (top10_vitorias, top10_derrotas, df_top10_attr, comparativo, media_geral),
+            ou None se for preciso recalcular e `atributos_pokemon` estiver ausente.
     """
+    resumo = None if recalcular else carregar_resumo()
+    if resumo is not None:
+        return resumo_para_dataframes(resumo)
+
     comparativo = carregar_tabela("comparativo_atributos_top10")
     df_top10_attr = carregar_tabela("atributos_top10_vencedores")
     df_attr_geral = carregar_tabela("atributos_pokemon")
     top10_vitorias = carregar_tabela("top10_vitorias")
     top10_derrotas = carregar_tabela("top10_derrotas")
 
-    if comparativo is None or df_top10_attr is None:
-        df_completo = combinar_tabelas()
-        df_estatisticas = gerar_estatisticas(df_completo)
-        top10_vitorias, top10_derrotas = analisar_top10(df_estatisticas)
-        df_top10_attr, comparativo, df_attr_geral = analisar_atributos_top10(
-            top10_vitorias
-        )
-
-    return top10_vitorias, top10_derrotas, df_top10_attr, comparativo, df_attr_geral
-
-
-# ------------------ Visualização ------------------ #
-
-
-def criar_grafico_barras(comparativo: pd.DataFrame):
-    """
-    Cria gráfico de barras comparando atributos do Top 10 com a média geral.
-
-    Args:
-        comparativo (pd.DataFrame): DataFrame com médias dos atributos.
-
-    Retorna:
-        plotly.graph_objects.Figure: Gráfico de barras interativo.
-    """
-    fig = go.Figure()
-    fig.add_trace(
-        go.Bar(
-            x=comparativo["Atributo"],
-            y=comparativo["Média_Top10"],
-            name="Média Top 10",
-            marker_color="#1f77b4",
-        )
-    )
-    fig.add_trace(
-        go.Bar(
-            x=comparativo["Atributo"],
-            y=comparativo["Média_Geral"],
-            name="Média Geral",
-            marker_color="#ff7f0e",
+    segmentos = None
+    if recalcular or comparativo is None or df_top10_attr is None:
+        if df_attr_geral is None:
+            # Sem atributos não há nomes, segmentos nem média geral
+            print(AVISO_ATRIBUTOS_AUSENTES)
+            return None
+        df_attr_geral = df_attr_geral.drop(
+            columns=list(COLUNAS_CONTROLE), errors="ignore"
         )
-    )
-    fig.update_layout(
-        barmode="group",
-        title="Comparativo de Atributos: Top 10 vs Média Geral",
-        xaxis_title="Atributos",
-        yaxis_title="Valor Médio",
-        template="plotly_white",
-    )
-    return fig
-
-
-def criar_grafico_radar(df_top10_attr: pd.DataFrame, df_attr_geral: pd.DataFrame):
-    """
-    Cria gráfico radar comparando atributos do Top 10 com a média geral.
-
-    Args:
-        df_top10_attr (pd.DataFrame): Atributos dos Top 10 vencedores.
-        df_attr_geral (pd.DataFrame): Atributos de todos os Pokémon.
-
-    Retorna:
-        plotly.graph_objects.Figure: Gráfico radar interativo.
-    """
-    colunas_attr = df_top10_attr.select_dtypes(include="number").columns
-    media_geral = df_attr_geral[colunas_attr].mean().round(2)
-    fig = go.Figure()
-
-    for _, row in df_top10_attr.iterrows():
-        fig.add_trace(
-            go.Scatterpolar(
-                r=row[colunas_attr].values,
-                theta=colunas_attr,
-                fill="toself",
-                name=row["Nome"],
-            )
+        modo = modo_intermediarios()
+        lotes = carregar_tabela_em_lotes(
+            "combates", colunas=list(TIPOS_COMBATES), tipos=TIPOS_COMBATES
         )
-
-    fig.add_trace(
-        go.Scatterpolar(
-            r=media_geral.values,
-            theta=colunas_attr,
-            fill="toself",
-            name="Média Geral",
-            line=dict(color="black", dash="dash"),
+        if modo == "tabela":
+            lotes = combinar_tabelas_em_lotes(lotes, df_attr_geral)
+        else:
+            lotes = contabilizar_intermediario_evitado(lotes, df_attr_geral, modo)
+
+        if backend_atual() == "postgres":
+            # Uma passada em lotes: intermediário (se pedido) + estatísticas
+            segmentos = analisar_segmentos(lotes, df_attr_geral)
+            df_estatisticas = segmentos["estatisticas"]
+        else:
+            # Banco local: o pool de processos precisa dos combates contíguos em
+            # memória compartilhada; só três colunas int32 (12 bytes por combate)
+            # são concatenadas. Tabela vazia: um único lote vazio
+            segmentos = analisar_segmentos(pd.concat(lotes), df_attr_geral)
+            df_estatisticas = estatisticas_sql()
+        salvar_tabela(df_estatisticas, "estatisticas_pokemon")
+        if modo == "view":
+            criar_view("combates_com_nomes", SQL_COMBATES_COM_NOMES)
+        top10_vitorias, top10_derrotas = analisar_top10(df_estatisticas)
+        df_top10_attr, comparativo, df_attr_geral = analisar_atributos_top10(
+            top10_vitorias, df_attr_geral
         )
-    )
 
-    fig.update_layout(
-        polar=dict(radialaxis=dict(visible=True)),
-        title="Radar: Top 10 vs Média Geral",
-        template="plotly_white",
+    resumo = gerar_resumo(
+        df_attr_geral,
+        top10_vitorias,
+        top10_derrotas,
+        df_top10_attr,
+        comparativo,
+        segmentos,
     )
-    return fig
+    salvar_resumo(resumo)
+    salvar_figuras(gerar_figuras(resumo))
+    return resumo_para_dataframes(resumo)
 
 
 # ------------------ Dashboard HTML ------------------ #
 
 
-def gerar_dashboard():
+@medir("analise.gerar_dashboard")
+def gerar_dashboard(recalcular=False):
     """
     Gera dashboard HTML completo com tabelas e gráficos,
     salvando-o em 'report/dashboard_pokemon_estilizado.html'.
+
+    Os gráficos são lidos do artefato de figuras da versão atual do resumo
+    (gerado na etapa de análise), sem reconstruí-los.
+
+    Args:
+        recalcular (bool, optional): Recalcula as análises em vez de reutilizar
+            o resumo existente (ver `inicializar_dados`).
     """
-    top10_vitorias, top10_derrotas, df_top10_attr, comparativo, df_attr_geral = (
-        inicializar_dados()
-    )
-    fig_barras = criar_grafico_barras(comparativo)
-    fig_radar = criar_grafico_radar(df_top10_attr, df_attr_geral)
+    resumo = None if recalcular else carregar_resumo()
+    if resumo is None:
+        if inicializar_dados(recalcular) is None:
+            print("⚠️ Relatório HTML não gerado: análise indisponível.")
+            return
+        resumo = carregar_resumo()
+    top10_vitorias, top10_derrotas, *_ = resumo_para_dataframes(resumo)
+    figuras = obter_figuras(resumo)["claro"]
 
     os.makedirs("report", exist_ok=True)
 
@@ -347,8 +500,8 @@ def gerar_dashboard():
             <div id="grafico_radar"></div>
         </div>
         <script>
-            Plotly.newPlot('grafico_barras', {fig_barras.to_json()});
-            Plotly.newPlot('grafico_radar', {fig_radar.to_json()});
+            Plotly.newPlot('grafico_barras', {json.dumps(figuras["barras"])});
+            Plotly.newPlot('grafico_radar', {json.dumps(figuras["radar"])});
         </script>
     </body>
     </html>
@@ -0,0 +1,315 @@
+"""
+Análise Paralela - Estatísticas por Segmento em Múltiplos Processos
+
+Este módulo calcula, em uma única passada sobre os combates, as estatísticas
+de vitória por Pokémon e os confrontos entre segmentos (geração, tipo e
+status lendário):
+
+1. Os combates (first_pokemon, second_pokemon, winner) são copiados uma vez
+   para um bloco de memória compartilhada (`multiprocessing.shared_memory`).
+2. Cada processo do pool anexa o bloco e agrega uma fatia contígua de
+   combates com `np.bincount`, sem serializar DataFrames.
+3. Os agregados parciais (arrays pequenos) são somados no processo principal.
+
+As taxas por segmento (ex.: "Pokémon lendários vencem X% das lutas") são
+derivadas dos totais por Pokémon; as matrizes segmento x segmento vêm da
+agregação paralela.
+
+Variáveis de ambiente:
+    KAIZEN_PROCESSOS: Número de processos (padrão: núcleos disponíveis)
+    KAIZEN_LIMIAR_PARALELO: Combates mínimos para usar o pool (padrão: 1000000)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from indice_confrontos import codificar_tipos
+from instrumentacao import medir, incrementar
+from resumo_dashboard import normalizar_atributos
+
+PROCESSOS = int(os.getenv("KAIZEN_PROCESSOS", "0")) or os.cpu_count() or 1
+LIMIAR_PARALELO = int(os.getenv("KAIZEN_LIMIAR_PARALELO", "1000000"))
+SEGMENTOS = ("geracao", "tipo", "lendario")
+AVISO_ATRIBUTOS_AUSENTES = (
+    "⚠️ Tabela atributos_pokemon ausente; combates sem nomes nem segmentos "
+    "(rode a etapa load)."
+)
+
+# Estado de cada processo do pool (definido por `_inicializar_trabalhador`)
+_trabalhador = {}
+
+
+# ------------------ Codificação de Segmentos ------------------ #
+
+
+def _atributos_ou_vazio(df_attr):
+    """`df_attr`, ou uma tabela vazia (com aviso) se `atributos_pokemon` faltar."""
+    if df_attr is not None:
+        return df_attr
+    print(AVISO_ATRIBUTOS_AUSENTES)
+    return pd.DataFrame(
+        {
+            "ID": pd.Series(dtype="int64"),
+            "Nome": pd.Series(dtype=object),
+            "Generation": pd.Series(dtype=object),
+            "Legendary": pd.Series(dtype=object),
+            "Types": pd.Series(dtype=object),
+        }
+    )
+
+
+def _maior_id(df_attr: pd.DataFrame) -> int:
+    """Maior ID da tabela de atributos (0 se vazia)."""
+    return int(df_attr["ID"].to_numpy(dtype=np.int64).max(initial=0))
+
+
+def codificar_segmentos(df_attr: pd.DataFrame, base: int) -> dict:
+    """
+    Monta, para cada segmento, uma tabela ID -> códigos do segmento.
+
+    Args:
+        df_attr (pd.DataFrame): Colunas ID, Generation, Legendary e Types.
+        base (int): Maior ID + 1 (tamanho das tabelas).
+
+    Returns:
+        dict: {segmento: (rotulos, tabela)}, onde tabela tem forma (base, k)
+            e -1 nas posições sem valor (Pokémon com dois tipos usam k=2).
+    """
+    df_attr = _atributos_ou_vazio(df_attr)
+    df = normalizar_atributos(df_attr)
+    ids = df["ID"].to_numpy(dtype=np.int64)
+    segmentos = {}
+
+    geracoes = df["Generation"]
+    rotulos = sorted(int(g) for g in geracoes.dropna().unique())
+    tabela = np.full((base, 1), -1, dtype=np.int32)
+    codigo = {g: i for i, g in enumerate(rotulos)}
+    tabela[ids, 0] = [codigo.get(g, -1) if pd.notna(g) else -1 for g in geracoes]
+    segmentos["geracao"] = (rotulos, tabela)
+
+    tabela = np.full((base, 1), -1, dtype=np.int32)
+    tabela[ids, 0] = df["Legendary"].to_numpy(dtype=np.int32)
+    segmentos["lendario"] = ([False, True], tabela)
+
+    segmentos["tipo"] = codificar_tipos(df_attr, base)
+    return segmentos
+
+
+# ------------------ Agregação de uma Fatia ------------------ #
+
+
+def _agregar(first, second, winner, base: int, segmentos: dict) -> dict:
+    """
+    Agrega um conjunto de combates.
+
+    Returns:
+        dict: 'lutas' e 'vitorias' por ID e, por segmento, matrizes
+            'lutas_<seg>' / 'vitorias_<seg>' (atacante x oponente).
+    """
+    parcial = {
+        "lutas": np.bincount(first, minlength=base)
+        + np.bincount(second, minlength=base),
+        "vitorias": np.bincount(winner, minlength=base),
+    }
+    for nome, (rotulos, tabela) in segmentos.items():
+        n = len(rotulos)
+        lutas = np.zeros(n * n, dtype=np.int64)
+        vitorias = np.zeros(n * n, dtype=np.int64)
+        for atacante, oponente in ((first, second), (second, first)):
+            venceu = winner == atacante
+            for i in range(tabela.shape[1]):
+                for j in range(tabela.shape[1]):
+                    sx = tabela[atacante, i]
+                    sy = tabela[oponente, j]
+                    validos = (sx >= 0) & (sy >= 0)
+                    chave = sx[validos] * n + sy[validos]
+                    lutas += np.bincount(chave, minlength=n * n)
+                    vitorias += np.bincount(
+                        chave, weights=venceu[validos], minlength=n * n
+                    ).astype(np.int64)
+        parcial[f"lutas_{nome}"] = lutas
+        parcial[f"vitorias_{nome}"] = vitorias
+    return parcial
+
+
+def _inicializar_trabalhador(nome_memoria, forma, base, segmentos):
+    """Anexa o bloco de memória compartilhada no processo do pool."""
+    memoria = shared_memory.SharedMemory(name=nome_memoria)
+    _trabalhador["memoria"] = memoria  # mantém a referência viva
+    _trabalhador["combates"] = np.ndarray(forma, dtype=np.int32, buffer=memoria.buf)
+    _trabalhador["base"] = base
+    _trabalhador["segmentos"] = segmentos
+
+
+def _agregar_fatia(inicio: int, fim: int) -> dict:
+    """Agrega os combates [inicio, fim) do bloco compartilhado."""
+    combates = _trabalhador["combates"]
+    return _agregar(
+        combates[0, inicio:fim],
+        combates[1, inicio:fim],
+        combates[2, inicio:fim],
+        _trabalhador["base"],
+        _trabalhador["segmentos"],
+    )
+
+
+def _somar(parciais) -> dict:
+    """Soma os agregados parciais chave a chave."""
+    total = {}
+    for parcial in parciais:
+        for chave, valor in parcial.items():
+            total[chave] = total[chave] + valor if chave in total else valor
+    return total
+
+
+# ------------------ Execução ------------------ #
+
+
+def _taxa(vitorias, lutas):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(lutas > 0, vitorias / lutas * 100, np.nan).round(2)
+
+
+@medir("analise.estatisticas_segmentos")
+def estatisticas_segmentos(
+    df_combates: pd.DataFrame, df_attr: pd.DataFrame, processos: int = None
+) -> dict:
+    """
+    Calcula estatísticas por Pokémon e por segmento, em paralelo quando vale a pena.
+
+    Args:
+        df_combates (pd.DataFrame): Colunas first_pokemon, second_pokemon, winner.
+        df_attr (pd.DataFrame): Colunas ID, Nome, Generation, Legendary e Types.
+        processos (int, optional): Tamanho do pool. Padrão: KAIZEN_PROCESSOS.
+            Abaixo de KAIZEN_LIMIAR_PARALELO combates, roda no próprio processo.
+
+    Returns:
+        dict: DataFrames 'estatisticas' (por Pokémon, mesmas colunas de
+            `estatisticas_pokemon`), 'por_<segmento>' (Segmento, Lutas, Vitorias,
+            Taxa_Vitoria(%)) e 'confronto_<segmento>' (taxa de vitória %
+            atacante x oponente), para cada segmento em SEGMENTOS.
+    """
+    processos = processos or PROCESSOS
+    df_attr = _atributos_ou_vazio(df_attr)
+    combates = np.ascontiguousarray(
+        df_combates[["first_pokemon", "second_pokemon", "winner"]]
+        .to_numpy(dtype=np.int32)
+        .T
+    )
+    n = combates.shape[1]
+    base = int(max(combates.max(initial=0), _maior_id(df_attr))) + 1
+    segmentos = codificar_segmentos(df_attr, base)
+
+    if processos <= 1 or n < LIMIAR_PARALELO:
+        total = _agregar(combates[0], combates[1], combates[2], base, segmentos)
+    else:
+        memoria = shared_memory.SharedMemory(create=True, size=combates.nbytes)
+        try:
+            compartilhado = np.ndarray(
+                combates.shape, dtype=np.int32, buffer=memoria.buf
+            )
+            compartilhado[:] = combates
+            del combates
+            limites = np.linspace(0, n, processos + 1, dtype=np.int64)
+            with ProcessPoolExecutor(
+                max_workers=processos,
+                initializer=_inicializar_trabalhador,
+                initargs=(memoria.name, compartilhado.shape, base, segmentos),
+            ) as executor:
+                total = _somar(executor.map(_agregar_fatia, limites[:-1], limites[1:]))
+            del compartilhado
+        finally:
+            memoria.close()
+            memoria.unlink()
+    incrementar("linhas_agregadas", n, processos=processos)
+    return _montar_resultado(total, segmentos, df_attr)
+
+
+@medir("analise.estatisticas_segmentos_em_lotes")
+def estatisticas_segmentos_em_lotes(lotes, df_attr: pd.DataFrame) -> dict:
+    """
+    Mesmo resultado de `estatisticas_segmentos`, dobrando lotes de combates.
+
+    Cada lote é agregado e descartado, então o pico de memória é limitado pelo
+    tamanho do lote, não pelo total de combates.
+
+    Args:
+        lotes (iterable[pd.DataFrame]): Lotes com first_pokemon, second_pokemon, winner
+            (ex.: `carregar_tabela_em_lotes('combates')`).
+        df_attr (pd.DataFrame): Colunas ID, Nome, Generation, Legendary e Types.
+
+    Returns:
+        dict: Ver `estatisticas_segmentos`. Combates com IDs ausentes de
+            `df_attr` são ignorados.
+    """
+    df_attr = _atributos_ou_vazio(df_attr)
+    base = _maior_id(df_attr) + 1
+    segmentos = codificar_segmentos(df_attr, base)
+    total, n = None, 0
+    for lote in lotes:
+        combates = lote[["first_pokemon", "second_pokemon", "winner"]].to_numpy(
+            dtype=np.int64
+        )
+        combates = combates[((combates >= 0) & (combates < base)).all(axis=1)]
+        parcial = _agregar(
+            combates[:, 0], combates[:, 1], combates[:, 2], base, segmentos
+        )
+        total = parcial if total is None else _somar([total, parcial])
+        n += len(combates)
+    if total is None:
+        vazio = np.empty(0, dtype=np.int64)
+        total = _agregar(vazio, vazio, vazio, base, segmentos)
+    incrementar("linhas_agregadas", n, processos=1)
+    return _montar_resultado(total, segmentos, df_attr)
+
+
+def _montar_resultado(total: dict, segmentos: dict, df_attr: pd.DataFrame) -> dict:
+    """Converte os agregados somados nos DataFrames de `estatisticas_segmentos`."""
+    # Por Pokémon
+    ids = df_attr["ID"].to_numpy(dtype=np.int64)
+    lutas, vitorias = total["lutas"][ids], total["vitorias"][ids]
+    estatisticas = pd.DataFrame(
+        {
+            "Pokemon": df_attr["Nome"].to_numpy(),
+            "Lutas": lutas.astype(float),
+            "Vitorias": vitorias.astype(float),
+            "Derrotas": (lutas - vitorias).astype(float),
+            "Taxa_Vitoria(%)": _taxa(vitorias, lutas),
+        }
+    )
+    resultado = {
+        "estatisticas": estatisticas[lutas > 0]
+        .sort_values(["Lutas", "Pokemon"], ascending=[False, True], kind="stable")
+        .reset_index(drop=True)
+    }
+
+    # Por segmento: totais dos Pokémon de cada segmento + matriz de confrontos
+    for nome, (rotulos, tabela) in segmentos.items():
+        k = len(rotulos)
+        lutas_seg = np.zeros(k, dtype=np.int64)
+        vitorias_seg = np.zeros(k, dtype=np.int64)
+        for coluna in range(tabela.shape[1]):
+            codigos = tabela[:, coluna]
+            validos = codigos >= 0
+            lutas_seg += np.bincount(
+                codigos[validos], weights=total["lutas"][validos], minlength=k
+            ).astype(np.int64)
+            vitorias_seg += np.bincount(
+                codigos[validos], weights=total["vitorias"][validos], minlength=k
+            ).astype(np.int64)
+        resultado[f"por_{nome}"] = pd.DataFrame(
+            {
+                "Segmento": rotulos,
+                "Lutas": lutas_seg,
+                "Vitorias": vitorias_seg,
+                "Taxa_Vitoria(%)": _taxa(vitorias_seg, lutas_seg),
+            }
+        )
+        resultado[f"confronto_{nome}"] = pd.DataFrame(
+            _taxa(total[f"vitorias_{nome}"], total[f"lutas_{nome}"]).reshape(k, k),
+            index=[str(r) for r in rotulos],
+            columns=[str(r) for r in rotulos],
+        )
+    return resultado
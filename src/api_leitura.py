@@ -0,0 +1,302 @@
+"""
+API de Leitura - Análises Pré-calculadas em JSON via HTTP
+
+Serve, somente leitura, os resultados da etapa `analyze` para outras equipes,
+sem Streamlit e sem SQL direto no PostgreSQL:
+
+- GET /v1/versao: versão dos dados e horário de geração
+- GET /v1/top10/vitorias e /v1/top10/derrotas (`analisar_top10`)
+- GET /v1/atributos/comparativo e /v1/atributos/top10 (`analisar_atributos_top10`)
+- GET /v1/pokemons e /v1/pokemons/<nome> (tabela `estatisticas_pokemon`)
+- GET /v1/ratings: ranking Elo, se presente no snapshot
+- GET /saude
+
+Todas as respostas são montadas uma vez por versão dos dados e guardadas em
+memória já serializadas, com ETag e, acima de GZIP_MINIMO bytes, também
+comprimidas com gzip. Uma requisição só escolhe a variante (304 se o
+If-None-Match confere, gzip se aceito) e escreve os bytes prontos.
+
+Fonte dos dados: o snapshot do dashboard (`snapshot_dashboard.snapshot_atual`),
+verificado com um `stat` do ponteiro por requisição; ao publicar uma versão
+nova, as respostas são remontadas na requisição seguinte. Sem snapshot, o
+resumo e as estatísticas vêm do backend analítico, com a versão conferida no
+máximo a cada API_LEITURA_VERIFICACAO_S segundos.
+
+Uso:
+    python src/main.py api
+    python src/api_leitura.py
+
+Variáveis de ambiente:
+    API_LEITURA_HOST / API_LEITURA_PORTA: Endereço (padrão: 127.0.0.1:8090)
+    API_LEITURA_MAX_AGE: Cache-Control max-age em segundos (padrão: 60)
+    API_LEITURA_VERIFICACAO_S: Intervalo de verificação sem snapshot (padrão: 30)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+from instrumentacao import incrementar
+
+HOST = os.getenv("API_LEITURA_HOST", "127.0.0.1")
+PORTA = int(os.getenv("API_LEITURA_PORTA", "8090"))
+MAX_AGE = int(os.getenv("API_LEITURA_MAX_AGE", "60"))
+VERIFICACAO_S = float(os.getenv("API_LEITURA_VERIFICACAO_S", "30"))
+GZIP_MINIMO = 1024  # corpos menores não compensam a compressão
+NIVEL_GZIP = 6
+
+# Rota -> chave do resumo (`resumo_dashboard.gerar_resumo`)
+ROTAS_RESUMO = {
+    "/v1/top10/vitorias": "top10_vitorias",
+    "/v1/top10/derrotas": "top10_derrotas",
+    "/v1/atributos/comparativo": "comparativo",
+    "/v1/atributos/top10": "atributos_top10",
+}
+
+
+# ------------------ Respostas Pré-serializadas ------------------ #
+
+
+class Resposta:
+    """
+    Corpo JSON serializado uma vez, com ETag e variante gzip.
+
+    Args:
+        corpo (object): Valor serializável em JSON.
+        status (int, optional): Código HTTP.
+    """
+
+    __slots__ = ("status", "bruto", "comprimido", "etag", "etags")
+
+    def __init__(self, corpo, status: int = 200):
+        self.status = status
+        self.bruto = json.dumps(corpo, ensure_ascii=False, default=str).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.bruto).hexdigest()[:20]}"'
+        self.comprimido = None
+        if len(self.bruto) >= GZIP_MINIMO:
+            self.comprimido = gzip.compress(self.bruto, NIVEL_GZIP, mtime=0)
+        # A variante gzip tem ETag própria; If-None-Match aceita qualquer uma
+        self.etags = {self.etag, self.etag[:-1] + '-gzip"', "*"}
+
+
+def _registros(df) -> list:
+    """DataFrame em lista de dicionários serializáveis em JSON."""
+    return json.loads(df.to_json(orient="records", force_ascii=False))
+
+
+def montar_respostas(versao: str, resumo: dict, estatisticas: list, ratings=None):
+    """
+    Serializa todas as respostas de uma versão dos dados.
+
+    Args:
+        versao (str): Versão dos dados.
+        resumo (dict): Resumo do dashboard.
+        estatisticas (list[dict]): Estatísticas por Pokémon.
+        ratings (list[dict], optional): Ranking Elo.
+
+    Returns:
+        dict: Caminho (nome do Pokémon em minúsculas em /v1/pokemons/) -> Resposta.
+    """
+    meta = {"versao": versao, "gerado_em": resumo.get("gerado_em")}
+    respostas = {"/v1/versao": Resposta(meta)}
+    for rota, chave in ROTAS_RESUMO.items():
+        respostas[rota] = Resposta({**meta, "itens": resumo.get(chave, [])})
+    respostas["/v1/pokemons"] = Resposta(
+        {**meta, "total": len(estatisticas), "itens": estatisticas}
+    )
+    for linha in estatisticas:
+        nome = str(linha.get("Pokemon", "")).strip().lower()
+        respostas[f"/v1/pokemons/{nome}"] = Resposta({**meta, **linha})
+    if ratings is not None:
+        respostas["/v1/ratings"] = Resposta({**meta, "itens": ratings})
+    return respostas
+
+
+# ------------------ Fonte dos Dados ------------------ #
+
+
+class FonteAnalises:
+    """
+    Mantém as respostas da versão atual, remontando-as quando a versão muda.
+
+    Args:
+        diretorio_snapshots (str, optional): Diretório dos snapshots do dashboard.
+        verificacao_s (float, optional): Intervalo de verificação sem snapshot.
+    """
+
+    def __init__(self, diretorio_snapshots: str = None, verificacao_s=VERIFICACAO_S):
+        from snapshot_dashboard import DIRETORIO_SNAPSHOTS
+
+        self.diretorio = diretorio_snapshots or DIRETORIO_SNAPSHOTS
+        self.verificacao_s = verificacao_s
+        self.versao = None
+        self.respostas = {}
+        self._verificado_em = 0.0
+        self._lock = threading.Lock()
+
+    def _do_snapshot(self, snapshot):
+        estatisticas = snapshot.tabelas["estatisticas"].to_pylist()
+        ratings = snapshot.tabelas.get("ratings")
+        return montar_respostas(
+            snapshot.versao,
+            snapshot.resumo,
+            estatisticas,
+            ratings.to_pylist() if ratings is not None else None,
+        )
+
+    def _do_banco(self):
+        """Resumo e estatísticas do backend analítico, se a versão mudou."""
+        from backend_analitico import ler_sql
+        from resumo_dashboard import carregar_resumo
+
+        resumo = carregar_resumo()
+        if resumo is None:
+            return None, None
+        if resumo["versao"] == self.versao:
+            return self.versao, self.respostas
+        estatisticas = _registros(ler_sql('SELECT * FROM "estatisticas_pokemon"'))
+        try:
+            ratings = _registros(ler_sql('SELECT * FROM "ratings_elo"'))
+        except Exception:
+            ratings = None
+        respostas = montar_respostas(resumo["versao"], resumo, estatisticas, ratings)
+        return resumo["versao"], respostas
+
+    def atual(self) -> dict:
+        """
+        Respostas da versão corrente dos dados.
+
+        Returns:
+            dict: Caminho -> Resposta (vazio se não houver dados publicados).
+        """
+        from snapshot_dashboard import snapshot_atual
+
+        snapshot = snapshot_atual(self.diretorio)
+        if snapshot is not None and snapshot.versao == self.versao:
+            return self.respostas
+        with self._lock:
+            if snapshot is not None:
+                if snapshot.versao != self.versao:
+                    self._trocar(snapshot.versao, self._do_snapshot(snapshot))
+            elif time.monotonic() - self._verificado_em >= self.verificacao_s:
+                self._verificado_em = time.monotonic()
+                try:
+                    versao, respostas = self._do_banco()
+                except Exception as erro:
+                    print(f"⚠️ Dados indisponíveis no banco: {erro}")
+                    versao, respostas = None, None
+                if versao is not None and versao != self.versao:
+                    self._trocar(versao, respostas)
+            return self.respostas
+
+    def _trocar(self, versao: str, respostas: dict):
+        self.versao, self.respostas = versao, respostas
+        incrementar("api_leitura_versoes")
+        print(f"🔄 API de leitura servindo a versão {versao} ({len(respostas)} rotas).")
+
+
+# ------------------ Servidor HTTP ------------------ #
+
+
+NAO_ENCONTRADO = Resposta({"erro": "não encontrado"}, 404)
+SEM_DADOS = Resposta({"erro": "dados ainda não publicados (rode a etapa analyze)"}, 503)
+SAUDAVEL = Resposta({"ok": True})
+
+
+def _escolher(fonte: FonteAnalises, caminho: str) -> Resposta:
+    """Resposta pronta para o caminho pedido."""
+    if caminho == "/saude":
+        return SAUDAVEL
+    respostas = fonte.atual()
+    if not respostas:
+        return SEM_DADOS
+    if caminho.startswith("/v1/pokemons/"):
+        caminho = unquote(caminho).strip().lower()
+    return respostas.get(caminho.rstrip("/") or "/", NAO_ENCONTRADO)
+
+
+class ManipuladorLeitura(BaseHTTPRequestHandler):
+    """Escreve a variante adequada de uma resposta pré-serializada."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive entre requisições do mesmo cliente
+    # Cabeçalhos e corpo saem em escritas separadas: sem Nagle, o corpo não
+    # espera o ACK atrasado do cliente (~40 ms por resposta)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        resposta = _escolher(self.server.fonte, urlparse(self.path).path)
+        condicional = self.headers.get("If-None-Match")
+        usar_gzip = resposta.comprimido is not None and "gzip" in self.headers.get(
+            "Accept-Encoding", ""
+        )
+        etag = resposta.etag[:-1] + '-gzip"' if usar_gzip else resposta.etag
+
+        if resposta.status == 200 and condicional:
+            pedidas = {tag.strip() for tag in condicional.split(",")}
+            if pedidas & resposta.etags:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", f"public, max-age={MAX_AGE}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        corpo = resposta.comprimido if usar_gzip else resposta.bruto
+        self.send_response(resposta.status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        if resposta.status == 200:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", f"public, max-age={MAX_AGE}")
+        if resposta.comprimido is not None:
+            self.send_header("Vary", "Accept-Encoding")
+        if usar_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass  # sem log por requisição
+
+
+def iniciar_api(
+    host: str = HOST, porta: int = PORTA, fonte: FonteAnalises = None
+) -> ThreadingHTTPServer:
+    """
+    Inicia a API de leitura em uma thread daemon.
+
+    Args:
+        host (str, optional): Endereço de escuta.
+        porta (int, optional): Porta (0 escolhe uma livre).
+        fonte (FonteAnalises, optional): Fonte das respostas.
+
+    Returns:
+        ThreadingHTTPServer: Servidor iniciado (`server_address` traz a porta).
+    """
+    servidor = ThreadingHTTPServer((host, porta), ManipuladorLeitura)
+    servidor.daemon_threads = True
+    servidor.fonte = fonte or FonteAnalises()
+    servidor.fonte.atual()  # monta as respostas antes da primeira requisição
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    print(f"📡 API de leitura em http://{host}:{servidor.server_address[1]}/v1/versao")
+    return servidor
+
+
+def main():
+    """Executa a API de leitura até Ctrl+C."""
+    servidor = iniciar_api()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.shutdown()
+        print("👋 API de leitura encerrada.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+"""
+Backend Analítico - PostgreSQL, DuckDB ou SQLite
+
+Este módulo permite escolher onde as análises e o dashboard leem e gravam
+suas tabelas. Além do PostgreSQL remoto (via `banco_conexao.obter_engine`),
+as mesmas estatísticas podem rodar sobre um arquivo embarcado DuckDB ou
+SQLite construído diretamente a partir dos dados em `out/`.
+
+O PostgreSQL remoto passa a ser usado apenas para publicação
+(`publicar_tabelas`), enquanto análise e dashboard rodam localmente. Quando o
+backend é o próprio PostgreSQL, leituras (`ler_sql`, `ler_sql_em_lotes`) usam
+o engine de leitura de `banco_conexao` e gravações, o de escrita.
+
+Variáveis de ambiente:
+    ANALISE_BACKEND: 'postgres' (padrão), 'duckdb' ou 'sqlite'
+    ANALISE_ARQUIVO: Caminho do arquivo local (padrão: 'out/analise.duckdb'
+        ou 'out/analise.db', conforme o backend)
+    DB_TAMANHO_LOTE_LEITURA: Linhas por lote em `ler_sql_em_lotes` (padrão: 100000)
+"""
+
+import os
+import re
+import pandas as pd
+from banco_conexao import obter_engine, ativar_wal_sqlite, TAMANHO_LOTE
+from escrita_csv import caminho_csv
+from instrumentacao import medir, incrementar
+
+BACKENDS = ("postgres", "duckdb", "sqlite")
+TABELAS_BASE = ("pokemons", "atributos_pokemon", "combates")
+TAMANHO_LOTE_LEITURA = int(os.getenv("DB_TAMANHO_LOTE_LEITURA", "100000"))
+
+_conexoes = {}  # cache de conexões/engines por (backend, arquivo)
+
+
+# ------------------ Configuração ------------------ #
+
+
+def backend_atual() -> str:
+    """
+    Retorna o backend analítico configurado em ANALISE_BACKEND.
+
+    Retorna:
+        str: 'postgres', 'duckdb' ou 'sqlite'.
+
+    Levanta:
+        ValueError: Caso o backend configurado seja desconhecido.
+    """
+    backend = (os.getenv("ANALISE_BACKEND") or "postgres").strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"❌ ANALISE_BACKEND inválido: '{backend}'. Use um de {BACKENDS}."
+        )
+    return backend
+
+
+def arquivo_local(backend: str = None) -> str:
+    """
+    Retorna o caminho do arquivo do banco embarcado.
+
+    Args:
+        backend (str, optional): 'duckdb' ou 'sqlite'. Padrão: backend atual.
+
+    Retorna:
+        str: Caminho do arquivo local.
+    """
+    backend = backend or backend_atual()
+    padrao = "out/analise.duckdb" if backend == "duckdb" else "out/analise.db"
+    return os.getenv("ANALISE_ARQUIVO", padrao)
+
+
+def obter_conexao(backend: str = None, papel: str = "escrita"):
+    """
+    Retorna (e mantém em cache) a conexão do backend analítico.
+
+    Args:
+        backend (str, optional): Backend desejado. Padrão: backend atual.
+        papel (str, optional): Apenas PostgreSQL: 'escrita' (padrão) ou
+            'leitura' (engine de leitura de `banco_conexao`, réplica se houver).
+
+    Retorna:
+        duckdb.DuckDBPyConnection ou sqlalchemy.engine.Engine: Conexão do backend.
+    """
+    backend = backend or backend_atual()
+    if backend == "postgres":
+        # `banco_conexao` já mantém um engine por papel; a rota de leitura muda
+        # dentro de `leitura_no_primario`, por isso não entra neste cache
+        return obter_engine(papel)
+    chave = (backend, arquivo_local(backend))
+    if chave in _conexoes:
+        return _conexoes[chave]
+
+    if backend == "duckdb":
+        try:
+            import duckdb
+        except ImportError as e:
+            raise ImportError(
+                "❌ Backend 'duckdb' requer o pacote duckdb (pip install duckdb)."
+            ) from e
+        os.makedirs(os.path.dirname(chave[1]) or ".", exist_ok=True)
+        conexao = duckdb.connect(chave[1])
+    elif backend == "sqlite":
+        from sqlalchemy import create_engine
+
+        os.makedirs(os.path.dirname(chave[1]) or ".", exist_ok=True)
+        conexao = ativar_wal_sqlite(create_engine(f"sqlite:///{chave[1]}"))
+
+    _conexoes[chave] = conexao
+    return conexao
+
+
+# ------------------ Leitura e Escrita ------------------ #
+
+
+def ler_sql(
+    sql: str, backend: str = None, parametros: dict = None, papel: str = "leitura"
+) -> pd.DataFrame:
+    """
+    Executa uma consulta no backend analítico e retorna um DataFrame.
+
+    Args:
+        sql (str): Consulta SQL; parâmetros nomeados no formato `:nome`.
+        backend (str, optional): Backend desejado. Padrão: backend atual.
+        parametros (dict, optional): Valores dos parâmetros nomeados.
+        papel (str, optional): Papel da conexão no PostgreSQL (padrão: 'leitura').
+
+    Retorna:
+        pd.DataFrame: Resultado da consulta.
+    """
+    backend = backend or backend_atual()
+    conexao = obter_conexao(backend, papel)
+    with medir("backend.ler_sql", backend=backend):
+        if backend == "duckdb":
+            if parametros:
+                # DuckDB usa $nome; evita confundir com casts '::tipo'
+                sql = re.sub(r"(?<![:\w]):([A-Za-z_]\w*)", r"$\1", sql)
+            df = conexao.execute(sql, parametros or None).df()
+        elif parametros:
+            from sqlalchemy import text
+
+            df = pd.read_sql(text(sql), conexao, params=parametros)
+        else:
+            df = pd.read_sql(sql, conexao)
+    incrementar("linhas_lidas", len(df), backend=backend)
+    return df
+
+
+def ler_sql_em_lotes(
+    sql: str, backend: str = None, tamanho_lote: int = None, tipos: dict = None
+):
+    """
+    Executa uma consulta e entrega o resultado em lotes, sem materializá-lo inteiro.
+
+    No PostgreSQL/SQLite usa cursor do lado do servidor (`stream_results`) com
+    `chunksize`; no DuckDB busca blocos do resultado com `fetch_df_chunk`. No
+    PostgreSQL a consulta vai para o engine de leitura.
+
+    Args:
+        sql (str): Consulta SQL.
+        backend (str, optional): Backend desejado. Padrão: backend atual.
+        tamanho_lote (int, optional): Linhas por lote. Padrão: DB_TAMANHO_LOTE_LEITURA.
+        tipos (dict, optional): Tipos por coluna aplicados a cada lote
+            (ex.: {'winner': 'int32'}).
+
+    Yields:
+        pd.DataFrame: Lotes do resultado; um lote vazio (com as colunas e os
+            tipos) se a consulta não retornar linhas.
+    """
+    backend = backend or backend_atual()
+    tamanho_lote = tamanho_lote or TAMANHO_LOTE_LEITURA
+    conexao = obter_conexao(backend, "leitura")
+
+    def tipar(lote):
+        incrementar("linhas_lidas", len(lote), backend=backend)
+        return lote.astype(tipos) if tipos else lote
+
+    if backend == "duckdb":
+        resultado = conexao.cursor().execute(sql)
+        vetores = max(1, tamanho_lote // 2048)  # DuckDB entrega vetores de 2048 linhas
+        entregues = 0
+        while True:
+            lote = resultado.fetch_df_chunk(vetores)
+            if lote.empty:
+                break
+            entregues += 1
+            yield tipar(lote)
+        if not entregues:
+            # Como `pd.read_sql(chunksize=...)`: resultado vazio vira um lote vazio
+            yield tipar(lote)
+        return
+
+    with conexao.connect() as conn:
+        conn = conn.execution_options(stream_results=True)
+        for lote in pd.read_sql(sql, conn, chunksize=tamanho_lote):
+            yield tipar(lote)
+
+
+def escrever_tabela(
+    df: pd.DataFrame, nome_tabela: str, backend: str = None, substituir: bool = True
+):
+    """
+    Grava um DataFrame como tabela no backend.
+
+    Args:
+        df (pd.DataFrame): Dados a serem gravados.
+        nome_tabela (str): Nome da tabela.
+        backend (str, optional): Backend desejado. Padrão: backend atual.
+        substituir (bool, optional): Substitui a tabela se já existir (padrão);
+            com False, acrescenta as linhas (gravação em lotes).
+    """
+    backend = backend or backend_atual()
+    conexao = obter_conexao(backend)
+    with medir("backend.escrever_tabela", backend=backend, tabela=nome_tabela):
+        if substituir and tipo_objeto(nome_tabela, backend) == "VIEW":
+            executar_sql([f'DROP VIEW "{nome_tabela}"'], backend)
+        if backend == "duckdb":
+            conexao.register("_df_temporario", df)
+            if substituir:
+                conexao.execute(
+                    f'CREATE OR REPLACE TABLE "{nome_tabela}" AS '
+                    "SELECT * FROM _df_temporario"
+                )
+            else:
+                conexao.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{nome_tabela}" AS '
+                    "SELECT * FROM _df_temporario LIMIT 0"
+                )
+                conexao.execute(
+                    f'INSERT INTO "{nome_tabela}" SELECT * FROM _df_temporario'
+                )
+            conexao.unregister("_df_temporario")
+        else:
+            df.to_sql(
+                nome_tabela,
+                conexao,
+                if_exists="replace" if substituir else "append",
+                index=False,
+                method="multi",
+                chunksize=TAMANHO_LOTE,
+            )
+    incrementar("linhas_inseridas", len(df), backend=backend, tabela=nome_tabela)
+
+
+def tipo_objeto(nome: str, backend: str = None):
+    """
+    Informa se `nome` existe no backend como tabela ou view.
+
+    Args:
+        nome (str): Nome do objeto.
+        backend (str, optional): Backend desejado. Padrão: backend atual.
+
+    Retorna:
+        str ou None: 'TABLE', 'VIEW' ou None se não existir.
+    """
+    backend = backend or backend_atual()
+    conexao = obter_conexao(backend)
+    if getattr(getattr(conexao, "dialect", None), "name", None) == "sqlite":
+        sql = "SELECT UPPER(type) AS tipo FROM sqlite_master WHERE name = '{}'"
+    else:
+        sql = "SELECT table_type AS tipo FROM information_schema.tables WHERE table_name = '{}'"
+    # Consultado antes de DROP/CREATE: precisa refletir o banco de escrita
+    df = ler_sql(sql.format(nome.replace("'", "''")), backend, papel="escrita")
+    if df.empty:
+        return None
+    return "VIEW" if df["tipo"].iloc[0] == "VIEW" else "TABLE"
+
+
+def executar_sql(comandos, backend: str = None):
+    """
+    Executa comandos SQL sem retorno (DDL) em uma única transação.
+
+    Args:
+        comandos (list[str]): Comandos a executar, em ordem.
+        backend (str, optional): Backend desejado. Padrão: backend atual.
+    """
+    backend = backend or backend_atual()
+    conexao = obter_conexao(backend)
+    if backend == "duckdb":
+        for comando in comandos:
+            conexao.execute(comando)
+        return
+
+    from sqlalchemy import text
+
+    with conexao.begin() as conn:
+        for comando in comandos:
+            conn.execute(text(comando))
+
+
+def criar_view(nome: str, consulta: str, backend: str = None):
+    """
+    Cria (ou recria) uma view, substituindo uma tabela de mesmo nome se houver.
+
+    Args:
+        nome (str): Nome da view.
+        consulta (str): SELECT que define a view.
+        backend (str, optional): Backend desejado. Padrão: backend atual.
+    """
+    backend = backend or backend_atual()
+    comandos = []
+    existente = tipo_objeto(nome, backend)
+    if existente:
+        comandos.append(f'DROP {existente} "{nome}"')
+    comandos.append(f'CREATE VIEW "{nome}" AS {consulta}')
+    executar_sql(comandos, backend)
+
+
+# ------------------ Construção do Banco Local ------------------ #
+
+
+def _origem_dados(pasta: str, nome: str) -> str:
+    """Retorna o arquivo de origem de uma tabela, priorizando Parquet."""
+    parquet = os.path.join(pasta, f"{nome}.parquet")
+    return parquet if os.path.exists(parquet) else caminho_csv(nome, pasta)
+
+
+@medir("backend.construir_banco_local")
+def construir_banco_local(
+    pasta: str = "out", backend: str = None, como_view=False, dataframes: dict = None
+):
+    """
+    Constrói o banco embarcado a partir dos arquivos CSV/Parquet de `pasta`
+    (CSVs podem estar comprimidos com gzip ou zstd).
+
+    No DuckDB a leitura é feita pelo próprio motor (read_csv_auto/read_parquet),
+    de forma vetorizada e sem passar pelo pandas. Com `como_view=True` as
+    tabelas viram views sobre os arquivos, sem cópia dos dados.
+
+    Args:
+        pasta (str, optional): Diretório com os arquivos. Padrão: 'out'.
+        backend (str, optional): 'duckdb' ou 'sqlite'. Padrão: backend atual.
+        como_view (bool, optional): Apenas DuckDB; cria views em vez de tabelas.
+        dataframes (dict, optional): {tabela: DataFrame} carregados no lugar do
+            arquivo (ex.: combates já validados); sempre viram tabelas.
+    """
+    backend = backend or backend_atual()
+    if backend == "postgres":
+        raise ValueError(
+            "❌ construir_banco_local requer backend 'duckdb' ou 'sqlite'."
+        )
+
+    conexao = obter_conexao(backend)
+    dataframes = dataframes or {}
+    for nome in TABELAS_BASE:
+        if nome in dataframes:
+            if backend == "duckdb":
+                tipo_existente = tipo_objeto(nome, backend)
+                if tipo_existente:
+                    conexao.execute(f'DROP {tipo_existente} "{nome}"')
+                conexao.register("_origem_dataframe", dataframes[nome])
+                conexao.execute(
+                    f'CREATE TABLE "{nome}" AS SELECT * FROM _origem_dataframe'
+                )
+                conexao.unregister("_origem_dataframe")
+            else:
+                escrever_tabela(dataframes[nome], nome, backend)
+            continue
+
+        origem = _origem_dados(pasta, nome)
+        if not os.path.exists(origem):
+            print(f"⚠️ Arquivo '{origem}' não encontrado; tabela {nome} ignorada.")
+            continue
+
+        if backend == "duckdb":
+            leitor = "read_parquet" if origem.endswith(".parquet") else "read_csv_auto"
+            tipo = "VIEW" if como_view else "TABLE"
+            origem_sql = os.path.abspath(origem).replace("'", "''")
+            tipo_existente = tipo_objeto(nome, backend)
+            if tipo_existente:
+                conexao.execute(f'DROP {tipo_existente} "{nome}"')
+            conexao.execute(
+                f"CREATE {tipo} \"{nome}\" AS SELECT * FROM {leitor}('{origem_sql}')"
+            )
+        else:
+            df = (
+                pd.read_parquet(origem)
+                if origem.endswith(".parquet")
+                else pd.read_csv(origem, sep=",", encoding="utf-8")
+            )
+            escrever_tabela(df, nome, backend)
+
+    print(
+        f"✅ Banco analítico local ({backend}) construído em '{arquivo_local(backend)}'."
+    )
+
+
+# ------------------ Agregações em SQL ------------------ #
+
+
+def estatisticas_sql(backend: str = None) -> pd.DataFrame:
+    """
+    Calcula vitórias, derrotas, lutas e taxa de vitória por Pokémon em SQL.
+
+    Empates em Lutas são desfeitos pelo nome, para que todos os backends
+    devolvam as linhas na mesma ordem. A agregação é feita inteiramente no motor do banco (vetorizada no DuckDB),
+    sem materializar a tabela de combates com nomes.
+
+    Args:
+        backend (str, optional): Backend desejado. Padrão: backend atual.
+
+    Retorna:
+        pd.DataFrame: Colunas Pokemon, Lutas, Vitorias, Derrotas, Taxa_Vitoria(%).
+    """
+    sql = """
+        WITH participacoes AS (
+            SELECT first_pokemon AS id FROM combates
+            UNION ALL
+            SELECT second_pokemon AS id FROM combates
+        ),
+        lutas AS (
+            SELECT id, COUNT(*) AS lutas FROM participacoes GROUP BY id
+        ),
+        vitorias AS (
+            SELECT winner AS id, COUNT(*) AS vitorias FROM combates GROUP BY winner
+        )
+        SELECT
+            a."Nome" AS "Pokemon",
+            CAST(l.lutas AS DOUBLE PRECISION) AS "Lutas",
+            CAST(COALESCE(v.vitorias, 0) AS DOUBLE PRECISION) AS "Vitorias",
+            CAST(l.lutas - COALESCE(v.vitorias, 0) AS DOUBLE PRECISION) AS "Derrotas",
+            CAST(COALESCE(v.vitorias, 0) * 100.0 / l.lutas AS DOUBLE PRECISION)
+                AS "Taxa_Vitoria(%)"
+        FROM lutas l
+        LEFT JOIN vitorias v ON v.id = l.id
+        JOIN atributos_pokemon a ON a."ID" = l.id
+        ORDER BY "Lutas" DESC, "Pokemon"
+    """
+    df = ler_sql(sql, backend)
+    # Arredondada aqui: ROUND sobre NUMERIC difere entre os motores (o DuckDB
+    # fixa a escala antes e arredonda duas vezes)
+    df["Taxa_Vitoria(%)"] = df["Taxa_Vitoria(%)"].astype(float).round(2)
+    # Sem linhas o SQLite devolve as contagens como object; mesmos tipos do
+    # caminho em pandas (`analise_paralela`) em todos os backends
+    return df.astype({"Lutas": "float64", "Vitorias": "float64", "Derrotas": "float64"})
+
+
+# ------------------ Publicação ------------------ #
+
+
+@medir("backend.publicar_tabelas")
+def publicar_tabelas(nomes_tabelas, backend: str = None):
+    """
+    Copia tabelas finais do backend local para o PostgreSQL remoto.
+
+    Args:
+        nomes_tabelas (list[str]): Tabelas a publicar.
+        backend (str, optional): Backend de origem. Padrão: backend atual.
+    """
+    backend = backend or backend_atual()
+    if backend == "postgres":
+        return
+    try:
+        obter_conexao("postgres")
+    except EnvironmentError as e:
+        print(f"⚠️ Publicação ignorada: {e}")
+        return
+    for nome in nomes_tabelas:
+        escrever_tabela(ler_sql(f'SELECT * FROM "{nome}"', backend), nome, "postgres")
+        print(f"📤 Tabela {nome} publicada no PostgreSQL.")
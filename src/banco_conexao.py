@@ -3,22 +3,223 @@ Banco de Conexão - SQLAlchemy
 
 Este módulo configura e fornece um engine SQLAlchemy para conectar a um banco de dados PostgreSQL.
 As credenciais e parâmetros de conexão são lidos de variáveis de ambiente, carregadas a partir de um arquivo .env.
+
+Há dois papéis de conexão, cada um com engine, pool e timeout próprios:
+
+- 'escrita': cargas pesadas (`tratamento_dados`) e tabelas geradas pela análise;
+- 'leitura': consultas do dashboard e de `backend_analitico.ler_sql`, apontando
+  para uma réplica quando configurada. As conexões de leitura são somente
+  leitura (`default_transaction_read_only` no PostgreSQL, `query_only` no SQLite).
+
+Sem URL própria, o papel de leitura usa a mesma URL da escrita (mas em um pool
+separado). Dentro de `leitura_no_primario()` as leituras vão para o engine de
+escrita, para etapas que leem o que acabaram de gravar.
+
+Variáveis de ambiente (além das de `obter_engine`):
+    DATABASE_URL_ESCRITA / DATABASE_URL_LEITURA: URL por papel (padrão: DATABASE_URL)
+    DB_POOL_ESCRITA / DB_POOL_LEITURA: Conexões mantidas no pool (padrão: 2 / 5)
+    DB_POOL_EXCEDENTE_ESCRITA / DB_POOL_EXCEDENTE_LEITURA: Conexões extras
+        temporárias (padrão: 2 / 10)
+    DB_TIMEOUT_ESCRITA_MS / DB_TIMEOUT_LEITURA_MS: Tempo máximo por comando SQL,
+        em ms; 0 desativa (padrão: 0 / 30000)
 """
 
 import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from urllib.parse import quote_plus
-from sqlalchemy import create_engine
 from dotenv import load_dotenv
 
 # Carrega variáveis de ambiente do arquivo .env
 load_dotenv()
 
+# Quantidade de linhas por INSERT multi-linha (evita comandos gigantes no banco)
+TAMANHO_LOTE = int(os.getenv("DB_TAMANHO_LOTE", "1000"))
+
+PAPEIS = ("escrita", "leitura")
+PADROES_PAPEL = {
+    "escrita": {"pool": 2, "excedente": 2, "timeout_ms": 0},
+    "leitura": {"pool": 5, "excedente": 10, "timeout_ms": 30000},
+}
+
+# Engines por (papel, URL): o pool de conexões é reaproveitado entre chamadas (e
+# entre ciclos do modo serviço) em vez de recriado a cada carga
+_engines = {}
+
+# Verdadeiro dentro de `leitura_no_primario()` (por thread/contexto)
+_leitura_no_primario = ContextVar("leitura_no_primario", default=False)
+
+
+def ativar_wal_sqlite(engine):
+    """
+    Ativa o journal WAL em engines SQLite, permitindo gravar enquanto um
+    cursor de leitura em lotes está aberto (como no PostgreSQL).
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Engine a configurar.
+
+    Retorna:
+        sqlalchemy.engine.Engine: O mesmo engine.
+    """
+    if engine.dialect.name == "sqlite":
+        from sqlalchemy import event
+
+        @event.listens_for(engine, "connect")
+        def _wal(conexao_dbapi, _):
+            conexao_dbapi.execute("PRAGMA journal_mode=WAL")
+
+    return engine
+
+
+def configuracao_papel(papel: str) -> dict:
+    """
+    Lê pool e timeout de um papel de conexão.
+
+    Args:
+        papel (str): 'escrita' ou 'leitura'.
+
+    Retorna:
+        dict: Chaves 'pool', 'excedente' e 'timeout_ms'.
+
+    Levanta:
+        ValueError: Caso o papel seja desconhecido.
+    """
+    if papel not in PAPEIS:
+        raise ValueError(
+            f"❌ Papel de conexão inválido: '{papel}'. Use um de {PAPEIS}."
+        )
+    sufixo = papel.upper()
+    return {
+        "pool": int(os.getenv(f"DB_POOL_{sufixo}", PADROES_PAPEL[papel]["pool"])),
+        "excedente": int(
+            os.getenv(f"DB_POOL_EXCEDENTE_{sufixo}", PADROES_PAPEL[papel]["excedente"])
+        ),
+        "timeout_ms": int(
+            os.getenv(f"DB_TIMEOUT_{sufixo}_MS", PADROES_PAPEL[papel]["timeout_ms"])
+        ),
+    }
+
+
+def limitar_tempo_sqlite(engine, timeout_ms: int):
+    """
+    Interrompe comandos SQLite que passarem de `timeout_ms` (o SQLite não tem
+    statement_timeout): um progress handler confere o prazo do comando em curso.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Engine SQLite.
+        timeout_ms (int): Tempo máximo por comando, em milissegundos.
+
+    Retorna:
+        sqlalchemy.engine.Engine: O mesmo engine.
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "connect")
+    def _instalar(conexao_dbapi, registro):
+        info = registro.info
+        conexao_dbapi.set_progress_handler(
+            lambda: time.monotonic() > info.get("prazo_comando", float("inf")), 10000
+        )
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _iniciar(conn, cursor, comando, parametros, contexto, em_lote):
+        conn.info["prazo_comando"] = time.monotonic() + timeout_ms / 1000
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _concluir(conn, cursor, comando, parametros, contexto, em_lote):
+        conn.info.pop("prazo_comando", None)
+
+    return engine
+
+
+def _engine(url: str, papel: str = "escrita"):
+    """Retorna o engine em cache para (`papel`, `url`), criando-o no primeiro uso."""
+    # importação tardia: só quem usa o banco paga
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.engine import make_url
+
+    chave = (papel, url)
+    if chave in _engines:
+        return _engines[chave]
+
+    config = configuracao_papel(papel)
+    destino = make_url(url)
+    dialeto = destino.get_backend_name()
+    argumentos, opcoes = {}, []
+    # SQLite em memória usa um pool de uma conexão por thread, sem dimensionamento
+    if dialeto != "sqlite" or destino.database not in (None, "", ":memory:"):
+        argumentos.update(pool_size=config["pool"], max_overflow=config["excedente"])
+    if dialeto == "postgresql":
+        opcoes.append(f"-c statement_timeout={config['timeout_ms']}")
+        if papel == "leitura":
+            opcoes.append("-c default_transaction_read_only=on")
+        argumentos["connect_args"] = {"options": " ".join(opcoes)}
 
-def obter_engine():
+    engine = ativar_wal_sqlite(create_engine(url, **argumentos))
+    if dialeto == "sqlite":
+        if config["timeout_ms"]:
+            limitar_tempo_sqlite(engine, config["timeout_ms"])
+        if papel == "leitura":
+
+            @event.listens_for(engine, "connect")
+            def _somente_leitura(conexao_dbapi, _):
+                conexao_dbapi.execute("PRAGMA query_only=ON")
+
+    _engines[chave] = engine
+    return engine
+
+
+def url_papel(papel: str):
+    """
+    URL configurada especificamente para um papel, se houver.
+
+    Args:
+        papel (str): 'escrita' ou 'leitura'.
+
+    Retorna:
+        str ou None: DATABASE_URL_ESCRITA/DATABASE_URL_LEITURA, ou None.
+    """
+    return os.getenv(f"DATABASE_URL_{papel.upper()}")
+
+
+@contextmanager
+def leitura_no_primario():
+    """
+    Direciona as leituras do bloco ao engine de escrita (leituras que
+    precisam ver o que acabou de ser gravado, sem atraso de réplica).
+    """
+    marca = _leitura_no_primario.set(True)
+    try:
+        yield
+    finally:
+        _leitura_no_primario.reset(marca)
+
+
+def obter_engine_leitura():
+    """
+    Retorna o engine de leitura (ou o de escrita dentro de `leitura_no_primario`).
+
+    Retorna:
+        sqlalchemy.engine.base.Engine: Engine para consultas.
+    """
+    return obter_engine("leitura")
+
+
+def obter_engine(papel: str = "escrita"):
     """
     Cria e retorna um engine SQLAlchemy configurado para o banco de dados PostgreSQL.
 
+    Args:
+        papel (str, optional): 'escrita' (padrão) ou 'leitura'; cada papel tem
+            engine, pool e timeout próprios (ver a docstring do módulo).
+
     Variáveis de ambiente utilizadas:
+        DATABASE_URL_ESCRITA / DATABASE_URL_LEITURA: URL do papel (opcional),
+            com prioridade sobre as demais; a leitura recorre à URL da escrita.
+        DATABASE_URL: URL completa do banco (opcional). Quando definida, tem
+            prioridade sobre as variáveis abaixo; permite usar um PostgreSQL
+            local ou SQLite (ex.: 'sqlite:///out/kaizen.db') em testes e benchmarks.
         DB_USER: Usuário do banco de dados
         DB_PASSWORD: Senha do banco de dados
         DB_HOST: Host do banco de dados
@@ -26,6 +227,7 @@ def obter_engine():
         DB_NAME: Nome do banco de dados
 
     O parâmetro DB_PASSWORD é codificado para lidar com caracteres especiais.
+    O engine (e seu pool de conexões) é criado uma vez por papel e URL e reutilizado.
 
     Retorna:
         sqlalchemy.engine.base.Engine: Engine SQLAlchemy para conexão com o banco
@@ -33,9 +235,17 @@ def obter_engine():
     Levanta:
         EnvironmentError: Caso alguma variável de ambiente obrigatória esteja ausente.
     """
+    if papel == "leitura" and _leitura_no_primario.get():
+        papel = "escrita"
+    configuracao_papel(papel)  # valida o papel
+
+    DATABASE_URL = url_papel(papel) or url_papel("escrita") or os.getenv("DATABASE_URL")
+    if DATABASE_URL:
+        return _engine(DATABASE_URL, papel)
+
     # Carrega variáveis de ambiente
     DB_USER = os.getenv("DB_USER")
-    DB_PASSWORD = quote_plus(os.getenv("DB_PASSWORD"))  # Codifica caracteres especiais
+    DB_PASSWORD = quote_plus(os.getenv("DB_PASSWORD", ""))  # Codifica caracteres especiais
     DB_HOST = os.getenv("DB_HOST")
     DB_PORT = os.getenv("DB_PORT")
     DB_NAME = os.getenv("DB_NAME")
@@ -49,6 +259,5 @@ def obter_engine():
     # Constrói a URL de conexão
     DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?sslmode=require"
 
-    # Cria e retorna o engine SQLAlchemy
-    engine = create_engine(DATABASE_URL)
-    return engine
+    # Retorna o engine SQLAlchemy (criado uma vez por URL)
+    return _engine(DATABASE_URL, papel)
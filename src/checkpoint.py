@@ -0,0 +1,189 @@
+"""
+Checkpoints da Coleta - Diário de Progresso à Prova de Falhas
+
+Cada coletor grava um diário (JSON Lines, um registro por página ou por ID
+concluído) em 'out/checkpoints/<dataset>.jsonl'. Se a coleta for
+interrompida, a próxima execução retoma do ponto em que parou, buscando
+apenas o que falta.
+
+- O diário é append-only com flush + fsync por registro; uma linha truncada
+  por queda do processo é simplesmente ignorada na leitura.
+- O diário só é removido quando a coleta termina completa. Enquanto ele
+  existir, `transformar_csv` não sobrescreve um CSV anterior com dados parciais.
+- Arquivos finais são gravados com `gravar_atomico` (arquivo temporário +
+  os.replace), nunca deixando um CSV pela metade.
+
+Variáveis de ambiente:
+    KAIZEN_CHECKPOINT_DIR: Diretório dos diários (padrão: 'out/checkpoints')
+    KAIZEN_CHECKPOINT_HORAS: Idade máxima de um diário para retomada (padrão: 24)
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from instrumentacao import incrementar, registrar_evento
+
+DIRETORIO_CHECKPOINT = os.getenv("KAIZEN_CHECKPOINT_DIR", "out/checkpoints")
+VALIDADE_HORAS = float(os.getenv("KAIZEN_CHECKPOINT_HORAS", "24"))
+
+
+# ------------------ Escrita Atômica ------------------ #
+
+
+@contextmanager
+def gravar_atomico(caminho: str, modo: str = "w", **kwargs):
+    """
+    Abre um arquivo temporário que substitui `caminho` apenas ao final.
+
+    Em caso de exceção o temporário é descartado e o arquivo original
+    permanece intacto.
+
+    Args:
+        caminho (str): Arquivo de destino.
+        modo (str, optional): 'w' (texto) ou 'wb' (binário).
+        **kwargs: Argumentos repassados a `open` (ex.: newline, encoding).
+
+    Yields:
+        file: Arquivo temporário aberto para escrita.
+    """
+    diretorio = os.path.dirname(caminho) or "."
+    os.makedirs(diretorio, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(
+        dir=diretorio, prefix=f".{os.path.basename(caminho)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descritor, modo, **kwargs) as arquivo:
+            yield arquivo
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+# ------------------ Diário de Progresso ------------------ #
+
+
+class Checkpoint:
+    """
+    Diário de progresso de um dataset.
+
+    Args:
+        nome (str): Nome do dataset (ex.: 'combates').
+        parametros (dict, optional): Parâmetros que tornam o diário válido (ex.:
+            {'por_pagina': 100}). Um diário gravado com parâmetros diferentes é
+            descartado.
+        diretorio (str, optional): Diretório dos diários.
+    """
+
+    def __init__(self, nome: str, parametros: dict = None, diretorio: str = None):
+        self.nome = nome
+        self.caminho = os.path.join(diretorio or DIRETORIO_CHECKPOINT, f"{nome}.jsonl")
+        self._lock = threading.Lock()
+        self._concluidos = {}
+        self._parametros = parametros or {}
+        self._carregar()
+
+    def _carregar(self):
+        """Lê o diário existente, se válido; senão começa do zero."""
+        if not os.path.exists(self.caminho):
+            return
+        idade_horas = (time.time() - os.path.getmtime(self.caminho)) / 3600
+        if idade_horas > VALIDADE_HORAS:
+            print(f"⚠️ Checkpoint de '{self.nome}' expirado; coleta reiniciada.")
+            self.descartar()
+            return
+
+        with open(self.caminho, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError:
+                    continue  # linha truncada por interrupção
+                if "parametros" in registro:
+                    if registro["parametros"] != self._parametros:
+                        self._concluidos = {}
+                        print(
+                            f"⚠️ Checkpoint de '{self.nome}' com outros parâmetros; ignorado."
+                        )
+                        self.descartar()
+                        return
+                    continue
+                self._concluidos[registro["chave"]] = registro["itens"]
+
+        if self._concluidos:
+            print(
+                f"♻️ Retomando '{self.nome}': {len(self._concluidos)} páginas/IDs já concluídos."
+            )
+            incrementar(
+                "checkpoint_retomados", len(self._concluidos), dataset=self.nome
+            )
+            registrar_evento(
+                "checkpoint_retomado",
+                dataset=self.nome,
+                concluidos=len(self._concluidos),
+            )
+
+    def _anexar(self, registro: dict):
+        novo = not os.path.exists(self.caminho)
+        os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+        with open(self.caminho, "a", encoding="utf-8") as arquivo:
+            if novo:
+                arquivo.write(json.dumps({"parametros": self._parametros}) + "\n")
+            arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+
+    def concluido(self, chave) -> bool:
+        """Indica se a página/ID `chave` já foi coletada."""
+        return chave in self._concluidos
+
+    def itens(self, chave) -> list:
+        """Itens gravados para a página/ID `chave`."""
+        return self._concluidos[chave]
+
+    def todos_itens(self) -> list:
+        """Itens de todas as chaves concluídas, na ordem em que foram gravadas."""
+        return [item for itens in self._concluidos.values() for item in itens]
+
+    def registrar(self, chave, itens: list):
+        """
+        Grava no diário que `chave` foi concluída com `itens` (seguro entre threads).
+
+        Args:
+            chave (int): Número da página ou ID.
+            itens (list): Itens coletados para a chave.
+        """
+        with self._lock:
+            self._concluidos[chave] = itens
+            self._anexar({"chave": chave, "itens": itens})
+
+    def finalizar(self):
+        """Remove o diário após uma coleta completa."""
+        self.descartar()
+
+    def descartar(self):
+        """Apaga o diário do disco."""
+        if os.path.exists(self.caminho):
+            os.remove(self.caminho)
+
+
+def coleta_pendente(nome: str, diretorio: str = None) -> bool:
+    """
+    Indica se há uma coleta interrompida (diário não finalizado) para `nome`.
+
+    Args:
+        nome (str): Nome do dataset.
+        diretorio (str, optional): Diretório dos diários.
+
+    Returns:
+        bool: True se existir diário pendente.
+    """
+    return os.path.exists(
+        os.path.join(diretorio or DIRETORIO_CHECKPOINT, f"{nome}.jsonl")
+    )
@@ -0,0 +1,196 @@
+"""
+Consultas Paginadas - Filtros, Ordenação e Paginação no Banco
+
+Consultas parametrizadas usadas pelas telas de exploração do dashboard.
+Filtros, ordenação e paginação (LIMIT/OFFSET) são executados pelo banco,
+apoiados nos índices de `criar_indices`; o dashboard recebe apenas as
+linhas da página pedida e o total de linhas do filtro, de modo que o tempo
+de renderização não depende do tamanho das tabelas.
+
+Funciona nos três backends de `backend_analitico` (PostgreSQL, DuckDB e
+SQLite), sempre com parâmetros nomeados (nunca valores interpolados no SQL).
+
+Variáveis de ambiente:
+    DASHBOARD_POR_PAGINA: Linhas por página (padrão: 25)
+"""
+
+import os
+import pandas as pd
+from backend_analitico import ler_sql, executar_sql, tipo_objeto
+from instrumentacao import medir
+
+POR_PAGINA = int(os.getenv("DASHBOARD_POR_PAGINA", "25"))
+
+# Colunas pelas quais a tabela de estatísticas pode ser ordenada (lista fechada,
+# pois nomes de coluna não podem ser passados como parâmetro)
+ORDENACOES_ESTATISTICAS = (
+    "Lutas",
+    "Vitorias",
+    "Derrotas",
+    "Taxa_Vitoria(%)",
+    "Pokemon",
+)
+
+INDICES = {
+    "combates": {
+        "idx_combates_first": "first_pokemon, second_pokemon",
+        "idx_combates_second": "second_pokemon, first_pokemon",
+    },
+    "estatisticas_pokemon": {
+        "idx_estatisticas_pokemon": '"Pokemon"',
+        "idx_estatisticas_lutas": '"Lutas"',
+    },
+}
+
+
+# ------------------ Índices ------------------ #
+
+
+def criar_indices(backend: str = None):
+    """
+    Cria (se ainda não existirem) os índices usados pelas consultas paginadas.
+
+    Objetos que são views (ex.: combates lidos direto do CSV) são ignorados.
+
+    Args:
+        backend (str, optional): Backend desejado. Padrão: backend atual.
+    """
+    for tabela, indices in INDICES.items():
+        if tipo_objeto(tabela, backend) != "TABLE":
+            continue
+        executar_sql(
+            [
+                f"CREATE INDEX IF NOT EXISTS {nome} ON {tabela} ({colunas})"
+                for nome, colunas in indices.items()
+            ],
+            backend,
+        )
+    print("✅ Índices das consultas paginadas verificados.")
+
+
+# ------------------ Consultas ------------------ #
+
+
+def _pagina(pagina: int, por_pagina: int) -> dict:
+    por_pagina = por_pagina or POR_PAGINA
+    return {"limite": por_pagina, "deslocamento": max(pagina - 1, 0) * por_pagina}
+
+
+@medir("consultas.estatisticas")
+def consultar_estatisticas(
+    busca: str = "",
+    ordenar_por: str = "Lutas",
+    decrescente: bool = True,
+    pagina: int = 1,
+    por_pagina: int = None,
+    lutas_min: int = 0,
+    backend: str = None,
+) -> tuple:
+    """
+    Retorna uma página da tabela `estatisticas_pokemon`.
+
+    Args:
+        busca (str, optional): Trecho do nome do Pokémon (sem distinção de caixa).
+        ordenar_por (str, optional): Uma das ORDENACOES_ESTATISTICAS.
+        decrescente (bool, optional): Ordem decrescente.
+        pagina (int, optional): Página desejada, a partir de 1.
+        por_pagina (int, optional): Linhas por página. Padrão: POR_PAGINA.
+        lutas_min (int, optional): Número mínimo de lutas.
+        backend (str, optional): Backend desejado. Padrão: backend atual.
+
+    Returns:
+        tuple: (DataFrame da página, total de linhas que atendem ao filtro).
+    """
+    if ordenar_por not in ORDENACOES_ESTATISTICAS:
+        raise ValueError(f"Ordenação inválida: {ordenar_por!r}")
+    direcao = "DESC" if decrescente else "ASC"
+    filtro = 'WHERE LOWER("Pokemon") LIKE :busca AND "Lutas" >= :lutas_min'
+    parametros = {"busca": f"%{busca.strip().lower()}%", "lutas_min": lutas_min}
+
+    total = ler_sql(
+        f"SELECT COUNT(*) AS total FROM estatisticas_pokemon {filtro}",
+        backend,
+        parametros,
+    )["total"].iloc[0]
+    df = ler_sql(
+        f"""
+        SELECT * FROM estatisticas_pokemon {filtro}
+        ORDER BY "{ordenar_por}" {direcao}, "Pokemon"
+        LIMIT :limite OFFSET :deslocamento
+        """,
+        backend,
+        {**parametros, **_pagina(pagina, por_pagina)},
+    )
+    return df, int(total)
+
+
+@medir("consultas.combates")
+def consultar_combates(
+    pokemon_id: int,
+    oponente_id: int = None,
+    pagina: int = 1,
+    por_pagina: int = None,
+    backend: str = None,
+) -> tuple:
+    """
+    Retorna uma página do histórico de combates de um Pokémon.
+
+    Cada lado do combate é buscado por um índice próprio (first_pokemon ou
+    second_pokemon) e os nomes são juntados apenas às linhas da página.
+
+    Args:
+        pokemon_id (int): ID do Pokémon.
+        oponente_id (int, optional): Restringe aos combates contra este ID.
+        pagina (int, optional): Página desejada, a partir de 1.
+        por_pagina (int, optional): Linhas por página. Padrão: POR_PAGINA.
+        backend (str, optional): Backend desejado. Padrão: backend atual.
+
+    Returns:
+        tuple: (DataFrame com Oponente, ID_Oponente e Resultado, total de combates).
+    """
+    parametros = {"id": int(pokemon_id)}
+    filtro_a = filtro_b = ""
+    if oponente_id is not None:
+        parametros["oponente"] = int(oponente_id)
+        filtro_a = "AND second_pokemon = :oponente"
+        filtro_b = "AND first_pokemon = :oponente"
+    combates = f"""
+        SELECT first_pokemon, second_pokemon, winner
+        FROM combates WHERE first_pokemon = :id {filtro_a}
+        UNION ALL
+        SELECT first_pokemon, second_pokemon, winner
+        FROM combates WHERE second_pokemon = :id AND first_pokemon <> :id {filtro_b}
+    """
+
+    total = ler_sql(
+        f"SELECT COUNT(*) AS total FROM ({combates}) c", backend, parametros
+    )["total"].iloc[0]
+    df = ler_sql(
+        f"""
+        SELECT c.first_pokemon, c.second_pokemon, c.winner, a."Nome" AS nome_oponente
+        FROM (
+            SELECT * FROM ({combates}) u
+            ORDER BY first_pokemon, second_pokemon, winner
+            LIMIT :limite OFFSET :deslocamento
+        ) c
+        LEFT JOIN atributos_pokemon a ON a."ID" = CASE
+            WHEN c.first_pokemon = :id THEN c.second_pokemon ELSE c.first_pokemon END
+        ORDER BY c.first_pokemon, c.second_pokemon, c.winner
+        """,
+        backend,
+        {**parametros, **_pagina(pagina, por_pagina)},
+    )
+
+    oponente = df["second_pokemon"].where(
+        df["first_pokemon"] == pokemon_id, df["first_pokemon"]
+    )
+    pagina_df = pd.DataFrame(
+        {
+            "Oponente": df["nome_oponente"],
+            "ID_Oponente": oponente,
+            "Resultado": (df["winner"] == pokemon_id).map(
+                {True: "Vitória", False: "Derrota"}
+            ),
+        }
+    )
+    return pagina_df, int(total)
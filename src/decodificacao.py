@@ -0,0 +1,170 @@
+"""
+Decodificação das Respostas da API - Compressão, JSON Rápido e Esquemas
+
+Camada entre o HTTP e os coletores de `obtencao_dados`:
+
+- Negociação de compressão: o cabeçalho Accept-Encoding anuncia gzip e
+  deflate e, se um decodificador brotli estiver instalado (brotli ou
+  brotlicffi, usados pelo urllib3), também br. A descompressão é feita
+  pelo próprio urllib3.
+- Decodificação JSON com o decodificador mais rápido disponível: orjson,
+  msgspec ou, na falta de ambos, o json da biblioteca padrão. O corpo é
+  decodificado direto dos bytes (`response.content`), sem passar por str.
+- Esquemas declarados por dataset (ESQUEMAS_API): cada item da API vira
+  uma tupla com os campos na ordem das colunas de `escrita_csv.ESQUEMAS`,
+  montada por `operator.itemgetter` (em C) em vez de um dicionário
+  reconstruído campo a campo com `.get()`.
+"""
+
+import json
+import operator
+from instrumentacao import incrementar
+
+try:
+    import orjson
+
+    _decodificar = orjson.loads
+    DECODIFICADOR = "orjson"
+except ImportError:
+    try:
+        import msgspec
+
+        _decodificar = msgspec.json.Decoder().decode
+        DECODIFICADOR = "msgspec"
+    except ImportError:
+        _decodificar = json.loads
+        DECODIFICADOR = "json"
+
+# Campos da API na ordem das colunas do CSV de cada dataset; 'limpar' lista
+# as posições de texto que recebem strip()
+ESQUEMAS_API = {
+    "pokemons": {"campos": ("id", "name"), "limpar": (1,)},
+    "atributos_pokemon": {
+        "campos": (
+            "id",
+            "name",
+            "hp",
+            "attack",
+            "defense",
+            "sp_attack",
+            "sp_defense",
+            "speed",
+            "generation",
+            "legendary",
+            "types",
+        ),
+        "limpar": (1,),
+    },
+    "combates": {"campos": ("first_pokemon", "second_pokemon", "winner")},
+}
+
+
+# ------------------ Compressão ------------------ #
+
+
+def codificacoes_aceitas() -> str:
+    """
+    Valor do cabeçalho Accept-Encoding suportado por este ambiente.
+
+    Returns:
+        str: 'br, gzip, deflate' com brotli instalado; senão 'gzip, deflate'.
+    """
+    codificacoes = ["gzip", "deflate"]
+    for modulo in ("brotli", "brotlicffi"):
+        try:
+            __import__(modulo)
+        except ImportError:
+            continue
+        codificacoes.insert(0, "br")
+        break
+    return ", ".join(codificacoes)
+
+
+ACCEPT_ENCODING = codificacoes_aceitas()
+
+
+def registrar_transferencia(response, endpoint: str):
+    """
+    Contabiliza os bytes trafegados (comprimidos) de uma resposta.
+
+    Args:
+        response (requests.Response): Resposta já lida.
+        endpoint (str): Nome do endpoint para rotular as métricas.
+    """
+    codificacao = response.headers.get("Content-Encoding")
+    if not codificacao:
+        return
+    comprimido = response.headers.get("Content-Length")
+    incrementar(
+        "api_bytes_comprimidos",
+        int(comprimido) if comprimido else len(response.content),
+        endpoint=endpoint,
+        codificacao=codificacao,
+    )
+
+
+# ------------------ JSON ------------------ #
+
+
+def decodificar_json(conteudo: bytes):
+    """
+    Decodifica um corpo JSON com o decodificador mais rápido disponível.
+
+    Args:
+        conteudo (bytes): Corpo da resposta.
+
+    Returns:
+        object: Valor decodificado.
+    """
+    return _decodificar(conteudo)
+
+
+def resposta_json(response):
+    """
+    Equivalente a `response.json()`, decodificando direto dos bytes.
+
+    Args:
+        response (requests.Response): Resposta HTTP.
+
+    Returns:
+        object: Corpo decodificado.
+    """
+    return _decodificar(response.content)
+
+
+# ------------------ Registros por Esquema ------------------ #
+
+
+def registros(itens: list, dataset: str) -> list:
+    """
+    Converte os itens da API em tuplas na ordem das colunas do dataset.
+
+    Itens sem algum campo caem no caminho com `.get()` (campo vira None).
+
+    Args:
+        itens (list[dict]): Itens decodificados da API.
+        dataset (str): Chave de ESQUEMAS_API.
+
+    Returns:
+        list[tuple]: Um registro por item.
+    """
+    esquema = ESQUEMAS_API[dataset]
+    campos = esquema["campos"]
+    extrair = operator.itemgetter(*campos)
+    try:
+        linhas = list(map(extrair, itens))
+    except (KeyError, TypeError):
+        linhas = [tuple(map(item.get, campos)) for item in itens]
+    if len(campos) == 1:
+        linhas = [(valor,) for valor in linhas]
+
+    for posicao in esquema.get("limpar", ()):
+        linhas = [
+            (
+                (*linha[:posicao], linha[posicao].strip(), *linha[posicao + 1 :])
+                if isinstance(linha[posicao], str)
+                else linha
+            )
+            for linha in linhas
+        ]
+    return linhas
@@ -0,0 +1,253 @@
+"""
+Escrita de CSV - Esquemas por Dataset, Escrita em Lote e Compressão
+
+Grava os datasets coletados da API ('pokemons', 'atributos_pokemon' e
+'combates') a partir de esquemas declarados em ESQUEMAS, em vez de um ramo
+de código por dataset:
+
+- Motor 'csv': uma única chamada `writerows` sobre as linhas do esquema.
+- Motor 'arrow': monta uma tabela colunar e a codifica com `pyarrow.csv`
+  (cai para o motor 'csv' se o pyarrow não estiver instalado ou os tipos de
+  uma coluna forem mistos).
+- Compressão opcional gzip ('.csv.gz') ou zstd ('.csv.zst', requer o pacote
+  zstandard).
+- A escrita é feita em arquivo temporário e renomeada atomicamente ao final
+  (`checkpoint.gravar_atomico`): uma falha no meio nunca deixa CSV corrompido.
+
+Leitores devem localizar o arquivo com `caminho_csv` (que encontra a variante
+comprimida) e, quando não usam pandas/DuckDB, abri-lo com `abrir_csv`.
+
+Variáveis de ambiente:
+    KAIZEN_CSV_MOTOR: 'csv' ou 'arrow' (padrão: 'arrow' se pyarrow instalado)
+    KAIZEN_CSV_COMPRESSAO: 'nenhuma' (padrão), 'gzip' ou 'zstd'
+"""
+
+import csv
+import gzip
+import io
+import operator
+import os
+from contextlib import contextmanager
+from checkpoint import gravar_atomico
+from instrumentacao import medir
+
+ESQUEMAS = {
+    # "registro": formato aceito por `escrever_csv`, "tupla" (na ordem das
+    # colunas, como entrega `decodificacao.registros`) ou "dict" (por chave)
+    "pokemons": {"colunas": ("ID", "Nome"), "registro": "tupla"},
+    "atributos_pokemon": {
+        "colunas": (
+            "ID",
+            "Nome",
+            "Hp",
+            "Attack",
+            "Defense",
+            "Sp_attack",
+            "Sp_defense",
+            "Speed",
+            "Generation",
+            "Legendary",
+            "Types",
+        ),
+        "registro": "tupla",
+    },
+    "combates": {
+        "colunas": ("first_pokemon", "second_pokemon", "winner"),
+        "registro": "tupla",
+    },
+}
+EXTENSOES = {"nenhuma": ".csv", "gzip": ".csv.gz", "zstd": ".csv.zst"}
+MOTORES = ("csv", "arrow")
+NIVEL_GZIP = 6
+NIVEL_ZSTD = 3
+
+
+# ------------------ Configuração ------------------ #
+
+
+def motor_padrao() -> str:
+    """Motor definido em KAIZEN_CSV_MOTOR (padrão: 'arrow' se disponível)."""
+    motor = os.getenv("KAIZEN_CSV_MOTOR")
+    if motor:
+        if motor not in MOTORES:
+            raise ValueError(f"KAIZEN_CSV_MOTOR inválido: {motor!r} (use {MOTORES})")
+        return motor
+    try:
+        import pyarrow.csv  # noqa: F401
+    except ImportError:
+        return "csv"
+    return "arrow"
+
+
+def compressao_padrao() -> str:
+    """Compressão definida em KAIZEN_CSV_COMPRESSAO (padrão: 'nenhuma')."""
+    compressao = os.getenv("KAIZEN_CSV_COMPRESSAO", "nenhuma")
+    if compressao not in EXTENSOES:
+        raise ValueError(
+            f"KAIZEN_CSV_COMPRESSAO inválida: {compressao!r} (use {tuple(EXTENSOES)})"
+        )
+    return compressao
+
+
+def caminho_csv(dataset: str, pasta: str = "out") -> str:
+    """
+    Localiza o CSV de um dataset, em qualquer uma das compressões suportadas.
+
+    Args:
+        dataset (str): Nome do dataset (ex.: 'combates').
+        pasta (str, optional): Diretório dos arquivos.
+
+    Returns:
+        str: Caminho existente, ou o caminho '.csv' sem compressão se nenhum existir.
+    """
+    for extensao in EXTENSOES.values():
+        caminho = os.path.join(pasta, dataset + extensao)
+        if os.path.exists(caminho):
+            return caminho
+    return os.path.join(pasta, dataset + EXTENSOES["nenhuma"])
+
+
+def abrir_csv(caminho: str):
+    """
+    Abre um CSV (comprimido ou não) para leitura em texto.
+
+    Args:
+        caminho (str): Caminho retornado por `caminho_csv`.
+
+    Returns:
+        file: Arquivo texto UTF-8 pronto para `csv.reader`/`csv.DictReader`.
+    """
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, "rt", newline="", encoding="utf-8")
+    if caminho.endswith(".zst"):
+        import zstandard
+
+        return io.TextIOWrapper(
+            zstandard.ZstdDecompressor().stream_reader(open(caminho, "rb")),
+            encoding="utf-8",
+            newline="",
+        )
+    return open(caminho, newline="", encoding="utf-8")
+
+
+# ------------------ Motores ------------------ #
+
+
+@contextmanager
+def _comprimir(arquivo, compressao: str):
+    """Envolve o arquivo binário de destino no compressor pedido."""
+    if compressao == "gzip":
+        fluxo = gzip.GzipFile(
+            fileobj=arquivo, mode="wb", compresslevel=NIVEL_GZIP, mtime=0
+        )
+    elif compressao == "zstd":
+        import zstandard
+
+        fluxo = zstandard.ZstdCompressor(level=NIVEL_ZSTD).stream_writer(
+            arquivo, closefd=False
+        )
+    else:
+        yield arquivo
+        return
+    try:
+        yield fluxo
+    finally:
+        fluxo.close()  # grava o rodapé; não fecha `arquivo`
+
+
+def _linhas(dados, esquema: dict):
+    """Itera os registros como tuplas na ordem das colunas do esquema."""
+    if esquema["registro"] == "tupla":
+        return dados
+    colunas = esquema["colunas"]
+    return (tuple(map(registro.get, colunas)) for registro in dados)
+
+
+def _verificar_registros(dados, dataset: str, esquema: dict):
+    """Rejeita registros em formato diferente do declarado no esquema."""
+    esperado = tuple if esquema["registro"] == "tupla" else dict
+    if len(dados) and not isinstance(dados[0], esperado):
+        raise TypeError(
+            f"Registros de '{dataset}' devem ser {esperado.__name__} "
+            f"(esquema '{esquema['registro']}'), recebido {type(dados[0]).__name__}."
+        )
+
+
+def _escrever_csv(destino, dados, esquema: dict):
+    texto = io.TextIOWrapper(destino, encoding="utf-8", newline="")
+    escritor = csv.writer(texto)
+    escritor.writerow(esquema["colunas"])
+    escritor.writerows(_linhas(dados, esquema))
+    texto.flush()
+    texto.detach()  # mantém `destino` aberto para o compressor/rename
+
+
+def _tabela_arrow(dados, esquema: dict):
+    """Monta a tabela colunar; None se o pyarrow faltar ou os tipos forem mistos."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+    colunas = esquema["colunas"]
+    if esquema["registro"] == "tupla":
+        chaves, obter = range(len(colunas)), operator.getitem
+    else:
+        chaves, obter = colunas, dict.get
+    try:
+        # Uma lista por coluna, convertida de uma vez pelo Arrow
+        return pa.table(
+            {
+                coluna: pa.array([obter(registro, chave) for registro in dados])
+                for coluna, chave in zip(colunas, chaves)
+            }
+        )
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+
+# ------------------ Escrita ------------------ #
+
+
+@medir("csv.escrever_csv")
+def escrever_csv(
+    dados, dataset: str, pasta: str = "out", motor: str = None, compressao: str = None
+) -> str:
+    """
+    Grava `dados` no CSV do dataset de forma atômica.
+
+    Variantes do mesmo dataset com outra compressão são removidas após a
+    gravação, para que `caminho_csv` nunca encontre um arquivo antigo.
+
+    Args:
+        dados (list): Registros no formato do esquema (tuplas ou dicionários);
+            outro formato gera TypeError.
+        dataset (str): Chave de ESQUEMAS.
+        pasta (str, optional): Diretório de saída.
+        motor (str, optional): 'csv' ou 'arrow'. Padrão: KAIZEN_CSV_MOTOR.
+        compressao (str, optional): 'nenhuma', 'gzip' ou 'zstd'.
+            Padrão: KAIZEN_CSV_COMPRESSAO.
+
+    Returns:
+        str: Caminho do arquivo gravado.
+    """
+    esquema = ESQUEMAS[dataset]
+    _verificar_registros(dados, dataset, esquema)
+    motor = motor or motor_padrao()
+    compressao = compressao or compressao_padrao()
+    caminho = os.path.join(pasta, dataset + EXTENSOES[compressao])
+
+    tabela = _tabela_arrow(dados, esquema) if motor == "arrow" else None
+    with gravar_atomico(caminho, "wb") as arquivo:
+        with _comprimir(arquivo, compressao) as destino:
+            if tabela is not None:
+                import pyarrow.csv as pa_csv
+
+                pa_csv.write_csv(tabela, destino)
+            else:
+                _escrever_csv(destino, dados, esquema)
+
+    for extensao in EXTENSOES.values():
+        antigo = os.path.join(pasta, dataset + extensao)
+        if antigo != caminho and os.path.exists(antigo):
+            os.remove(antigo)
+    return caminho
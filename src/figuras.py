@@ -0,0 +1,262 @@
+"""
+Figuras do Dashboard - Especificações Plotly Pré-Computadas
+
+Constrói as figuras de barras, radar e matriz tipo x tipo como especificações
+Plotly em JSON puro ({'data': [...], 'layout': {...}}), compartilhadas pelo
+dashboard Streamlit e pelo relatório HTML.
+
+- Os traços são montados a partir de matrizes NumPy (uma conversão numérica
+  por tabela), sem `iterrows()` nem objetos `go.*` por linha.
+- As figuras derivadas do resumo são geradas uma vez por versão do resumo
+  (etapa `analyze`) e gravadas em 'out/figuras_dashboard.json'; dashboard e
+  relatório apenas leem o artefato, tirando a construção das figuras do
+  caminho de cada requisição.
+- Cada figura existe em dois temas: 'escuro' (dashboard) e 'claro' (relatório).
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+from checkpoint import gravar_atomico
+from instrumentacao import medir
+from resumo_dashboard import resumo_para_dataframes
+
+ARQUIVO_FIGURAS = "out/figuras_dashboard.json"
+
+TEMAS = {
+    "escuro": {
+        "template": "plotly_dark",
+        "layout": {
+            "plot_bgcolor": "#000000",
+            "paper_bgcolor": "#000000",
+            "font": {"color": "white"},
+        },
+        "cor_media": "white",
+    },
+    "claro": {"template": "plotly_white", "layout": {}, "cor_media": "black"},
+}
+
+_templates = {}  # templates Plotly serializados, por nome
+
+
+# ------------------ Layout ------------------ #
+
+
+def _template(nome: str) -> dict:
+    """Template Plotly expandido em JSON (o Plotly.js não conhece templates por nome)."""
+    if nome not in _templates:
+        import plotly.io as pio  # só quem gera figuras precisa do plotly
+
+        _templates[nome] = pio.templates[nome].to_plotly_json()
+    return _templates[nome]
+
+
+def _layout(tema: str, **campos) -> dict:
+    configuracao = TEMAS[tema]
+    return {
+        "template": _template(configuracao["template"]),
+        **configuracao["layout"],
+        **campos,
+    }
+
+
+def _lista(valores) -> list:
+    """Converte um array em lista JSON, trocando NaN por None."""
+    valores = np.asarray(valores, dtype=float)
+    return np.where(np.isnan(valores), None, valores.round(2)).tolist()
+
+
+# ------------------ Figuras ------------------ #
+
+
+def figura_barras(comparativo: pd.DataFrame, tema: str = "escuro") -> dict:
+    """
+    Barras agrupadas dos atributos: média do Top 10 vs média geral.
+
+    Args:
+        comparativo (pd.DataFrame): Colunas 'Atributo', 'Média_Top10' e 'Média_Geral'.
+        tema (str, optional): 'escuro' ou 'claro'.
+
+    Returns:
+        dict: Especificação Plotly da figura.
+    """
+    atributos = comparativo["Atributo"].tolist()
+    series = (
+        ("Média_Top10", "Média Top 10", "#1f77b4"),
+        ("Média_Geral", "Média Geral", "#ff7f0e"),
+    )
+    return {
+        "data": [
+            {
+                "type": "bar",
+                "x": atributos,
+                "y": _lista(pd.to_numeric(comparativo[coluna], errors="coerce")),
+                "name": nome,
+                "marker": {"color": cor},
+                "hovertemplate": "%{x}: %{y:.2f}<extra></extra>",
+            }
+            for coluna, nome, cor in series
+        ],
+        "layout": _layout(
+            tema,
+            barmode="group",
+            title={"text": "Comparativo de Atributos: Top 10 vs Média Geral"},
+            xaxis={"title": {"text": "Atributos"}},
+            yaxis={"title": {"text": "Valor Médio"}},
+        ),
+    }
+
+
+def figura_radar(
+    df_top10_attr: pd.DataFrame, media_geral: pd.Series, tema: str = "escuro"
+) -> dict:
+    """
+    Radar dos atributos de cada Pokémon do Top 10 e da média geral.
+
+    Args:
+        df_top10_attr (pd.DataFrame): Atributos dos Top 10 vencedores (coluna 'Nome').
+        media_geral (pd.Series): Média geral, indexada pelos atributos do radar.
+        tema (str, optional): 'escuro' ou 'claro'.
+
+    Returns:
+        dict: Especificação Plotly da figura.
+    """
+    atributos = list(media_geral.index)
+    # Top 10 vazio (sem combates) chega sem as colunas: só a média é desenhada
+    matriz = (
+        df_top10_attr.reindex(columns=atributos)
+        .apply(pd.to_numeric, errors="coerce")
+        .to_numpy(float)
+    )
+    traco = {
+        "type": "scatterpolar",
+        "theta": atributos,
+        "fill": "toself",
+        "hovertemplate": "%{theta}: %{r:.2f}<extra></extra>",
+    }
+    dados = [
+        {**traco, "r": linha, "name": nome}
+        for nome, linha in zip(
+            df_top10_attr.reindex(columns=["Nome"])["Nome"].tolist(), _lista(matriz)
+        )
+    ]
+    dados.append(
+        {
+            **traco,
+            "r": _lista(media_geral.to_numpy()),
+            "name": "Média Geral",
+            "line": {"color": TEMAS[tema]["cor_media"], "dash": "dash"},
+        }
+    )
+    return {
+        "data": dados,
+        "layout": _layout(
+            tema,
+            polar={"radialaxis": {"visible": True}},
+            title={"text": "Radar: Top 10 vs Média Geral"},
+        ),
+    }
+
+
+def figura_matriz_tipos(matriz: pd.DataFrame, tema: str = "escuro") -> dict:
+    """
+    Mapa de calor da taxa de vitória tipo x tipo.
+
+    Args:
+        matriz (pd.DataFrame): Matriz de `IndiceConfrontos.matriz_tipos`.
+        tema (str, optional): 'escuro' ou 'claro'.
+
+    Returns:
+        dict: Especificação Plotly da figura.
+    """
+    return {
+        "data": [
+            {
+                "type": "heatmap",
+                "z": _lista(matriz.to_numpy()),
+                "x": matriz.columns.tolist(),
+                "y": matriz.index.tolist(),
+                "colorscale": "RdYlGn",
+                "zmid": 50,
+                "hovertemplate": "%{y} vs %{x}: %{z:.2f}%<extra></extra>",
+            }
+        ],
+        "layout": _layout(
+            tema, title={"text": "Taxa de Vitória (%) - Tipo (linha) vs Tipo (coluna)"}
+        ),
+    }
+
+
+# ------------------ Artefato por Versão ------------------ #
+
+
+@medir("figuras.gerar_figuras")
+def gerar_figuras(resumo: dict) -> dict:
+    """
+    Gera as figuras do resumo em todos os temas.
+
+    Args:
+        resumo (dict): Resumo gerado por `resumo_dashboard.gerar_resumo`.
+
+    Returns:
+        dict: {'versao': versão do resumo, 'figuras': {tema: {nome: especificação}}}.
+    """
+    _, _, df_top10_attr, comparativo, media_geral = resumo_para_dataframes(resumo)
+    return {
+        "versao": resumo["versao"],
+        "figuras": {
+            tema: {
+                "barras": figura_barras(comparativo, tema),
+                "radar": figura_radar(df_top10_attr, media_geral, tema),
+            }
+            for tema in TEMAS
+        },
+    }
+
+
+def salvar_figuras(figuras: dict):
+    """
+    Grava as figuras em 'out/figuras_dashboard.json' (escrita atômica).
+
+    Args:
+        figuras (dict): Resultado de `gerar_figuras`.
+    """
+    with gravar_atomico(ARQUIVO_FIGURAS, encoding="utf-8") as arquivo:
+        json.dump(figuras, arquivo, ensure_ascii=False, separators=(",", ":"))
+    print(f"✅ Figuras do dashboard salvas (versão {figuras['versao']}).")
+
+
+def carregar_figuras(versao: str):
+    """
+    Lê as figuras gravadas, se corresponderem à versão do resumo.
+
+    Args:
+        versao (str): Versão do resumo atual.
+
+    Returns:
+        dict ou None: {tema: {nome: especificação}}, ou None se ausentes/desatualizadas.
+    """
+    if not os.path.exists(ARQUIVO_FIGURAS):
+        return None
+    with open(ARQUIVO_FIGURAS, encoding="utf-8") as arquivo:
+        figuras = json.load(arquivo)
+    return figuras["figuras"] if figuras.get("versao") == versao else None
+
+
+def obter_figuras(resumo: dict) -> dict:
+    """
+    Figuras da versão atual do resumo, gerando e gravando o artefato se preciso.
+
+    Args:
+        resumo (dict): Resumo atual.
+
+    Returns:
+        dict: {tema: {nome: especificação}}.
+    """
+    figuras = carregar_figuras(resumo["versao"])
+    if figuras is None:
+        artefato = gerar_figuras(resumo)
+        salvar_figuras(artefato)
+        figuras = artefato["figuras"]
+    return figuras
@@ -0,0 +1,148 @@
+"""
+Gerenciador do Ciclo de Vida do Token JWT
+
+Este módulo mantém um único token JWT compartilhado por todas as requisições
+da coleta (inclusive as threads da paginação paralela):
+
+- Decodifica o campo 'exp' do JWT e renova o token antes de expirar.
+- Usa um lock para que apenas uma thread faça login por vez; as demais
+  aguardam e reaproveitam o token novo (sem rajada de logins).
+- Repete de forma transparente uma requisição que recebeu 401, após renovar
+  o token.
+
+Variáveis de ambiente:
+    API_TOKEN_MARGEM: Segundos de antecedência para renovar (padrão: 60)
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+import requests
+from instrumentacao import incrementar, registrar_evento
+from decodificacao import ACCEPT_ENCODING
+
+MARGEM_RENOVACAO = float(os.getenv("API_TOKEN_MARGEM", "60"))
+
+
+# ------------------ Decodificação ------------------ #
+
+
+def expiracao_jwt(token: str):
+    """
+    Lê o instante de expiração ('exp') de um JWT, sem validar a assinatura.
+
+    Args:
+        token (str): Token JWT.
+
+    Returns:
+        float ou None: Timestamp Unix de expiração, ou None se ausente/ilegível.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, AttributeError):
+        return None
+
+
+# ------------------ Gerenciador ------------------ #
+
+
+class GerenciadorToken:
+    """
+    Fornece um token JWT válido e compartilhado entre threads.
+
+    Args:
+        login (callable): Função sem argumentos que faz login e retorna o token
+            (str) ou None em caso de falha.
+        token (str, optional): Token inicial já obtido.
+        margem (float, optional): Segundos antes do 'exp' para renovar.
+        sessao (requests.Session, optional): Sessão HTTP reutilizada entre
+            requisições (conexões keep-alive); padrão: uma conexão por requisição.
+    """
+
+    def __init__(
+        self,
+        login,
+        token: str = None,
+        margem: float = MARGEM_RENOVACAO,
+        sessao: requests.Session = None,
+    ):
+        self._login = login
+        self._http = sessao or requests
+        self._lock = threading.Lock()
+        self._margem = margem
+        self._token = None
+        self._expira_em = None
+        if token:
+            self._definir(token)
+
+    def _definir(self, token: str):
+        self._token = token
+        self._expira_em = expiracao_jwt(token) if token else None
+
+    def _precisa_renovar(self) -> bool:
+        if not self._token:
+            return True
+        return (
+            self._expira_em is not None
+            and time.time() >= self._expira_em - self._margem
+        )
+
+    def _renovar(self):
+        """Faz login e guarda o novo token. Deve ser chamada com o lock adquirido."""
+        self._definir(self._login())
+        incrementar("api_token_renovacoes")
+        registrar_evento("token_renovado", expira_em=self._expira_em)
+
+    def token(self):
+        """
+        Retorna um token válido, renovando-o se estiver perto de expirar.
+
+        Returns:
+            str ou None: Token JWT, ou None se o login falhar.
+        """
+        with self._lock:
+            if self._precisa_renovar():
+                self._renovar()
+            return self._token
+
+    def invalidar(self, token_usado: str):
+        """
+        Descarta o token após um 401, se ninguém o tiver renovado ainda.
+
+        Args:
+            token_usado (str): Token enviado na requisição recusada.
+        """
+        with self._lock:
+            if self._token == token_usado:
+                self._token = None
+
+    def headers(self, token: str = None) -> dict:
+        """Cabeçalho HTTP com o token Bearer atual (ou o informado) e a compressão aceita."""
+        return {
+            "Authorization": f"Bearer {token or self.token()}",
+            "Accept-Encoding": ACCEPT_ENCODING,
+        }
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Faz um GET autenticado, renovando o token e repetindo uma vez em caso de 401.
+
+        Args:
+            url (str): URL da requisição.
+            **kwargs: Argumentos repassados a `requests.get`.
+
+        Returns:
+            requests.Response: Resposta final.
+        """
+        token = self.token()
+        response = self._http.get(url, headers=self.headers(token), **kwargs)
+        if response.status_code == 401:
+            incrementar("api_retentativas_401")
+            self.invalidar(token)
+            response = self._http.get(url, headers=self.headers(), **kwargs)
+        return response
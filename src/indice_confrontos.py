@@ -0,0 +1,278 @@
+"""
+Índice de Confrontos - Pokémon x Pokémon e Tipo x Tipo
+
+Este módulo pré-computa, com operações vetorizadas do NumPy sobre os
+combates, um índice de confrontos que responde em O(1):
+
+- "Qual a taxa de vitória de A contra B?" (matriz esparsa de pares)
+- "Como o tipo X se sai contra o tipo Y?" (matriz densa tipo x tipo)
+
+O índice é persistido em um único arquivo binário compacto (.npz) e pode ser
+consultado pelo dashboard sem varrer a tabela de combates.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from instrumentacao import medir
+from resumo_dashboard import SEPARADOR_TIPOS
+
+ARQUIVO_INDICE = "out/indice_confrontos.npz"
+
+
+# ------------------ Estrutura de Consulta ------------------ #
+
+
+class IndiceConfrontos:
+    """
+    Índice de confrontos carregado em memória.
+
+    Pares são armazenados de forma canônica (menor ID, maior ID), com o total
+    de lutas e as vitórias do menor ID. As consultas usam um dicionário de
+    chaves para acesso O(1).
+    """
+
+    def __init__(
+        self,
+        chaves,
+        lutas,
+        vitorias_menor,
+        base,
+        tipos,
+        lutas_tipos,
+        vitorias_tipos,
+        ids,
+        nomes,
+    ):
+        self.chaves = np.asarray(chaves, dtype=np.int64)
+        self.lutas = np.asarray(lutas, dtype=np.int32)
+        self.vitorias_menor = np.asarray(vitorias_menor, dtype=np.int32)
+        self.base = int(base)
+        self.tipos = [str(t) for t in tipos]
+        self.lutas_tipos = np.asarray(lutas_tipos, dtype=np.int64)
+        self.vitorias_tipos = np.asarray(vitorias_tipos, dtype=np.int64)
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.nomes = [str(n) for n in nomes]
+
+        self._posicao = dict(zip(self.chaves.tolist(), range(len(self.chaves))))
+        self._codigo_tipo = {tipo: i for i, tipo in enumerate(self.tipos)}
+        self._id_por_nome = dict(zip(self.nomes, self.ids.tolist()))
+
+    def id_por_nome(self, nome: str):
+        """Retorna o ID de um Pokémon pelo nome, ou None se não existir."""
+        return self._id_por_nome.get(nome)
+
+    def confronto(self, id_a: int, id_b: int) -> dict:
+        """
+        Retorna o histórico de A contra B.
+
+        Args:
+            id_a (int): ID do Pokémon A.
+            id_b (int): ID do Pokémon B.
+
+        Returns:
+            dict: {'lutas', 'vitorias', 'derrotas', 'taxa_vitoria'} do ponto de vista de A.
+                taxa_vitoria é None quando não houve confronto.
+        """
+        menor, maior = min(id_a, id_b), max(id_a, id_b)
+        posicao = self._posicao.get(menor * self.base + maior)
+        if posicao is None:
+            return {"lutas": 0, "vitorias": 0, "derrotas": 0, "taxa_vitoria": None}
+
+        lutas = int(self.lutas[posicao])
+        vitorias = int(self.vitorias_menor[posicao])
+        if id_a != menor:
+            vitorias = lutas - vitorias
+        return {
+            "lutas": lutas,
+            "vitorias": vitorias,
+            "derrotas": lutas - vitorias,
+            "taxa_vitoria": round(vitorias / lutas * 100, 2),
+        }
+
+    def confronto_tipos(self, tipo_x: str, tipo_y: str) -> dict:
+        """
+        Retorna o desempenho de Pokémon do tipo X contra Pokémon do tipo Y.
+
+        Pokémon com dois tipos contam para ambos.
+
+        Args:
+            tipo_x (str): Tipo atacante (ex.: 'Fire').
+            tipo_y (str): Tipo oponente (ex.: 'Grass').
+
+        Returns:
+            dict: {'lutas', 'vitorias', 'taxa_vitoria'} do ponto de vista do tipo X.
+        """
+        x, y = self._codigo_tipo.get(tipo_x), self._codigo_tipo.get(tipo_y)
+        if x is None or y is None:
+            return {"lutas": 0, "vitorias": 0, "taxa_vitoria": None}
+        lutas = int(self.lutas_tipos[x, y])
+        vitorias = int(self.vitorias_tipos[x, y])
+        return {
+            "lutas": lutas,
+            "vitorias": vitorias,
+            "taxa_vitoria": round(vitorias / lutas * 100, 2) if lutas else None,
+        }
+
+    def matriz_tipos(self) -> pd.DataFrame:
+        """
+        Retorna a matriz de taxa de vitória (%) tipo x tipo.
+
+        Returns:
+            pd.DataFrame: Linhas = tipo atacante, colunas = tipo oponente.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            taxa = np.where(
+                self.lutas_tipos > 0,
+                self.vitorias_tipos / self.lutas_tipos * 100,
+                np.nan,
+            )
+        return pd.DataFrame(taxa.round(2), index=self.tipos, columns=self.tipos)
+
+
+# ------------------ Construção ------------------ #
+
+
+def codificar_tipos(df_attr: pd.DataFrame, base: int):
+    """
+    Converte a coluna 'Types' ('Grass/Poison' ou 'Bug, Flying') em códigos por ID.
+
+    Returns:
+        tuple: (tipos, tabela) onde tabela[id] = [código de cada tipo do
+            Pokémon], com -1 para posições sem tipo.
+    """
+    partes = (
+        df_attr["Types"]
+        .fillna("")
+        .astype(str)
+        .str.split(SEPARADOR_TIPOS, expand=True, regex=True)
+    )
+    valores = partes.stack().dropna()
+    tipos = sorted({str(v).strip() for v in valores.unique()} - {""})
+    codigo = {tipo: i for i, tipo in enumerate(tipos)}
+
+    tabela = np.full((base, partes.shape[1]), -1, dtype=np.int32)
+    ids = df_attr["ID"].to_numpy(dtype=np.int64)
+    for coluna in range(partes.shape[1]):
+        tabela[ids, coluna] = (
+            partes[coluna].map(lambda t: codigo.get(str(t).strip(), -1)).to_numpy()
+        )
+    return tipos, tabela
+
+
+@medir("confrontos.construir_indice")
+def construir_indice(df_combates: pd.DataFrame, df_attr: pd.DataFrame):
+    """
+    Constrói o índice de confrontos com group-bys vetorizados (np.unique/bincount).
+
+    Args:
+        df_combates (pd.DataFrame): Colunas first_pokemon, second_pokemon, winner.
+        df_attr (pd.DataFrame): Colunas ID, Nome e Types.
+
+    Returns:
+        IndiceConfrontos: Índice pronto para consulta.
+    """
+    first = df_combates["first_pokemon"].to_numpy(dtype=np.int64)
+    second = df_combates["second_pokemon"].to_numpy(dtype=np.int64)
+    winner = df_combates["winner"].to_numpy(dtype=np.int64)
+    base = (
+        int(max(first.max(initial=0), second.max(initial=0), df_attr["ID"].max())) + 1
+    )
+
+    # Pares canônicos (menor, maior) -> lutas e vitórias do menor
+    menor = np.minimum(first, second)
+    maior = np.maximum(first, second)
+    chaves, inverso = np.unique(menor * base + maior, return_inverse=True)
+    lutas = np.bincount(inverso, minlength=len(chaves))
+    vitorias_menor = np.bincount(
+        inverso, weights=(winner == menor), minlength=len(chaves)
+    ).astype(np.int64)
+
+    # Tipo x tipo: cada combate conta nas duas perspectivas e em cada tipo
+    # (Pokémon com mais de um tipo contam para todos eles)
+    tipos, tabela_tipos = codificar_tipos(df_attr, base)
+    n_tipos = len(tipos)
+    lutas_tipos = np.zeros(n_tipos * n_tipos, dtype=np.int64)
+    vitorias_tipos = np.zeros(n_tipos * n_tipos, dtype=np.int64)
+    for atacante, oponente in ((first, second), (second, first)):
+        venceu = winner == atacante
+        for i in range(tabela_tipos.shape[1]):
+            for j in range(tabela_tipos.shape[1]):
+                tx = tabela_tipos[atacante, i]
+                ty = tabela_tipos[oponente, j]
+                validos = (tx >= 0) & (ty >= 0)
+                chave = tx[validos] * n_tipos + ty[validos]
+                lutas_tipos += np.bincount(chave, minlength=n_tipos * n_tipos)
+                vitorias_tipos += np.bincount(
+                    chave, weights=venceu[validos], minlength=n_tipos * n_tipos
+                ).astype(np.int64)
+
+    return IndiceConfrontos(
+        chaves,
+        lutas,
+        vitorias_menor,
+        base,
+        tipos,
+        lutas_tipos.reshape(n_tipos, n_tipos),
+        vitorias_tipos.reshape(n_tipos, n_tipos),
+        df_attr["ID"].to_numpy(),
+        df_attr["Nome"].astype(str).to_numpy(),
+    )
+
+
+# ------------------ Persistência ------------------ #
+
+
+@medir("confrontos.salvar_indice")
+def salvar_indice(indice: IndiceConfrontos, caminho: str = ARQUIVO_INDICE):
+    """
+    Persiste o índice em um arquivo .npz compactado.
+
+    Args:
+        indice (IndiceConfrontos): Índice construído.
+        caminho (str, optional): Arquivo de saída.
+    """
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    np.savez_compressed(
+        caminho,
+        chaves=indice.chaves,
+        lutas=indice.lutas,
+        vitorias_menor=indice.vitorias_menor,
+        base=np.array(indice.base),
+        tipos=np.array(indice.tipos),
+        lutas_tipos=indice.lutas_tipos,
+        vitorias_tipos=indice.vitorias_tipos,
+        ids=indice.ids,
+        nomes=np.array(indice.nomes),
+    )
+    print(
+        f"✅ Índice de confrontos salvo em '{caminho}' "
+        f"({len(indice.chaves)} pares, {len(indice.tipos)} tipos)."
+    )
+
+
+@medir("confrontos.carregar_indice")
+def carregar_indice(caminho: str = ARQUIVO_INDICE):
+    """
+    Carrega o índice de confrontos do disco.
+
+    Args:
+        caminho (str, optional): Arquivo .npz gerado por `salvar_indice`.
+
+    Returns:
+        IndiceConfrontos ou None: Índice, ou None se o arquivo não existir.
+    """
+    if not os.path.exists(caminho):
+        return None
+    with np.load(caminho, allow_pickle=False) as dados:
+        return IndiceConfrontos(
+            dados["chaves"],
+            dados["lutas"],
+            dados["vitorias_menor"],
+            dados["base"],
+            dados["tipos"],
+            dados["lutas_tipos"],
+            dados["vitorias_tipos"],
+            dados["ids"],
+            dados["nomes"],
+        )
@@ -0,0 +1,379 @@
+"""
+Instrumentação - Métricas, Logs Estruturados e Profiling
+
+Este módulo centraliza a observabilidade do pipeline (coleta, transformação,
+carga e análise), permitindo identificar onde o tempo e a memória são gastos
+em cada execução.
+
+Funcionalidades principais:
+- Temporizadores por etapa (context manager e decorator `medir`)
+- Contadores (linhas, requisições, bytes, retentativas...)
+- Amostragem do pico de memória (RSS) durante cada etapa
+- Logs estruturados em JSON (uma linha por evento)
+- Exportação de métricas em JSON e no formato texto do Prometheus
+- Profiling opcional com cProfile ou pyinstrument via variável de ambiente
+
+Variáveis de ambiente:
+    KAIZEN_METRICAS_DIR: Diretório de saída das métricas (padrão: 'out')
+    KAIZEN_LOG_ARQUIVO: Arquivo de logs estruturados (padrão: 'out/eventos.jsonl')
+    KAIZEN_PROFILE: 'cprofile' ou 'pyinstrument' para ativar o profiling
+    KAIZEN_PROFILE_DIR: Diretório dos perfis gerados (padrão: 'out/perfis')
+    KAIZEN_AMOSTRAGEM_MS: Intervalo de amostragem de memória em ms (padrão: 50)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+METRICAS_DIR = os.getenv("KAIZEN_METRICAS_DIR", "out")
+LOG_ARQUIVO = os.getenv(
+    "KAIZEN_LOG_ARQUIVO", os.path.join(METRICAS_DIR, "eventos.jsonl")
+)
+PROFILE = (os.getenv("KAIZEN_PROFILE") or "").strip().lower()
+PROFILE_DIR = os.getenv("KAIZEN_PROFILE_DIR", os.path.join(METRICAS_DIR, "perfis"))
+AMOSTRAGEM_S = int(os.getenv("KAIZEN_AMOSTRAGEM_MS", "50")) / 1000
+
+_lock = threading.Lock()
+_contadores = {}  # {(nome, rótulos): valor}
+_etapas = {}  # {(etapa, rótulos): {execucoes, duracao_total_s, ...}}
+_picos_ativos = {}  # {id da medição: pico de RSS observado}
+_amostrador = None
+_profiler_ativo = threading.local()
+
+
+# ------------------ Logs Estruturados ------------------ #
+
+
+class _FormatadorJSON(logging.Formatter):
+    """Formata cada registro de log como uma linha JSON."""
+
+    def format(self, record):
+        evento = {
+            "ts": round(record.created, 3),
+            "nivel": record.levelname,
+            "evento": record.getMessage(),
+        }
+        evento.update(getattr(record, "campos", {}))
+        return json.dumps(evento, ensure_ascii=False, default=str)
+
+
+def _configurar_logger():
+    """
+    Cria o logger 'kaizen' com saída em JSON para o arquivo de eventos.
+
+    Retorna:
+        logging.Logger: Logger configurado.
+    """
+    log = logging.getLogger("kaizen")
+    if not log.handlers:
+        try:
+            os.makedirs(os.path.dirname(LOG_ARQUIVO) or ".", exist_ok=True)
+            handler = logging.FileHandler(LOG_ARQUIVO, encoding="utf-8")
+        except OSError:
+            handler = logging.StreamHandler()
+        handler.setFormatter(_FormatadorJSON())
+        log.addHandler(handler)
+        log.setLevel(logging.INFO)
+        log.propagate = False
+    return log
+
+
+logger = _configurar_logger()
+
+
+def registrar_evento(evento: str, nivel=logging.INFO, **campos):
+    """
+    Registra um evento estruturado no log JSON.
+
+    Args:
+        evento (str): Nome do evento (ex.: 'etapa_concluida').
+        nivel (int, optional): Nível de log.
+        **campos: Campos adicionais do evento.
+    """
+    logger.log(nivel, evento, extra={"campos": campos})
+
+
+# ------------------ Memória ------------------ #
+
+
+def _ler_rss():
+    """
+    Lê o uso atual de memória residente (RSS) do processo em bytes.
+
+    Retorna:
+        int ou None: RSS em bytes, ou None se não for possível medir.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+def _amostrar_memoria():
+    """Laço da thread de amostragem: atualiza o pico das etapas ativas."""
+    while True:
+        rss = _ler_rss()
+        with _lock:
+            if rss is not None:
+                for chave, pico in _picos_ativos.items():
+                    if pico is None or rss > pico:
+                        _picos_ativos[chave] = rss
+        time.sleep(AMOSTRAGEM_S)
+
+
+def _iniciar_amostrador():
+    """Inicia (uma única vez) a thread daemon de amostragem de memória."""
+    global _amostrador
+    if _amostrador is None:
+        _amostrador = threading.Thread(
+            target=_amostrar_memoria, name="kaizen-memoria", daemon=True
+        )
+        _amostrador.start()
+
+
+# ------------------ Profiling ------------------ #
+
+
+@contextmanager
+def _perfilar(etapa: str):
+    """
+    Executa o bloco sob cProfile ou pyinstrument, conforme KAIZEN_PROFILE.
+
+    Apenas a etapa mais externa de cada thread é perfilada, já que os
+    profilers não suportam sessões aninhadas.
+
+    Args:
+        etapa (str): Nome da etapa, usado no nome do arquivo de saída.
+    """
+    if PROFILE not in ("cprofile", "pyinstrument") or getattr(
+        _profiler_ativo, "ativo", False
+    ):
+        yield
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    nome_arquivo = os.path.join(PROFILE_DIR, etapa.replace("/", "_"))
+    _profiler_ativo.ativo = True
+    try:
+        if PROFILE == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                print("⚠️ pyinstrument não instalado; profiling desativado.")
+                yield
+                return
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                with open(f"{nome_arquivo}.html", "w", encoding="utf-8") as f:
+                    f.write(profiler.output_html())
+        else:
+            import cProfile
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                profiler.dump_stats(f"{nome_arquivo}.prof")
+    finally:
+        _profiler_ativo.ativo = False
+
+
+# ------------------ Temporizadores e Contadores ------------------ #
+
+
+def _chave(nome: str, rotulos: dict):
+    return nome, tuple(sorted((k, str(v)) for k, v in rotulos.items()))
+
+
+@contextmanager
+def medir(etapa: str, **rotulos):
+    """
+    Mede duração e pico de memória de uma etapa do pipeline.
+
+    Pode ser usado como context manager ou como decorator:
+
+        with medir("banco.inserir", tabela="combates"):
+            ...
+
+        @medir("api.obter_dados_pokemon")
+        def obter_dados_pokemon(token): ...
+
+    Args:
+        etapa (str): Nome da etapa (ex.: 'api.obter_dados_combate').
+        **rotulos: Rótulos adicionais (ex.: tabela='combates').
+    """
+    _iniciar_amostrador()
+    chave = _chave(etapa, rotulos)
+    id_medicao = object()
+    with _lock:
+        _picos_ativos[id_medicao] = _ler_rss()
+
+    inicio = time.perf_counter()
+    erro = None
+    try:
+        with _perfilar(etapa):
+            yield
+    except BaseException as e:
+        erro = type(e).__name__
+        raise
+    finally:
+        duracao = time.perf_counter() - inicio
+        rss_final = _ler_rss()
+        with _lock:
+            pico = _picos_ativos.pop(id_medicao, None)
+            if rss_final is not None and (pico is None or rss_final > pico):
+                pico = rss_final
+            dados = _etapas.setdefault(
+                chave,
+                {
+                    "execucoes": 0,
+                    "erros": 0,
+                    "duracao_total_s": 0.0,
+                    "duracao_ultima_s": 0.0,
+                    "pico_memoria_bytes": 0,
+                },
+            )
+            dados["execucoes"] += 1
+            dados["erros"] += 1 if erro else 0
+            dados["duracao_total_s"] += duracao
+            dados["duracao_ultima_s"] = duracao
+            dados["pico_memoria_bytes"] = max(dados["pico_memoria_bytes"], pico or 0)
+
+        registrar_evento(
+            "etapa_concluida" if erro is None else "etapa_falhou",
+            nivel=logging.INFO if erro is None else logging.ERROR,
+            etapa=etapa,
+            duracao_s=round(duracao, 6),
+            pico_memoria_bytes=pico,
+            erro=erro,
+            **rotulos,
+        )
+
+
+def incrementar(nome: str, valor=1, **rotulos):
+    """
+    Incrementa um contador (linhas, requisições, bytes, retentativas...).
+
+    Args:
+        nome (str): Nome do contador (ex.: 'api_requisicoes').
+        valor (int | float, optional): Valor a somar. Padrão: 1.
+        **rotulos: Rótulos adicionais (ex.: endpoint='combats').
+    """
+    chave = _chave(nome, rotulos)
+    with _lock:
+        _contadores[chave] = _contadores.get(chave, 0) + valor
+
+
+def obter_metricas() -> dict:
+    """
+    Retorna uma cópia das métricas coletadas até o momento.
+
+    Retorna:
+        dict: {'etapas': [...], 'contadores': [...]} com rótulos expandidos.
+    """
+    with _lock:
+        etapas = [
+            {"etapa": nome, "rotulos": dict(rotulos), **dados}
+            for (nome, rotulos), dados in _etapas.items()
+        ]
+        contadores = [
+            {"nome": nome, "rotulos": dict(rotulos), "valor": valor}
+            for (nome, rotulos), valor in _contadores.items()
+        ]
+    return {"etapas": etapas, "contadores": contadores}
+
+
+def reiniciar_metricas():
+    """Zera todas as métricas acumuladas no processo."""
+    with _lock:
+        _etapas.clear()
+        _contadores.clear()
+
+
+# ------------------ Exportação ------------------ #
+
+
+def _rotulos_prometheus(rotulos: dict) -> str:
+    if not rotulos:
+        return ""
+
+    def escapar(valor):
+        return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    pares = ",".join(f'{k}="{escapar(v)}"' for k, v in rotulos.items())
+    return "{" + pares + "}"
+
+
+def formatar_prometheus(metricas: dict) -> str:
+    """
+    Converte as métricas para o formato texto de exposição do Prometheus.
+
+    Args:
+        metricas (dict): Métricas no formato de `obter_metricas`.
+
+    Retorna:
+        str: Texto no formato Prometheus.
+    """
+    linhas = []
+    series = [
+        ("kaizen_etapa_execucoes_total", "counter", "execucoes"),
+        ("kaizen_etapa_erros_total", "counter", "erros"),
+        ("kaizen_etapa_duracao_segundos_total", "counter", "duracao_total_s"),
+        ("kaizen_etapa_duracao_ultima_segundos", "gauge", "duracao_ultima_s"),
+        ("kaizen_etapa_pico_memoria_bytes", "gauge", "pico_memoria_bytes"),
+    ]
+    for nome_serie, tipo, campo in series:
+        linhas.append(f"# TYPE {nome_serie} {tipo}")
+        for etapa in metricas["etapas"]:
+            rotulos = {"etapa": etapa["etapa"], **etapa["rotulos"]}
+            linhas.append(f"{nome_serie}{_rotulos_prometheus(rotulos)} {etapa[campo]}")
+
+    for nome in sorted({c["nome"] for c in metricas["contadores"]}):
+        linhas.append(f"# TYPE kaizen_{nome}_total counter")
+        for contador in metricas["contadores"]:
+            if contador["nome"] == nome:
+                linhas.append(
+                    f"kaizen_{nome}_total{_rotulos_prometheus(contador['rotulos'])} "
+                    f"{contador['valor']}"
+                )
+    return "\n".join(linhas) + "\n"
+
+
+def exportar_metricas(diretorio: str = None):
+    """
+    Exporta as métricas acumuladas para 'metricas.json' e 'metricas.prom'.
+
+    Args:
+        diretorio (str, optional): Diretório de saída. Padrão: KAIZEN_METRICAS_DIR.
+
+    Retorna:
+        dict: Métricas exportadas.
+    """
+    diretorio = diretorio or METRICAS_DIR
+    os.makedirs(diretorio, exist_ok=True)
+    metricas = obter_metricas()
+    metricas["gerado_em"] = time.time()
+
+    with open(os.path.join(diretorio, "metricas.json"), "w", encoding="utf-8") as f:
+        json.dump(metricas, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(diretorio, "metricas.prom"), "w", encoding="utf-8") as f:
+        f.write(formatar_prometheus(metricas))
+
+    print(f"📈 Métricas exportadas em '{diretorio}/metricas.json' e 'metricas.prom'.")
+    return metricas
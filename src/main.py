@@ -1,44 +1,104 @@
-import pandas as pd
-from analisar_dados_banco import gerar_dashboard
-from obtencao_dados import (
-    verificar_saude,
-    obter_token_jwt,
-    obter_dados_pokemon,
-    obter_atributos_pokemon,
-    obter_dados_combate,
-    transformar_csv,
-)
-from tratamento_dados import informacoes_dataset, remover_duplicados, conectar_banco
+"""
+Pipeline Pokémon - Linha de Comando
 
-if __name__ == "__main__":
-        response = obter_token_jwt()
-        token = response.json().get("access_token") if response else None
-
-        if token:
-            verificar_saude(token)
-            lista_pokemon = obter_dados_pokemon(token)
-            transformar_csv(lista_pokemon, "pokemons")
-
-            lista_atributos = obter_atributos_pokemon(token)
-            transformar_csv(lista_atributos, "atributos_pokemon")
-
-            lista_combates = obter_dados_combate(token)
-            transformar_csv(lista_combates, "combates")
-        else:
-            print("❌ Falha ao obter token JWT.")
-        
-          # Carregar CSVs
-        df_pokemons = pd.read_csv("out/pokemons.csv", sep=",", encoding="utf-8")
-        df_atributos = pd.read_csv("out/atributos_pokemon.csv", sep=",", encoding="utf-8")
-        df_combates = pd.read_csv("out/combates.csv", sep=",", encoding="utf-8")
-
-        # Informações detalhadas dos datasets
-        print(informacoes_dataset(df_pokemons, "pokemons"))
-        print(informacoes_dataset(df_atributos, "atributos_pokemon"))
-        print(informacoes_dataset(df_combates, "combates"))
-
-        # Limpeza de duplicados
-        df_combates = remover_duplicados(df_combates)
+Executa o pipeline completo ou apenas uma etapa:
+
+    python src/main.py            # todas as etapas (ingest, load, analyze, report)
+    python src/main.py ingest     # coleta da API -> CSVs em out/
+    python src/main.py load       # CSVs -> banco (PostgreSQL ou backend local)
+    python src/main.py analyze    # estatísticas, Elo, resumo, índices, confrontos, similaridade e snapshot
+    python src/main.py report     # relatório HTML a partir do resumo
+    python src/main.py serve      # serviço: etapas agendadas com estado aquecido
+    python src/main.py api        # API HTTP de leitura das análises (JSON)
+
+Cada subcomando importa apenas os módulos de que precisa (pandas, plotly,
+sqlalchemy e requests são carregados sob demanda), de modo que `--help` e
+etapas isoladas iniciam rapidamente.
+"""
+
+import argparse
+
+ETAPAS = ("ingest", "load", "analyze", "report")
+
+
+# ------------------ Subcomandos ------------------ #
+
+
+def ingest(token=None):
+    """
+    Coleta Pokémons, atributos e combates da API e salva os CSVs.
+
+    Args:
+        token (GerenciadorToken, optional): Gerenciador já aquecido (modo serviço);
+            padrão: um novo gerenciador para esta execução.
+    """
+    from obtencao_dados import (
+        verificar_saude,
+        criar_gerenciador_token,
+        obter_dados_pokemon,
+        obter_atributos_pokemon,
+        obter_dados_combate,
+        transformar_csv,
+    )
+
+    # Token compartilhado por toda a coleta, renovado antes de expirar
+    token = token or criar_gerenciador_token()
+
+    if token.token():
+        verificar_saude(token)
+        lista_pokemon = obter_dados_pokemon(token)
+        transformar_csv(lista_pokemon, "pokemons")
+
+        lista_atributos = obter_atributos_pokemon(token)
+        transformar_csv(lista_atributos, "atributos_pokemon")
+
+        lista_combates = obter_dados_combate(token)
+        transformar_csv(lista_combates, "combates")
+    else:
+        print("❌ Falha ao obter token JWT.")
+
+
+def _ler_csvs():
+    """
+    Lê os CSVs de out/, remove combates duplicados e valida os restantes.
+    Cada combate leva sua posição no CSV (COLUNA_ORDEM_CARGA).
+    """
+    import pandas as pd
+    from escrita_csv import caminho_csv
+    from tratamento_dados import (
+        COLUNA_ORDEM_CARGA,
+        informacoes_dataset,
+        remover_duplicados,
+    )
+    from validacao import validar_combates
+
+    df_pokemons, df_atributos, df_combates = (
+        pd.read_csv(caminho_csv(nome), sep=",", encoding="utf-8")
+        for nome in ("pokemons", "atributos_pokemon", "combates")
+    )
+
+    # Informações detalhadas dos datasets
+    print(informacoes_dataset(df_pokemons, "pokemons"))
+    print(informacoes_dataset(df_atributos, "atributos_pokemon"))
+    print(informacoes_dataset(df_combates, "combates"))
+
+    # Limpeza de duplicados
+    df_combates = remover_duplicados(df_combates)
+
+    # Integridade referencial e sanidade (inválidos vão para a quarentena)
+    df_combates = validar_combates(df_combates, df_atributos)
+    df_combates[COLUNA_ORDEM_CARGA] = df_combates.index.to_numpy(dtype="int64")
+    return df_pokemons, df_atributos, df_combates
+
+
+def load():
+    """Carrega os CSVs no PostgreSQL ou no backend analítico local."""
+    from backend_analitico import backend_atual, construir_banco_local
+
+    df_pokemons, df_atributos, df_combates = _ler_csvs()
+
+    if backend_atual() == "postgres":
+        from tratamento_dados import conectar_banco
 
         # Inserção no banco
         dfs = [df_pokemons, df_atributos, df_combates]
@@ -46,6 +106,125 @@ if __name__ == "__main__":
 
         for df, banco in zip(dfs, bancos):
             conectar_banco(df, banco)
-        
-        gerar_dashboard()
-    
+    else:
+        # Análise local (DuckDB/SQLite); o PostgreSQL recebe só os agregados.
+        # Combates entram já limpos e validados, não direto do CSV.
+        construir_banco_local("out", dataframes={"combates": df_combates})
+
+
+def analyze():
+    """
+    Recalcula estatísticas, rating Elo e resumo, constrói os índices de
+    confrontos e de similaridade, publica as tabelas e o snapshot de serviço
+    do dashboard.
+    """
+    import pandas as pd
+    from analisar_dados_banco import inicializar_dados, TABELAS_PUBLICADAS
+    from backend_analitico import ler_sql, publicar_tabelas
+    from banco_conexao import leitura_no_primario
+    from consultas_paginadas import criar_indices
+    from escrita_csv import caminho_csv
+    from figuras import obter_figuras
+    from indice_confrontos import construir_indice, salvar_indice
+    from rating_elo import atualizar_ratings
+    from resumo_dashboard import carregar_resumo
+    from similaridade import (
+        construir_indice_similaridade,
+        salvar_indice_similaridade,
+    )
+    from snapshot_dashboard import publicar_snapshot
+    from tratamento_dados import remover_duplicados
+    from validacao import validar_combates
+
+    # A análise lê o que acabou de gravar: sem réplica no caminho
+    with leitura_no_primario():
+        if inicializar_dados(recalcular=True) is None:
+            return
+        criar_indices()
+        df_ratings = atualizar_ratings()
+
+        df_atributos = pd.read_csv(
+            caminho_csv("atributos_pokemon"), sep=",", encoding="utf-8"
+        )
+        df_combates = validar_combates(
+            remover_duplicados(
+                pd.read_csv(caminho_csv("combates"), sep=",", encoding="utf-8")
+            ),
+            df_atributos,
+            quarentena=None,  # a quarentena é gravada na etapa load
+        )
+        indice = construir_indice(df_combates, df_atributos)
+        salvar_indice(indice)
+        salvar_indice_similaridade(construir_indice_similaridade(df_atributos))
+        publicar_tabelas(TABELAS_PUBLICADAS)
+
+        resumo = carregar_resumo()
+        publicar_snapshot(
+            resumo,
+            obter_figuras(resumo),
+            ler_sql('SELECT * FROM "estatisticas_pokemon"'),
+            df_combates,
+            df_atributos,
+            indice,
+            df_ratings,
+        )
+
+
+def report():
+    """Gera o relatório HTML a partir do resumo já calculado."""
+    from analisar_dados_banco import gerar_dashboard
+
+    gerar_dashboard()
+
+
+# ------------------ Execução ------------------ #
+
+
+def main(argv=None):
+    """
+    Interpreta a linha de comando e executa as etapas pedidas.
+
+    Args:
+        argv (list[str], optional): Argumentos (padrão: sys.argv[1:]).
+    """
+    parser = argparse.ArgumentParser(description="Pipeline de dados Pokémon.")
+    subparsers = parser.add_subparsers(dest="comando")
+    subparsers.add_parser("ingest", help="Coleta os dados da API e salva os CSVs.")
+    subparsers.add_parser("load", help="Carrega os CSVs no banco.")
+    subparsers.add_parser(
+        "analyze",
+        help="Calcula estatísticas, Elo, resumo, índice de confrontos e snapshot.",
+    )
+    subparsers.add_parser("report", help="Gera o relatório HTML.")
+    subparsers.add_parser("all", help="Executa todas as etapas (padrão).")
+    subparsers.add_parser(
+        "serve", help="Executa o pipeline agendado, com endpoint de status."
+    )
+    subparsers.add_parser(
+        "api", help="Serve as análises pré-calculadas em uma API HTTP de leitura."
+    )
+    args = parser.parse_args(argv)
+
+    if args.comando == "serve":
+        from servico import main as servir
+
+        servir()
+        return
+    if args.comando == "api":
+        from api_leitura import main as servir_api
+
+        servir_api()
+        return
+
+    etapas = ETAPAS if args.comando in (None, "all") else (args.comando,)
+    comandos = {"ingest": ingest, "load": load, "analyze": analyze, "report": report}
+    for etapa in etapas:
+        comandos[etapa]()
+
+    from instrumentacao import exportar_metricas
+
+    exportar_metricas()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,27 @@ Este módulo realiza a autenticação, coleta e armazenamento de dados da API Po
 incluindo informações básicas, atributos detalhados e combates.
 
 Funcionalidades principais:
-- Autenticação via JWT
+- Autenticação via JWT com renovação automática do token (módulo `gerenciador_token`)
 - Verificação de saúde da API
-- Coleta paginada de Pokémons e seus atributos
+- Coleta paginada de Pokémons e seus atributos (módulo `paginacao`)
 - Coleta de dados de combates
+- Checkpoints retomáveis da coleta e escrita atômica dos CSVs (módulo `checkpoint`)
+- Respostas comprimidas e JSON decodificado direto em tuplas por esquema (módulo `decodificacao`)
 - Exportação de dados para arquivos CSV
+- Métricas de requisições, bytes recebidos e linhas coletadas (módulo `instrumentacao`)
 """
 
 import requests
 import csv
-import pandas as pd
 from time import sleep
 from dotenv import load_dotenv
 import os
+from instrumentacao import medir, incrementar
+from paginacao import paginar
+from gerenciador_token import GerenciadorToken
+from checkpoint import Checkpoint, coleta_pendente
+from decodificacao import resposta_json, registros, registrar_transferencia
+from escrita_csv import escrever_csv, caminho_csv, abrir_csv
 
 # Carrega variáveis de ambiente do arquivo .env
 load_dotenv()
@@ -29,6 +37,13 @@ HEALTH_URL = f"{BASE_URL}/health"
 POKEMON_URL = f"{BASE_URL}/pokemon"
 COMBATE_URL = f"{BASE_URL}/combats"
 
+# Pausas entre requisições (em segundos) para respeitar o limite da API
+PAUSA_PAGINA = float(os.getenv("API_PAUSA_PAGINA", "1"))
+PAUSA_DETALHE = float(os.getenv("API_PAUSA_DETALHE", "0.5"))
+
+# Requisições paralelas na coleta paginada (após a primeira página)
+TRABALHADORES_PAGINACAO = int(os.getenv("API_TRABALHADORES", "4"))
+
 
 # ------------------ Funções de Auxílio ------------------ #
 
@@ -46,9 +61,53 @@ def get_headers(token: str):
     return {"Authorization": f"Bearer {token}"}
 
 
+def _login() -> str:
+    """Faz login e retorna apenas o token JWT (ou None em caso de falha)."""
+    response = obter_token_jwt()
+    return response.json().get("access_token") if response else None
+
+
+def criar_gerenciador_token(token: str = None, sessao=None) -> GerenciadorToken:
+    """
+    Cria o gerenciador de token compartilhado pela coleta.
+
+    Args:
+        token (str, optional): Token já obtido; se omitido, o login é feito no primeiro uso.
+        sessao (requests.Session, optional): Sessão HTTP mantida entre coletas.
+
+    Returns:
+        GerenciadorToken: Gerenciador que renova o token antes de expirar e após 401.
+    """
+    return GerenciadorToken(_login, token, sessao=sessao)
+
+
+def _como_gerenciador(token) -> GerenciadorToken:
+    """Aceita um token (str) ou um GerenciadorToken e retorna um gerenciador."""
+    if isinstance(token, GerenciadorToken):
+        return token
+    return criar_gerenciador_token(token)
+
+
+def registrar_resposta(response, endpoint: str):
+    """
+    Contabiliza requisição, bytes recebidos (descomprimidos e, se houver
+    Content-Encoding, trafegados) e falhas de uma resposta da API.
+
+    Args:
+        response (requests.Response): Resposta recebida.
+        endpoint (str): Nome do endpoint para rotular as métricas.
+    """
+    incrementar("api_requisicoes", endpoint=endpoint)
+    incrementar("api_bytes", len(response.content), endpoint=endpoint)
+    registrar_transferencia(response, endpoint)
+    if response.status_code != 200:
+        incrementar("api_falhas", endpoint=endpoint, status=response.status_code)
+
+
 # ------------------ Autenticação ------------------ #
 
 
+@medir("api.obter_token_jwt")
 def obter_token_jwt():
     """
     Realiza login na API e retorna a resposta com o token JWT.
@@ -56,10 +115,17 @@ def obter_token_jwt():
     Retorna:
         requests.Response ou None: Objeto Response se login for bem-sucedido, None caso contrário.
     """
-    credentials = {"username": "kaizen-poke", "password": "4w9f@D39fkkO"}
+    credentials = {
+        "username": os.getenv("API_USERNAME"),
+        "password": os.getenv("API_PASSWORD"),
+    }
+    if not credentials["username"] or not credentials["password"]:
+        print("❌ Defina API_USERNAME e API_PASSWORD no ambiente ou no arquivo .env.")
+        return None
 
     try:
         response = requests.post(LOGIN_URL, json=credentials, timeout=10)
+        registrar_resposta(response, "login")
         if response.status_code == 200:
             print(f"✅ Login realizado com sucesso! Token obtido.")
             return response
@@ -75,17 +141,19 @@ def obter_token_jwt():
 # ------------------ Verificação da API ------------------ #
 
 
+@medir("api.verificar_saude")
 def verificar_saude(token):
     """
     Verifica a saúde da API usando token JWT.
 
     Args:
-        token (str): Token JWT para autenticação.
+        token (str ou GerenciadorToken): Token JWT ou gerenciador de token.
     """
-    headers = get_headers(token)
+    gerenciador = _como_gerenciador(token)
 
     try:
-        response = requests.get(HEALTH_URL, headers=headers)
+        response = gerenciador.get(HEALTH_URL)
+        registrar_resposta(response, "health")
         if response.status_code == 200:
             print("✅ Acesso autorizado!\nSaúde da Aplicação:")
             print(response.json())
@@ -99,103 +167,99 @@ def verificar_saude(token):
 # ------------------ Coleta de Dados ------------------ #
 
 
+@medir("api.obter_dados_pokemon")
 def obter_dados_pokemon(token):
     """
-    Coleta informações básicas de todos os Pokémons da API (paginado).
+    Coleta informações básicas de todos os Pokémons da API.
+
+    A paginação é adaptativa (módulo `paginacao`): o total de páginas vem dos
+    metadados da API e as páginas restantes são buscadas em paralelo.
 
     Args:
-        token (str): Token JWT para autenticação.
+        token (str ou GerenciadorToken): Token JWT ou gerenciador de token.
 
     Returns:
         list[tuple]: Lista de tuplas (ID, Nome) dos Pokémons.
     """
-    lista_pokemon = []
-    headers = get_headers(token)
+    gerenciador = _como_gerenciador(token)
+
+    def buscar_pagina(pagina, por_pagina):
+        response = gerenciador.get(f"{POKEMON_URL}?page={pagina}&per_page={por_pagina}")
+        registrar_resposta(response, "pokemon")
+        sleep(PAUSA_PAGINA)
+        return response
 
     print("🔍 Iniciando coleta de dados dos Pokémons...\n")
     try:
-        for i in range(1, 51):
-            response = requests.get(
-                f"{POKEMON_URL}?page={i}&per_page=50", headers=headers
-            )
-
-            if response.status_code != 200:
-                print(f"❌ Erro na página {i}: {response.status_code}")
-                print(response.text)
-                break
-
-            dados = response.json()
-            pokemons = dados.get("pokemons", [])
-
-            if not pokemons:
-                print("✅ Todos os Pokémons foram obtidos.")
-                break
-
-            for p in pokemons:
-                id_ = p.get("id")
-                nome = (p.get("name") or "").strip()
-                lista_pokemon.append((id_, nome))
-
-            sleep(1)
-
+        pokemons, _ = paginar(
+            buscar_pagina,
+            "pokemons",
+            max_trabalhadores=TRABALHADORES_PAGINACAO,
+            checkpoint="pokemons",
+        )
     except requests.exceptions.RequestException as e:
         print("❌ Ocorreu um erro na requisição:", str(e))
+        pokemons = []
+
+    lista_pokemon = registros(pokemons, "pokemons")
 
+    incrementar("linhas_coletadas", len(lista_pokemon), dataset="pokemons")
     print(f"✅ Total de Pokémons coletados: {len(lista_pokemon)}\n")
     return lista_pokemon
 
 
+@medir("api.obter_atributos_pokemon")
 def obter_atributos_pokemon(token):
     """
     Coleta atributos detalhados de cada Pokémon com base no CSV de IDs.
 
+    Cada ID concluído é gravado no checkpoint 'atributos_pokemon'; após uma
+    interrupção, apenas os IDs restantes são consultados.
+
     Args:
-        token (str): Token JWT para autenticação.
+        token (str ou GerenciadorToken): Token JWT ou gerenciador de token.
 
     Returns:
-        list[dict]: Lista de dicionários com atributos de cada Pokémon.
+        list[tuple]: Atributos de cada Pokémon, na ordem das colunas do CSV.
     """
-    lista_atributos_pokemon = []
-    headers = get_headers(token)
+    gerenciador = _como_gerenciador(token)
+    # Diários de versões que gravavam dicionários são descartados
+    diario = Checkpoint("atributos_pokemon", parametros={"formato": "tupla"})
+    completo = False
     print("🔍 Iniciando coleta dos atributos dos Pokémons...\n")
 
     try:
-        df_id = pd.read_csv("out/pokemons.csv")
-        print(f"📂 {len(df_id)} Pokémons carregados do arquivo CSV.\n")
+        with abrir_csv(caminho_csv("pokemons")) as arquivo:
+            ids = [int(linha["ID"]) for linha in csv.DictReader(arquivo)]
+        print(f"📂 {len(ids)} Pokémons carregados do arquivo CSV.\n")
 
-        for pokemon_id in df_id["ID"]:
-            response = requests.get(f"{POKEMON_URL}/{pokemon_id}", headers=headers)
+        pendentes = [i for i in ids if not diario.concluido(i)]
+        falhas = 0
+        for pokemon_id in pendentes:
+            response = gerenciador.get(f"{POKEMON_URL}/{pokemon_id}")
+            registrar_resposta(response, "pokemon_detalhe")
 
             if response.status_code != 200:
                 print(
                     f"❌ Erro ao consultar os atributos do Pokémon {pokemon_id}: {response.status_code}"
                 )
                 print(response.text)
+                if 400 <= response.status_code < 500 and response.status_code not in (
+                    401,
+                    429,
+                ):
+                    diario.registrar(pokemon_id, [])  # erro definitivo: não repetir
+                else:
+                    falhas += 1
                 continue
 
-            dados = response.json()
-
-            lista_atributos_pokemon.append(
-                {
-                    "ID": dados.get("id"),
-                    "Nome": dados.get("name").strip(),
-                    "Hp": dados.get("hp"),
-                    "Attack": dados.get("attack"),
-                    "Defense": dados.get("defense"),
-                    "Sp_attack": dados.get("sp_attack"),
-                    "Sp_defense": dados.get("sp_defense"),
-                    "Speed": dados.get("speed"),
-                    "Generation": dados.get("generation"),
-                    "Legendary": dados.get("legendary"),
-                    "Types": dados.get("types", []),
-                }
+            diario.registrar(
+                pokemon_id, registros([resposta_json(response)], "atributos_pokemon")
             )
 
-            sleep(0.5)
+            sleep(PAUSA_DETALHE)
 
-        print(
-            f"\n✅ Total de atributos dos Pokémons detalhados: {len(lista_atributos_pokemon)}"
-        )
+        completo = falhas == 0
 
     except FileNotFoundError:
         print("❌ Arquivo 'pokemons.csv' não encontrado.")
@@ -204,53 +268,56 @@ def obter_atributos_pokemon(token):
     except Exception as e:
         print("⚠️ Erro inesperado:", str(e))
 
+    lista_atributos_pokemon = diario.todos_itens()
+    if completo:
+        diario.finalizar()
+    else:
+        print(
+            "⚠️ Coleta de atributos incompleta; a próxima execução retoma do checkpoint."
+        )
+    print(
+        f"\n✅ Total de atributos dos Pokémons detalhados: {len(lista_atributos_pokemon)}"
+    )
+
+    incrementar(
+        "linhas_coletadas", len(lista_atributos_pokemon), dataset="atributos_pokemon"
+    )
     return lista_atributos_pokemon
 
 
+@medir("api.obter_dados_combate")
 def obter_dados_combate(token):
     """
-    Coleta dados de combates entre Pokémons (paginado).
+    Coleta dados de combates entre Pokémons (paginação adaptativa e paralela).
 
     Args:
-        token (str): Token JWT para autenticação.
+        token (str ou GerenciadorToken): Token JWT ou gerenciador de token.
 
     Returns:
-        list[dict]: Lista de combates com ID do primeiro Pokémon, segundo Pokémon e vencedor.
+        list[tuple]: Combates (first_pokemon, second_pokemon, winner).
     """
-    lista_combates = []
-    headers = get_headers(token)
+    gerenciador = _como_gerenciador(token)
+
+    def buscar_pagina(pagina, por_pagina):
+        response = gerenciador.get(f"{COMBATE_URL}?page={pagina}&per_page={por_pagina}")
+        registrar_resposta(response, "combats")
+        return response
 
     print("🔍 Iniciando coleta de dados de combates...\n")
     try:
-        for i in range(1, 501):
-            response = requests.get(
-                f"{COMBATE_URL}?page={i}&per_page=100", headers=headers
-            )
-
-            if response.status_code != 200:
-                print(f"❌ Erro na página {i}: {response.status_code}")
-                print(response.text)
-                break
-
-            dados = response.json()
-            combates = dados.get("combats", [])
-
-            if not combates:
-                print("✅ Todos os dados dos combates foram obtidos.")
-                break
-
-            for c in combates:
-                lista_combates.append(
-                    {
-                        "first_pokemon": c.get("first_pokemon"),
-                        "second_pokemon": c.get("second_pokemon"),
-                        "winner": c.get("winner"),
-                    }
-                )
-
+        combates, _ = paginar(
+            buscar_pagina,
+            "combats",
+            max_trabalhadores=TRABALHADORES_PAGINACAO,
+            checkpoint="combates",
+        )
     except requests.exceptions.RequestException as e:
         print("❌ Ocorreu um erro na requisição:", str(e))
+        combates = []
+
+    lista_combates = registros(combates, "combates")
 
+    incrementar("linhas_coletadas", len(lista_combates), dataset="combates")
     print(f"✅ Total de combates realizados: {len(lista_combates)}\n")
     return lista_combates
 
@@ -258,6 +325,7 @@ def obter_dados_combate(token):
 # ------------------ Transformação para CSV ------------------ #
 
 
+@medir("csv.transformar_csv")
 def transformar_csv(dados, file_):
     """
     Salva os dados coletados em arquivos CSV no diretório 'out'.
@@ -267,39 +335,21 @@ def transformar_csv(dados, file_):
         file_ (str): Tipo de dado ('pokemons', 'atributos_pokemon', 'combates').
 
     Cria:
-        CSV no formato apropriado para cada tipo de dado.
+        CSV com as colunas do esquema do dataset (`escrita_csv.ESQUEMAS`),
+        opcionalmente comprimido (KAIZEN_CSV_COMPRESSAO). A escrita é atômica e,
+        se a coleta ficou incompleta (checkpoint pendente), um CSV anterior não
+        é sobrescrito com dados parciais.
     """
-    if file_ == "pokemons":
-        with open(f"out/{file_}.csv", mode="w", newline="", encoding="utf-8") as file:
-            writer = csv.writer(file)
-            writer.writerow(["ID", "Nome"])
-            for id_, nome in dados:
-                writer.writerow([id_, nome])
-    elif file_ == "atributos_pokemon":
-        with open(f"out/{file_}.csv", mode="w", newline="", encoding="utf-8") as file:
-            fieldnames = [
-                "ID",
-                "Nome",
-                "Hp",
-                "Attack",
-                "Defense",
-                "Sp_attack",
-                "Sp_defense",
-                "Speed",
-                "Generation",
-                "Legendary",
-                "Types",
-            ]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            for item in dados:
-                writer.writerow(item)
-    elif file_ == "combates":
-        with open(f"out/{file_}.csv", mode="w", newline="", encoding="utf-8") as file:
-            fieldnames = ["first_pokemon", "second_pokemon", "winner"]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            for item in dados:
-                writer.writerow(item)
-
-    print(f"💾 Dados salvos em '{file_}.csv' com sucesso!")
+    anterior = caminho_csv(file_)
+    if coleta_pendente(file_) and os.path.exists(anterior):
+        print(
+            f"⚠️ Coleta de '{file_}' incompleta ({len(dados)} registros); "
+            f"'{os.path.basename(anterior)}' anterior mantido."
+        )
+        return
+
+    caminho = escrever_csv(dados, file_)
+
+    incrementar("linhas_escritas", len(dados), dataset=file_)
+    incrementar("bytes_escritos", os.path.getsize(caminho), dataset=file_)
+    print(f"💾 Dados salvos em '{os.path.basename(caminho)}' com sucesso!")
@@ -0,0 +1,249 @@
+"""
+Paginação Adaptativa da API
+
+Este módulo coleta endpoints paginados sem limites fixos de páginas:
+
+1. A primeira página é pedida com o maior `per_page` candidato; se o servidor
+   recusar, tenta o próximo candidato.
+2. Os metadados da resposta (total de itens, total de páginas, link 'next')
+   determinam quantas páginas existem.
+3. Com o total conhecido, as páginas restantes são buscadas em paralelo e
+   remontadas em ordem.
+4. Sem total conhecido, a coleta segue sequencialmente até uma página vazia
+   (páginas curtas não encerram: o servidor pode limitar o per_page).
+
+Ao final é gerado um relatório de cobertura, apontando lacunas (páginas que
+falharam ou itens faltantes) em vez de truncar os dados silenciosamente.
+
+Com `checkpoint`, cada página concluída é gravada em um diário (módulo
+`checkpoint`) e uma nova execução busca apenas as páginas que faltam.
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from checkpoint import Checkpoint
+from decodificacao import resposta_json
+from instrumentacao import incrementar, registrar_evento
+
+POR_PAGINA_CANDIDATOS = (500, 200, 100, 50)
+TENTATIVAS_POR_PAGINA = 2
+
+
+# ------------------ Metadados ------------------ #
+
+
+def _extrair_metadados(dados: dict) -> dict:
+    """
+    Procura metadados de paginação na raiz ou em 'meta'/'pagination'.
+
+    Args:
+        dados (dict): Corpo JSON da resposta.
+
+    Returns:
+        dict: Chaves 'total', 'total_paginas', 'por_pagina' e 'proxima'
+            (valores None quando ausentes).
+    """
+    fontes = [dados]
+    for chave in ("meta", "pagination", "paginacao"):
+        if isinstance(dados.get(chave), dict):
+            fontes.append(dados[chave])
+
+    def buscar(*nomes):
+        for fonte in fontes:
+            for nome in nomes:
+                if fonte.get(nome) is not None:
+                    return fonte[nome]
+        return None
+
+    return {
+        "total": buscar("total", "total_items", "count"),
+        "total_paginas": buscar("total_pages", "pages", "last_page"),
+        "por_pagina": buscar("per_page", "page_size", "limit"),
+        "proxima": buscar("next", "next_page"),
+    }
+
+
+# ------------------ Busca de Páginas ------------------ #
+
+
+def _buscar_com_tentativas(buscar_pagina, pagina, por_pagina, chave_itens):
+    """
+    Busca uma página, repetindo em caso de erro.
+
+    Returns:
+        tuple: (itens, dados) ou (None, None) se todas as tentativas falharem.
+    """
+    for tentativa in range(TENTATIVAS_POR_PAGINA):
+        if tentativa:
+            incrementar("api_retentativas", endpoint=chave_itens)
+        try:
+            response = buscar_pagina(pagina, por_pagina)
+        except Exception as e:
+            registrar_evento("pagina_falhou", pagina=pagina, erro=str(e))
+            continue
+        if response.status_code == 200:
+            dados = resposta_json(response)
+            return dados.get(chave_itens, []), dados
+        registrar_evento("pagina_falhou", pagina=pagina, status=response.status_code)
+    return None, None
+
+
+def _sondar_primeira_pagina(buscar_pagina, chave_itens, candidatos):
+    """
+    Pede a página 1 com o maior `per_page` aceito pelo servidor.
+
+    Returns:
+        tuple: (por_pagina_pedido, itens, dados) ou (None, None, None).
+    """
+    for por_pagina in candidatos:
+        response = buscar_pagina(1, por_pagina)
+        if response.status_code == 200:
+            dados = resposta_json(response)
+            return por_pagina, dados.get(chave_itens, []), dados
+        print(
+            f"⚠️ per_page={por_pagina} recusado ({response.status_code}); tentando menor."
+        )
+    return None, None, None
+
+
+# ------------------ Paginação ------------------ #
+
+
+def paginar(
+    buscar_pagina,
+    chave_itens: str,
+    candidatos=POR_PAGINA_CANDIDATOS,
+    max_trabalhadores: int = 4,
+    checkpoint: str = None,
+):
+    """
+    Coleta todas as páginas de um endpoint paginado.
+
+    Args:
+        buscar_pagina (callable): Função (pagina, por_pagina) -> requests.Response.
+        chave_itens (str): Chave da lista de itens no JSON (ex.: 'combats').
+        candidatos (tuple, optional): Valores de `per_page`, do maior ao menor.
+        max_trabalhadores (int, optional): Requisições paralelas no fan-out.
+        checkpoint (str, optional): Nome do diário de progresso; se informado, a
+            coleta é retomável e o diário é removido ao terminar completa.
+
+    Returns:
+        tuple: (itens, relatorio), onde itens é a lista completa, na ordem das
+            páginas, e relatorio é um dict de cobertura com 'paginas_esperadas',
+            'paginas_obtidas', 'paginas_falhas', 'itens_esperados',
+            'itens_obtidos' e 'completo'.
+    """
+    por_pagina, primeira, dados = _sondar_primeira_pagina(
+        buscar_pagina, chave_itens, candidatos
+    )
+    relatorio = {
+        "por_pagina": por_pagina,
+        "paginas_esperadas": None,
+        "paginas_obtidas": 0,
+        "paginas_falhas": [],
+        "itens_esperados": None,
+        "itens_obtidos": 0,
+        "completo": False,
+    }
+    if por_pagina is None:
+        relatorio["paginas_falhas"].append(1)
+        return [], relatorio
+
+    meta = _extrair_metadados(dados)
+    # O servidor pode limitar o per_page pedido; vale o que ele informar/retornar
+    if meta["por_pagina"]:
+        por_pagina = int(meta["por_pagina"])
+    elif meta["total"] and len(primeira) < min(por_pagina, int(meta["total"])):
+        por_pagina = len(primeira) or por_pagina
+    elif primeira and len(primeira) < por_pagina:
+        # Sem metadados, a primeira página define o tamanho efetivo
+        por_pagina = len(primeira)
+    relatorio["por_pagina"] = por_pagina
+
+    total_paginas = meta["total_paginas"]
+    if total_paginas is None and meta["total"] is not None:
+        total_paginas = math.ceil(int(meta["total"]) / por_pagina)
+    relatorio["itens_esperados"] = meta["total"]
+
+    diario = None
+    if checkpoint:
+        diario = Checkpoint(
+            checkpoint, {"por_pagina": por_pagina, "total": meta["total"]}
+        )
+        if not diario.concluido(1):
+            diario.registrar(1, primeira)
+
+    def buscar(pagina):
+        """Página do diário, se já concluída; senão busca e registra."""
+        if diario and diario.concluido(pagina):
+            return diario.itens(pagina), None
+        itens, dados = _buscar_com_tentativas(
+            buscar_pagina, pagina, por_pagina, chave_itens
+        )
+        if diario and itens:
+            diario.registrar(pagina, itens)
+        return itens, dados
+
+    paginas = {1: primeira}
+    if total_paginas is not None:
+        # Fan-out paralelo das páginas restantes
+        total_paginas = int(total_paginas)
+        relatorio["paginas_esperadas"] = total_paginas
+        restantes = list(range(2, total_paginas + 1))
+        with ThreadPoolExecutor(max_workers=max(1, max_trabalhadores)) as executor:
+            resultados = executor.map(
+                lambda p: buscar(p)[0],
+                restantes,
+            )
+            for pagina, itens in zip(restantes, resultados):
+                if itens is None:
+                    relatorio["paginas_falhas"].append(pagina)
+                else:
+                    paginas[pagina] = itens
+    else:
+        # Sem total conhecido: sequencial até uma página vazia. Uma página curta
+        # não encerra a coleta, pois o servidor pode limitar o per_page sem avisar
+        pagina = 1
+        fim_observado = not primeira
+        while not fim_observado:
+            pagina += 1
+            itens, _ = buscar(pagina)
+            if itens is None:
+                relatorio["paginas_falhas"].append(pagina)
+                break
+            if not itens:
+                fim_observado = True
+                break
+            paginas[pagina] = itens
+        relatorio["paginas_esperadas"] = len(paginas) if fim_observado else None
+        relatorio["fim_observado"] = fim_observado
+
+    itens = [item for p in sorted(paginas) for item in paginas[p]]
+    relatorio["paginas_obtidas"] = len(paginas)
+    relatorio["itens_obtidos"] = len(itens)
+    relatorio["completo"] = (
+        not relatorio["paginas_falhas"]
+        and relatorio.get("fim_observado", True)
+        and (
+            relatorio["itens_esperados"] is None
+            or len(itens) >= int(relatorio["itens_esperados"])
+        )
+    )
+
+    if diario and relatorio["completo"]:
+        diario.finalizar()
+
+    incrementar("api_paginas", len(paginas), endpoint=chave_itens)
+    if not relatorio["completo"]:
+        incrementar(
+            "api_paginas_faltantes",
+            len(relatorio["paginas_falhas"]) or 1,
+            endpoint=chave_itens,
+        )
+        print(
+            f"⚠️ Cobertura incompleta em '{chave_itens}': "
+            f"{relatorio['itens_obtidos']} de {relatorio['itens_esperados'] or '?'} itens; "
+            f"páginas com falha: {relatorio['paginas_falhas'] or 'nenhuma'}."
+        )
+    registrar_evento("paginacao_concluida", endpoint=chave_itens, **relatorio)
+    return itens, relatorio
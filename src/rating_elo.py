@@ -0,0 +1,310 @@
+"""
+Rating Elo - Força dos Pokémon Ajustada pelo Oponente
+
+Calcula um rating Elo por Pokémon consumindo os combates em uma única
+passada, com trabalho O(1) por combate: vencer um oponente forte rende mais
+pontos do que vencer um fraco, ao contrário de `Taxa_Vitoria(%)`.
+
+- O estado fica em arrays NumPy indexados pelo ID do Pokémon (rating,
+  lutas e vitórias), crescendo apenas se aparecer um ID maior.
+- Os combates chegam em lotes (`ler_sql_em_lotes` sobre a tabela `combates`,
+  na ordem do feed dada pela coluna `ordem_carga` gravada pela etapa load, ou
+  qualquer iterável de DataFrames, como a saída da coleta); contagens são
+  somadas por lote com `np.add.at` e só a atualização do rating, que depende
+  da ordem, percorre os combates um a um.
+- O estado é salvo em 'out/rating_elo.npz' junto com o número de combates
+  consumidos e o hash SHA-256 desse prefixo. Na próxima execução o prefixo é
+  apenas re-hasheado (vetorizado) e só os combates novos entram no cálculo;
+  se o prefixo mudou (ou os parâmetros), o rating é recalculado do zero.
+- O resultado é gravado na tabela `ratings_elo` (ID, Pokemon, Rating,
+  Lutas, Vitorias, Posicao), usada pelo ranking do dashboard.
+
+Variáveis de ambiente:
+    ELO_RATING_INICIAL: Rating de um Pokémon sem lutas (padrão: 1500)
+    ELO_FATOR_K: Pontos em jogo por combate (padrão: 32)
+"""
+
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from checkpoint import gravar_atomico
+from instrumentacao import medir, incrementar
+
+RATING_INICIAL = float(os.getenv("ELO_RATING_INICIAL", "1500"))
+FATOR_K = float(os.getenv("ELO_FATOR_K", "32"))
+ARQUIVO_ESTADO = "out/rating_elo.npz"
+TABELA_RATINGS = "ratings_elo"
+COLUNAS = ["first_pokemon", "second_pokemon", "winner"]
+
+
+# ------------------ Estado ------------------ #
+
+
+class EstadoElo:
+    """
+    Ratings, lutas e vitórias por ID, mais o prefixo de combates já consumido.
+
+    Args:
+        tamanho (int, optional): Maior ID esperado + 1 (o estado cresce se preciso).
+        rating_inicial (float, optional): Rating de quem ainda não lutou.
+        fator_k (float, optional): Pontos em jogo por combate.
+    """
+
+    def __init__(
+        self,
+        tamanho: int = 0,
+        rating_inicial: float = RATING_INICIAL,
+        fator_k: float = FATOR_K,
+    ):
+        self.rating_inicial = float(rating_inicial)
+        self.fator_k = float(fator_k)
+        self.ratings = np.full(tamanho, self.rating_inicial, dtype=np.float64)
+        self.lutas = np.zeros(tamanho, dtype=np.int32)
+        self.vitorias = np.zeros(tamanho, dtype=np.int32)
+        self.processados = 0
+        self.digest = hashlib.sha256().hexdigest()  # hash do prefixo consumido
+        self._hash = hashlib.sha256()  # hash em andamento durante `consumir`
+
+    def _garantir_tamanho(self, maior_id: int):
+        """Estende os arrays para comportar `maior_id`."""
+        faltam = maior_id + 1 - len(self.ratings)
+        if faltam > 0:
+            self.ratings = np.concatenate(
+                [self.ratings, np.full(faltam, self.rating_inicial)]
+            )
+            self.lutas = np.concatenate([self.lutas, np.zeros(faltam, np.int32)])
+            self.vitorias = np.concatenate([self.vitorias, np.zeros(faltam, np.int32)])
+
+    @staticmethod
+    def _matriz(lote: pd.DataFrame) -> np.ndarray:
+        """Combates do lote como matriz int32 contígua (first, second, winner)."""
+        return np.ascontiguousarray(lote[COLUNAS].to_numpy(dtype=np.int32))
+
+    def aplicar(self, lote: pd.DataFrame):
+        """
+        Incorpora um lote de combates, na ordem em que aparecem.
+
+        Combates inválidos (Pokémon contra si mesmo ou vencedor que não lutou)
+        são contados em `elo_combates_ignorados` e não alteram o estado.
+
+        Args:
+            lote (pd.DataFrame): Colunas first_pokemon, second_pokemon e winner.
+        """
+        combates = self._matriz(lote)
+        self._hash.update(combates.tobytes())
+        self.processados += len(combates)
+
+        first, second, winner = combates.T
+        validos = (first != second) & ((winner == first) | (winner == second))
+        if not validos.all():
+            incrementar("elo_combates_ignorados", int((~validos).sum()))
+            first, second, winner = first[validos], second[validos], winner[validos]
+        if not len(first):
+            return
+        self._garantir_tamanho(int(max(first.max(), second.max())))
+
+        # Contagens não dependem da ordem: uma operação vetorizada por lote
+        np.add.at(self.lutas, first, 1)
+        np.add.at(self.lutas, second, 1)
+        np.add.at(self.vitorias, winner, 1)
+
+        # O rating depende da ordem: um passo O(1) por combate sobre uma lista
+        # (indexar listas é bem mais rápido do que escalares NumPy)
+        ratings = self.ratings.tolist()
+        k = self.fator_k
+        for a, b, venceu_a in zip(
+            first.tolist(), second.tolist(), (winner == first).tolist()
+        ):
+            esperado_a = 1.0 / (1.0 + 10.0 ** ((ratings[b] - ratings[a]) / 400.0))
+            delta = k * (venceu_a - esperado_a)
+            ratings[a] += delta
+            ratings[b] -= delta
+        self.ratings = np.asarray(ratings, dtype=np.float64)
+
+    def consumir(self, lotes):
+        """
+        Passa os lotes pelo estado, verificando o prefixo já consumido.
+
+        As primeiras `processados` linhas são apenas re-hasheadas; se o hash
+        coincidir com o salvo, as linhas seguintes são incorporadas.
+
+        Args:
+            lotes (iterable[pd.DataFrame]): Combates, na ordem da fonte.
+
+        Returns:
+            int ou None: Combates novos incorporados, ou None se o prefixo não
+                confere (o estado fica inválido e o cálculo deve recomeçar).
+        """
+        prefixo, digest = self.processados, self.digest
+        self._hash = hashlib.sha256()
+        verificados = 0
+        for lote in lotes:
+            if verificados < prefixo:
+                trecho = self._matriz(lote.iloc[: prefixo - verificados])
+                self._hash.update(trecho.tobytes())
+                verificados += len(trecho)
+                if verificados < prefixo:
+                    continue
+                if self._hash.hexdigest() != digest:
+                    return None
+                lote = lote.iloc[len(trecho) :]
+            if len(lote):
+                self.aplicar(lote)
+        if verificados < prefixo:
+            return None  # a fonte encolheu
+        self.digest = self._hash.hexdigest()
+        return self.processados - prefixo
+
+    # ---------- Persistência ---------- #
+
+    def salvar(self, caminho: str = ARQUIVO_ESTADO):
+        """
+        Grava o estado de forma atômica em um .npz.
+
+        Args:
+            caminho (str, optional): Arquivo de destino.
+        """
+        with gravar_atomico(caminho, "wb") as arquivo:
+            np.savez(
+                arquivo,
+                ratings=self.ratings,
+                lutas=self.lutas,
+                vitorias=self.vitorias,
+                processados=np.array(self.processados),
+                digest=np.array(self.digest),
+                parametros=np.array([self.rating_inicial, self.fator_k]),
+            )
+
+    @classmethod
+    def carregar(cls, caminho: str = ARQUIVO_ESTADO, **parametros):
+        """
+        Lê o estado salvo, se existir e tiver os mesmos parâmetros.
+
+        Args:
+            caminho (str, optional): Arquivo gerado por `salvar`.
+            **parametros: rating_inicial e fator_k desejados.
+
+        Returns:
+            EstadoElo: Estado salvo, ou um estado vazio.
+        """
+        novo = cls(**parametros)
+        if not os.path.exists(caminho):
+            return novo
+        with np.load(caminho, allow_pickle=False) as dados:
+            if dados["parametros"].tolist() != [novo.rating_inicial, novo.fator_k]:
+                print("⚠️ Estado do Elo com outros parâmetros; recalculando.")
+                return novo
+            novo.ratings = dados["ratings"].astype(np.float64)
+            novo.lutas = dados["lutas"].astype(np.int32)
+            novo.vitorias = dados["vitorias"].astype(np.int32)
+            novo.processados = int(dados["processados"])
+            novo.digest = str(dados["digest"])
+        return novo
+
+
+# ------------------ Cálculo ------------------ #
+
+
+def consulta_combates() -> str:
+    """
+    SELECT dos combates na ordem do feed.
+
+    Sem ORDER BY o banco não garante a mesma ordem entre execuções (varreduras
+    paralelas ou sincronizadas, tabela regravada) e o prefixo salvo deixaria
+    de conferir, recalculando tudo. Tabelas sem COLUNA_ORDEM_CARGA (carregadas
+    antes dela ou direto do CSV) são lidas na ordem física, com aviso.
+
+    Returns:
+        str: Consulta para `ler_sql_em_lotes`.
+    """
+    from backend_analitico import ler_sql
+    from tratamento_dados import COLUNA_ORDEM_CARGA
+
+    consulta = f"SELECT {', '.join(COLUNAS)} FROM combates"
+    colunas = ler_sql("SELECT * FROM combates LIMIT 0").columns
+    if COLUNA_ORDEM_CARGA in colunas:
+        return f"{consulta} ORDER BY {COLUNA_ORDEM_CARGA}"
+    print(
+        f"⚠️ combates sem a coluna {COLUNA_ORDEM_CARGA}: ordem não garantida; "
+        "rode a etapa load para o Elo incremental."
+    )
+    return consulta
+
+
+@medir("elo.atualizar_ratings")
+def atualizar_ratings(
+    fonte=None,
+    caminho: str = ARQUIVO_ESTADO,
+    recalcular: bool = False,
+    salvar: bool = True,
+) -> pd.DataFrame:
+    """
+    Atualiza o rating Elo incorporando apenas os combates novos.
+
+    Args:
+        fonte (callable, optional): Função sem argumentos que devolve um novo
+            iterável de lotes de combates. Padrão: tabela `combates` do
+            backend analítico, lida em lotes.
+        caminho (str, optional): Arquivo do estado.
+        recalcular (bool, optional): Ignora o estado salvo.
+        salvar (bool, optional): Grava o estado e a tabela `ratings_elo`.
+
+    Returns:
+        pd.DataFrame: Ranking (ver `tabela_ratings`).
+    """
+    from backend_analitico import ler_sql, ler_sql_em_lotes, escrever_tabela
+
+    if fonte is None:
+        consulta = consulta_combates()
+
+        def fonte():
+            return ler_sql_em_lotes(consulta)
+
+    estado = EstadoElo() if recalcular else EstadoElo.carregar(caminho)
+    retomado = estado.processados
+    novos = estado.consumir(fonte())
+    if novos is None:
+        print("⚠️ Combates já processados mudaram; recalculando o Elo do zero.")
+        estado, retomado = EstadoElo(), 0
+        novos = estado.consumir(fonte())
+    incrementar("elo_combates_processados", novos)
+    print(
+        f"✅ Elo atualizado: {novos} combates novos"
+        + (f" ({retomado} retomados do estado salvo)." if retomado else ".")
+    )
+
+    nomes = ler_sql('SELECT "ID", "Nome" FROM atributos_pokemon')
+    ranking = tabela_ratings(estado, nomes)
+    if salvar:
+        estado.salvar(caminho)
+        escrever_tabela(ranking, TABELA_RATINGS)
+    return ranking
+
+
+def tabela_ratings(estado: EstadoElo, df_nomes: pd.DataFrame) -> pd.DataFrame:
+    """
+    Monta o ranking dos Pokémon que já lutaram.
+
+    Args:
+        estado (EstadoElo): Estado atualizado.
+        df_nomes (pd.DataFrame): Colunas ID e Nome.
+
+    Returns:
+        pd.DataFrame: ID, Pokemon, Rating, Lutas, Vitorias e Posicao,
+            ordenado do maior para o menor rating.
+    """
+    ids = np.flatnonzero(estado.lutas)
+    ranking = pd.DataFrame(
+        {
+            "ID": ids,
+            "Rating": estado.ratings[ids].round(1),
+            "Lutas": estado.lutas[ids],
+            "Vitorias": estado.vitorias[ids],
+        }
+    )
+    nomes = df_nomes.drop_duplicates("ID").set_index("ID")["Nome"]
+    ranking.insert(1, "Pokemon", ranking["ID"].map(nomes))
+    ranking = ranking.sort_values(["Rating", "ID"], ascending=[False, True])
+    ranking["Posicao"] = np.arange(1, len(ranking) + 1)
+    return ranking.reset_index(drop=True)
@@ -0,0 +1,202 @@
+"""
+Resumo Pré-Agregado do Dashboard
+
+Este módulo materializa, em um único blob JSON compacto, todos os números de
+que o dashboard precisa: top 10 vencedores e derrotados, comparativo de
+atributos, valores do radar, médias gerais e agregados por geração, tipo e
+status lendário.
+
+O resumo é gravado na tabela `resumo_dashboard` (uma linha) do backend
+analítico e em 'out/resumo_dashboard.json', de modo que o dashboard e o
+relatório HTML renderizam a partir de uma única leitura pequena, sem
+recarregar `atributos_pokemon` nem recalcular médias.
+"""
+
+import hashlib
+import json
+import os
+import pandas as pd
+from backend_analitico import ler_sql, escrever_tabela
+from instrumentacao import medir
+
+ATRIBUTOS = ["Hp", "Attack", "Defense", "Sp_attack", "Sp_defense", "Speed"]
+TABELA_RESUMO = "resumo_dashboard"
+ARQUIVO_RESUMO = "out/resumo_dashboard.json"
+SEPARADOR_TIPOS = r"\s*[/,]\s*"  # a API mistura 'Grass/Poison' e 'Bug, Flying'
+
+
+# ------------------ Normalização ------------------ #
+
+
+def normalizar_atributos(df_attr: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normaliza colunas categóricas da tabela de atributos para agregação.
+
+    - Generation: extrai o número (ex.: 'Gen2' -> 2)
+    - Legendary: converte 'true'/'false' em booleano
+    - Atributos numéricos: converte para número (valores inválidos viram NaN)
+
+    Args:
+        df_attr (pd.DataFrame): Tabela `atributos_pokemon`.
+
+    Retorna:
+        pd.DataFrame: Cópia normalizada.
+    """
+    df = df_attr.copy()
+    for coluna in ATRIBUTOS:
+        if coluna in df.columns:
+            df[coluna] = pd.to_numeric(df[coluna], errors="coerce")
+    if "Generation" in df.columns:
+        df["Generation"] = pd.to_numeric(
+            df["Generation"].astype(str).str.extract(r"(\d+)", expand=False),
+            errors="coerce",
+        ).astype("Int64")
+    if "Legendary" in df.columns:
+        df["Legendary"] = (
+            df["Legendary"].astype(str).str.strip().str.lower().isin(["true", "1"])
+        )
+    return df
+
+
+def _registros(df: pd.DataFrame) -> list:
+    """Converte um DataFrame em lista de dicionários serializáveis em JSON."""
+    return json.loads(df.to_json(orient="records", force_ascii=False))
+
+
+def _agregar(df: pd.DataFrame, chave: str) -> list:
+    """Quantidade e médias dos atributos agrupadas por `chave`."""
+    agregado = df.groupby(chave, dropna=True)[ATRIBUTOS].mean().round(2)
+    agregado.insert(0, "Quantidade", df.groupby(chave, dropna=True).size())
+    return _registros(agregado.reset_index())
+
+
+# ------------------ Geração ------------------ #
+
+
+@medir("resumo.gerar_resumo")
+def gerar_resumo(
+    df_attr: pd.DataFrame,
+    top10_vitorias: pd.DataFrame,
+    top10_derrotas: pd.DataFrame,
+    df_top10_attr: pd.DataFrame,
+    comparativo: pd.DataFrame,
+    segmentos: dict = None,
+) -> dict:
+    """
+    Calcula o resumo completo do dashboard a partir das tabelas já analisadas.
+
+    Args:
+        df_attr (pd.DataFrame): Atributos de todos os Pokémon.
+        top10_vitorias (pd.DataFrame): Top 10 vencedores.
+        top10_derrotas (pd.DataFrame): Top 10 derrotados.
+        df_top10_attr (pd.DataFrame): Atributos dos top 10 vencedores.
+        comparativo (pd.DataFrame): Comparativo Top 10 vs Média Geral.
+        segmentos (dict, optional): Resultado de `analise_paralela.estatisticas_segmentos`;
+            se informado, as taxas de vitória por segmento entram em 'taxa_vitoria'.
+
+    Retorna:
+        dict: Resumo serializável em JSON, com chave 'versao' (hash do conteúdo).
+    """
+    colunas_radar = list(df_top10_attr.select_dtypes(include="number").columns)
+    media_geral = df_attr[colunas_radar].apply(pd.to_numeric, errors="coerce").mean()
+
+    df_norm = normalizar_atributos(df_attr)
+    df_tipos = df_norm.assign(
+        Tipo=df_norm["Types"].astype(str).str.split(SEPARADOR_TIPOS, regex=True)
+    ).explode("Tipo")
+
+    resumo = {
+        "medias_gerais": _registros(df_norm[ATRIBUTOS].mean().round(2).to_frame().T)[0],
+        "por_geracao": _agregar(df_norm, "Generation"),
+        "por_tipo": _agregar(df_tipos, "Tipo"),
+        "por_lendario": _agregar(df_norm, "Legendary"),
+        "top10_vitorias": _registros(top10_vitorias),
+        "top10_derrotas": _registros(top10_derrotas),
+        "comparativo": _registros(comparativo),
+        "atributos_top10": _registros(df_top10_attr),
+        "radar": {
+            "atributos": colunas_radar,
+            "media_geral": media_geral.round(2).tolist(),
+        },
+    }
+    if segmentos is not None:
+        resumo["taxa_vitoria"] = {
+            chave.removeprefix("por_"): _registros(tabela)
+            for chave, tabela in segmentos.items()
+            if chave.startswith("por_")
+        }
+    conteudo = json.dumps(resumo, ensure_ascii=False, sort_keys=True)
+    resumo["versao"] = hashlib.sha256(conteudo.encode("utf-8")).hexdigest()[:16]
+    resumo["gerado_em"] = pd.Timestamp.utcnow().isoformat()
+    return resumo
+
+
+# ------------------ Persistência ------------------ #
+
+
+@medir("resumo.salvar_resumo")
+def salvar_resumo(resumo: dict):
+    """
+    Grava o resumo na tabela `resumo_dashboard` e em 'out/resumo_dashboard.json'.
+
+    Args:
+        resumo (dict): Resumo gerado por `gerar_resumo`.
+    """
+    conteudo = json.dumps(resumo, ensure_ascii=False)
+    escrever_tabela(
+        pd.DataFrame(
+            [
+                {
+                    "versao": resumo["versao"],
+                    "gerado_em": resumo["gerado_em"],
+                    "conteudo": conteudo,
+                }
+            ]
+        ),
+        TABELA_RESUMO,
+    )
+
+    os.makedirs(os.path.dirname(ARQUIVO_RESUMO), exist_ok=True)
+    with open(ARQUIVO_RESUMO, "w", encoding="utf-8") as f:
+        f.write(conteudo)
+    print(f"✅ Resumo do dashboard salvo (versão {resumo['versao']}).")
+
+
+@medir("resumo.carregar_resumo")
+def carregar_resumo():
+    """
+    Lê o resumo do dashboard com uma única consulta pequena.
+
+    Retorna:
+        dict ou None: Resumo, ou None se ainda não foi gerado.
+    """
+    try:
+        df = ler_sql(f"SELECT conteudo FROM {TABELA_RESUMO}")
+    except Exception:
+        return None
+    if df.empty:
+        return None
+    return json.loads(df["conteudo"].iloc[0])
+
+
+def resumo_para_dataframes(resumo: dict):
+    """
+    Converte o resumo nas estruturas usadas pelas tabelas e gráficos.
+
+    Args:
+        resumo (dict): Resumo gerado por `gerar_resumo`.
+
+    Retorna:
+        tuple: (top10_vitorias, top10_derrotas, df_top10_attr, comparativo, media_geral),
+            onde media_geral é uma pd.Series indexada pelos atributos do radar.
+    """
+    media_geral = pd.Series(
+        resumo["radar"]["media_geral"], index=resumo["radar"]["atributos"]
+    )
+    return (
+        pd.DataFrame(resumo["top10_vitorias"]),
+        pd.DataFrame(resumo["top10_derrotas"]),
+        pd.DataFrame(resumo["atributos_top10"]),
+        pd.DataFrame(resumo["comparativo"]),
+        media_geral,
+    )
@@ -0,0 +1,307 @@
+"""
+Serviço de Atualização - Pipeline Agendado com Estado Aquecido
+
+Executa o pipeline (ingest -> load -> analyze -> report) em um processo de
+longa duração, em vez de uma execução a frio por chamada do cron:
+
+- Estado mantido entre ciclos: módulos importados, sessão HTTP (keep-alive)
+  e token JWT (`GerenciadorToken`), engines/pools de banco (`banco_conexao`)
+  e o resumo do dashboard mais recente em memória.
+- Agenda com intervalo configurável e jitter aleatório, evitando que várias
+  instâncias consultem a API no mesmo instante.
+- Ciclos sem mudança são pulados: uma sondagem barata (`Last-Modified` e
+  totais de /pokemon e /combats) é comparada com a do último ciclo; se a API
+  não informar esses sinais, a coleta roda e a carga/análise só acontecem se
+  o conteúdo dos CSVs mudou.
+- Endpoint HTTP local: GET /saude, GET /status (tempos do último ciclo) e
+  GET /resumo (resumo em memória).
+
+Uso:
+    python src/main.py serve
+    python src/servico.py
+
+Variáveis de ambiente:
+    SERVICO_INTERVALO_S: Intervalo entre ciclos em segundos (padrão: 3600)
+    SERVICO_JITTER: Variação relativa do intervalo, 0 a 1 (padrão: 0.1)
+    SERVICO_HOST / SERVICO_PORTA: Endereço do endpoint (padrão: 127.0.0.1:8089)
+"""
+
+import hashlib
+import json
+import os
+import random
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from instrumentacao import (
+    registrar_evento,
+    exportar_metricas,
+    reiniciar_metricas,
+    incrementar,
+)
+
+INTERVALO_S = float(os.getenv("SERVICO_INTERVALO_S", "3600"))
+JITTER = float(os.getenv("SERVICO_JITTER", "0.1"))
+HOST = os.getenv("SERVICO_HOST", "127.0.0.1")
+PORTA = int(os.getenv("SERVICO_PORTA", "8089"))
+DATASETS = ("pokemons", "atributos_pokemon", "combates")
+
+
+# ------------------ Detecção de Mudanças ------------------ #
+
+
+def impressao_digital_api(gerenciador) -> str:
+    """
+    Resume o estado da API com uma requisição pequena por endpoint.
+
+    A primeira página e os totais não bastam: os atributos vêm de
+    /pokemon/{id} e combates podem mudar além da primeira página sem alterar
+    os totais. Por isso a sondagem só é confiável quando o servidor informa
+    `Last-Modified` nas coleções /pokemon (que cobre /pokemon/{id}) e /combats;
+    sem esse cabeçalho ela retorna None e o ciclo sempre coleta, decidindo
+    carga e análise pela impressão digital dos CSVs.
+
+    Args:
+        gerenciador (GerenciadorToken): Gerenciador de token (com sessão HTTP).
+
+    Returns:
+        str ou None: Hash de `Last-Modified` e dos totais de cada coleção, ou
+            None se algum endpoint não os informar (mudança indetectável).
+    """
+    from decodificacao import resposta_json
+    from obtencao_dados import POKEMON_URL, COMBATE_URL, registrar_resposta
+    from paginacao import _extrair_metadados
+
+    partes = []
+    for nome, url in (("pokemon", POKEMON_URL), ("combates", COMBATE_URL)):
+        response = gerenciador.get(f"{url}?page=1&per_page=1", timeout=10)
+        registrar_resposta(response, f"sondagem_{nome}")
+        response.raise_for_status()
+        modificado = response.headers.get("Last-Modified")
+        dados = resposta_json(response)
+        total = _extrair_metadados(dados)["total"] if isinstance(dados, dict) else None
+        if modificado is None or total is None:
+            return None
+        partes.append(json.dumps([nome, modificado, total], default=str))
+    return hashlib.sha256("|".join(partes).encode("utf-8")).hexdigest()
+
+
+def impressao_digital_csvs(pasta: str = "out") -> str:
+    """
+    Hash do conteúdo dos CSVs coletados.
+
+    Args:
+        pasta (str, optional): Diretório dos CSVs.
+
+    Returns:
+        str: Hash SHA-256 dos arquivos de DATASETS (ausentes contam como vazios).
+    """
+    from escrita_csv import caminho_csv
+
+    resumo = hashlib.sha256()
+    for nome in DATASETS:
+        caminho = caminho_csv(nome, pasta)
+        resumo.update(nome.encode("utf-8"))
+        if os.path.exists(caminho):
+            with open(caminho, "rb") as arquivo:
+                for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+                    resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+# ------------------ Serviço ------------------ #
+
+
+class ServicoAtualizacao:
+    """
+    Executa o pipeline periodicamente, mantendo o estado aquecido entre ciclos.
+
+    Args:
+        intervalo_s (float, optional): Intervalo nominal entre ciclos.
+        jitter (float, optional): Variação relativa do intervalo (0 a 1).
+    """
+
+    def __init__(self, intervalo_s: float = INTERVALO_S, jitter: float = JITTER):
+        import requests
+        from obtencao_dados import criar_gerenciador_token
+
+        self.intervalo_s = intervalo_s
+        self.jitter = jitter
+        self.sessao = requests.Session()
+        self.token = criar_gerenciador_token(sessao=self.sessao)
+        self.resumo = None
+        self._parar = threading.Event()
+        self._lock = threading.Lock()
+        self._impressao_api = None
+        self._impressao_csvs = impressao_digital_csvs()
+        self._estado = {
+            "estado": "iniciando",
+            "iniciado_em": time.time(),
+            "ciclos": 0,
+            "ultimo_ciclo": None,
+            "proximo_ciclo_em": None,
+        }
+
+    # ---------- Ciclo ---------- #
+
+    def _etapa(self, nome: str, funcao, tempos: dict):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos[nome] = round(time.perf_counter() - inicio, 3)
+        return resultado
+
+    def executar_ciclo(self) -> dict:
+        """
+        Executa um ciclo completo, pulando etapas quando nada mudou.
+
+        Returns:
+            dict: Resultado do ciclo ('resultado', 'motivo', 'tempos_s', ...).
+        """
+        import main
+
+        reiniciar_metricas()
+        with self._lock:
+            self._estado["estado"] = "executando"
+        ciclo = {"inicio": time.time(), "tempos_s": {}}
+        tempos = ciclo["tempos_s"]
+        try:
+            impressao = self._etapa(
+                "sondagem", lambda: impressao_digital_api(self.token), tempos
+            )
+            if impressao is not None and impressao == self._impressao_api:
+                ciclo.update(resultado="ignorado", motivo="API sem alterações")
+            else:
+                self._etapa("ingest", lambda: main.ingest(self.token), tempos)
+                impressao_csvs = impressao_digital_csvs()
+                if impressao_csvs == self._impressao_csvs and self.resumo is not None:
+                    ciclo.update(resultado="ignorado", motivo="CSVs sem alterações")
+                else:
+                    self._etapa("load", main.load, tempos)
+                    self._etapa("analyze", main.analyze, tempos)
+                    self._etapa("report", main.report, tempos)
+                    self._atualizar_resumo()
+                    self._impressao_csvs = impressao_csvs
+                    ciclo.update(resultado="concluido")
+                self._impressao_api = impressao
+        except Exception as erro:  # o serviço continua no próximo ciclo
+            ciclo.update(resultado="falha", motivo=f"{type(erro).__name__}: {erro}")
+            print(f"❌ Ciclo falhou: {ciclo['motivo']}")
+        ciclo["duracao_s"] = round(time.time() - ciclo["inicio"], 3)
+
+        incrementar("servico_ciclos", resultado=ciclo["resultado"])
+        registrar_evento("servico_ciclo", **ciclo)
+        exportar_metricas()
+        with self._lock:
+            self._estado["ciclos"] += 1
+            self._estado["ultimo_ciclo"] = ciclo
+            self._estado["estado"] = "ocioso"
+        print(
+            f"🔁 Ciclo {ciclo['resultado']} em {ciclo['duracao_s']:.1f}s"
+            + (f" ({ciclo['motivo']})" if ciclo.get("motivo") else "")
+        )
+        return ciclo
+
+    def _atualizar_resumo(self):
+        """Mantém em memória o resumo recém-calculado (uma leitura pequena)."""
+        from resumo_dashboard import carregar_resumo
+
+        self.resumo = carregar_resumo()
+
+    def proxima_espera(self) -> float:
+        """Intervalo até o próximo ciclo, com jitter uniforme."""
+        return max(
+            0.0, self.intervalo_s * (1 + random.uniform(-self.jitter, self.jitter))
+        )
+
+    # ---------- Status ---------- #
+
+    def status(self) -> dict:
+        """
+        Estado atual do serviço.
+
+        Returns:
+            dict: Estado, ciclos executados, último ciclo (com tempos por etapa),
+                horário do próximo ciclo e versão do resumo em memória.
+        """
+        with self._lock:
+            status = json.loads(json.dumps(self._estado, default=str))
+        status["versao_resumo"] = (self.resumo or {}).get("versao")
+        return status
+
+    def iniciar_http(self, host: str = HOST, porta: int = PORTA):
+        """
+        Inicia o endpoint HTTP de saúde/status em uma thread daemon.
+
+        Returns:
+            ThreadingHTTPServer: Servidor iniciado.
+        """
+        servico = self
+
+        class Manipulador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/saude":
+                    ultimo = servico.status()["ultimo_ciclo"] or {}
+                    falhou = ultimo.get("resultado") == "falha"
+                    corpo, codigo = {"ok": not falhou}, 503 if falhou else 200
+                elif self.path == "/status":
+                    corpo, codigo = servico.status(), 200
+                elif self.path == "/resumo" and servico.resumo is not None:
+                    corpo, codigo = servico.resumo, 200
+                else:
+                    corpo, codigo = {"erro": "não encontrado"}, 404
+                dados = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+                self.send_response(codigo)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def log_message(self, *args):
+                pass  # sem log por requisição
+
+        servidor = ThreadingHTTPServer((host, porta), Manipulador)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        print(f"🩺 Status em http://{host}:{servidor.server_address[1]}/status")
+        return servidor
+
+    # ---------- Execução ---------- #
+
+    def parar(self, *_):
+        """Pede o encerramento após o ciclo em andamento."""
+        self._parar.set()
+
+    def executar(self, ciclos: int = None):
+        """
+        Laço principal: executa um ciclo e aguarda o próximo, até `parar()`.
+
+        Args:
+            ciclos (int, optional): Número máximo de ciclos (padrão: sem limite).
+        """
+        executados = 0
+        while not self._parar.is_set():
+            self.executar_ciclo()
+            executados += 1
+            if ciclos is not None and executados >= ciclos:
+                break
+            espera = self.proxima_espera()
+            with self._lock:
+                self._estado["proximo_ciclo_em"] = time.time() + espera
+            self._parar.wait(espera)
+        print("👋 Serviço encerrado.")
+
+
+def main():
+    """Inicia o serviço com endpoint HTTP e encerramento por SIGINT/SIGTERM."""
+    servico = ServicoAtualizacao()
+    signal.signal(signal.SIGTERM, servico.parar)
+    signal.signal(signal.SIGINT, servico.parar)
+    servidor = servico.iniciar_http()
+    try:
+        servico.executar()
+    finally:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
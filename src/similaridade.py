@@ -0,0 +1,279 @@
+"""
+Índice de Similaridade - Vizinhos Mais Próximos por Atributos
+
+Este módulo pré-computa, uma vez por versão dos dados, os Pokémon mais
+parecidos entre si pelos seis atributos de combate (Hp, Attack, Defense,
+Sp_attack, Sp_defense e Speed):
+
+- Cada atributo é padronizado (z-score), para que nenhum domine a distância
+  só por ter escala maior; valores ausentes ficam na média.
+- A matriz de distâncias euclidianas é calculada de forma vetorizada, em
+  blocos de linhas (||a||² + ||b||² - 2·a·b com um produto de matrizes), e
+  apenas os VIZINHOS mais próximos de cada Pokémon são guardados
+  (`np.argpartition` por linha), sem manter a matriz N x N.
+- "Mais parecidos com X" e "contrapartes dos top 10" viram fatias de arrays
+  já ordenados; pedidos maiores que VIZINHOS calculam uma única linha.
+
+O índice é persistido em 'out/indice_similaridade.npz' pela etapa `analyze`.
+
+Variáveis de ambiente:
+    SIMILARIDADE_VIZINHOS: Vizinhos pré-computados por Pokémon (padrão: 20)
+"""
+
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from checkpoint import gravar_atomico
+from instrumentacao import medir
+from resumo_dashboard import ATRIBUTOS
+
+ARQUIVO_INDICE = "out/indice_similaridade.npz"
+VIZINHOS = int(os.getenv("SIMILARIDADE_VIZINHOS", "20"))
+TAMANHO_BLOCO = 2048  # linhas da matriz de distâncias calculadas por vez
+
+
+# ------------------ Estrutura de Consulta ------------------ #
+
+
+class IndiceSimilaridade:
+    """
+    Vizinhos mais próximos de cada Pokémon, em memória.
+
+    Args:
+        ids (array-like): IDs, na ordem das linhas.
+        nomes (array-like): Nomes, na mesma ordem.
+        vetores (np.ndarray): Atributos padronizados (N x 6).
+        vizinhos (np.ndarray): Posições dos vizinhos por linha (N x K),
+            do mais próximo ao mais distante.
+        distancias (np.ndarray): Distâncias correspondentes (N x K).
+        versao (str): Hash dos vetores (muda quando os atributos mudam).
+    """
+
+    def __init__(self, ids, nomes, vetores, vizinhos, distancias, versao):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.nomes = [str(n) for n in nomes]
+        self.vetores = np.asarray(vetores, dtype=np.float64)
+        self.vizinhos = np.asarray(vizinhos, dtype=np.int32)
+        self.distancias = np.asarray(distancias, dtype=np.float32)
+        self.versao = str(versao)
+
+        self._posicao = dict(zip(self.ids.tolist(), range(len(self.ids))))
+        self._id_por_nome = dict(zip(self.nomes, self.ids.tolist()))
+
+    def id_por_nome(self, nome: str):
+        """Retorna o ID de um Pokémon pelo nome, ou None se não existir."""
+        return self._id_por_nome.get(nome)
+
+    def vizinhos_de(self, pokemon_id: int, k: int = 10) -> tuple:
+        """
+        Os `k` Pokémon mais parecidos com `pokemon_id` (ele mesmo excluído).
+
+        Args:
+            pokemon_id (int): ID de referência.
+            k (int, optional): Quantidade de vizinhos.
+
+        Returns:
+            tuple: (ids, distâncias) como arrays NumPy, do mais próximo ao mais
+                distante; vazios se o ID não estiver no índice.
+        """
+        posicao = self._posicao.get(int(pokemon_id))
+        if posicao is None:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        if k <= self.vizinhos.shape[1]:
+            return (
+                self.ids[self.vizinhos[posicao, :k]],
+                self.distancias[posicao, :k],
+            )
+
+        # Além do pré-computado: uma linha da matriz, O(N)
+        distancias = np.sqrt(((self.vetores - self.vetores[posicao]) ** 2).sum(axis=1))
+        distancias[posicao] = np.inf
+        k = min(k, len(distancias) - 1)
+        mais_proximos = (
+            np.argpartition(distancias, k - 1)[:k] if k > 0 else np.array([], int)
+        )
+        mais_proximos = mais_proximos[np.argsort(distancias[mais_proximos])]
+        return self.ids[mais_proximos], distancias[mais_proximos].astype(np.float32)
+
+    def similares(self, pokemon_id: int, k: int = 10) -> pd.DataFrame:
+        """
+        Tabela dos Pokémon mais parecidos com `pokemon_id`.
+
+        Args:
+            pokemon_id (int): ID de referência.
+            k (int, optional): Quantidade de vizinhos.
+
+        Returns:
+            pd.DataFrame: ID, Pokemon e Distancia (em desvios-padrão).
+        """
+        ids, distancias = self.vizinhos_de(pokemon_id, k)
+        return pd.DataFrame(
+            {
+                "ID": ids,
+                "Pokemon": [self.nomes[self._posicao[i]] for i in ids.tolist()],
+                "Distancia": distancias.astype(np.float64).round(3),
+            }
+        )
+
+    def contrapartes(self, pokemon_ids, k: int = 3) -> pd.DataFrame:
+        """
+        Os `k` Pokémon mais parecidos com cada um dos `pokemon_ids`
+        (ex.: contrapartes dos top 10 vencedores).
+
+        Args:
+            pokemon_ids (iterable[int]): IDs de referência (ausentes são ignorados).
+            k (int, optional): Vizinhos por Pokémon.
+
+        Returns:
+            pd.DataFrame: Pokemon, Posicao (1 = mais parecido), Contraparte,
+                ID_Contraparte e Distancia.
+        """
+        linhas = []
+        for pokemon_id in pokemon_ids:
+            ids, distancias = self.vizinhos_de(pokemon_id, k)
+            nome = self.nomes[self._posicao[int(pokemon_id)]] if len(ids) else None
+            for posicao, (vizinho, distancia) in enumerate(
+                zip(ids.tolist(), distancias.tolist()), start=1
+            ):
+                linhas.append(
+                    {
+                        "Pokemon": nome,
+                        "Posicao": posicao,
+                        "Contraparte": self.nomes[self._posicao[vizinho]],
+                        "ID_Contraparte": vizinho,
+                        "Distancia": round(distancia, 3),
+                    }
+                )
+        return pd.DataFrame(
+            linhas,
+            columns=[
+                "Pokemon",
+                "Posicao",
+                "Contraparte",
+                "ID_Contraparte",
+                "Distancia",
+            ],
+        )
+
+
+# ------------------ Construção ------------------ #
+
+
+def padronizar_atributos(df_attr: pd.DataFrame) -> np.ndarray:
+    """
+    Padroniza os atributos de combate (z-score por coluna).
+
+    Args:
+        df_attr (pd.DataFrame): Atributos, com as colunas de ATRIBUTOS.
+
+    Returns:
+        np.ndarray: Matriz N x 6; ausentes e colunas constantes viram 0.
+    """
+    valores = df_attr[ATRIBUTOS].apply(pd.to_numeric, errors="coerce")
+    valores = valores.to_numpy(dtype=np.float64)
+    media = np.nanmean(valores, axis=0) if len(valores) else np.zeros(len(ATRIBUTOS))
+    desvio = np.nanstd(valores, axis=0) if len(valores) else np.ones(len(ATRIBUTOS))
+    desvio = np.where(np.isfinite(desvio) & (desvio > 0), desvio, 1.0)
+    return np.nan_to_num((valores - media) / desvio, nan=0.0)
+
+
+@medir("similaridade.construir_indice")
+def construir_indice_similaridade(
+    df_attr: pd.DataFrame, vizinhos: int = VIZINHOS, tamanho_bloco=TAMANHO_BLOCO
+) -> IndiceSimilaridade:
+    """
+    Calcula os vizinhos mais próximos de todos os Pokémon.
+
+    Args:
+        df_attr (pd.DataFrame): Colunas ID, Nome e ATRIBUTOS.
+        vizinhos (int, optional): Vizinhos guardados por Pokémon.
+        tamanho_bloco (int, optional): Linhas da matriz de distâncias por bloco.
+
+    Returns:
+        IndiceSimilaridade: Índice pronto para consulta.
+    """
+    df_attr = df_attr.drop_duplicates("ID").sort_values("ID")
+    vetores = padronizar_atributos(df_attr)
+    n = len(vetores)
+    k = max(0, min(vizinhos, n - 1))
+    normas = (vetores**2).sum(axis=1)
+
+    indices = np.empty((n, k), dtype=np.int32)
+    distancias = np.empty((n, k), dtype=np.float32)
+    for inicio in range(0, n, tamanho_bloco):
+        fim = min(inicio + tamanho_bloco, n)
+        bloco = normas[inicio:fim, None] + normas[None, :]
+        bloco -= 2.0 * (vetores[inicio:fim] @ vetores.T)
+        np.maximum(bloco, 0.0, out=bloco)  # erros de arredondamento
+        bloco[np.arange(fim - inicio), np.arange(inicio, fim)] = np.inf  # ele mesmo
+        if not k:
+            continue
+        candidatos = np.argpartition(bloco, k - 1, axis=1)[:, :k]
+        valores = np.take_along_axis(bloco, candidatos, axis=1)
+        ordem = np.argsort(valores, axis=1, kind="stable")
+        indices[inicio:fim] = np.take_along_axis(candidatos, ordem, axis=1)
+        distancias[inicio:fim] = np.sqrt(np.take_along_axis(valores, ordem, axis=1))
+
+    return IndiceSimilaridade(
+        df_attr["ID"].to_numpy(),
+        df_attr["Nome"].astype(str).to_numpy(),
+        vetores,
+        indices,
+        distancias,
+        hashlib.sha256(vetores.tobytes()).hexdigest()[:16],
+    )
+
+
+# ------------------ Persistência ------------------ #
+
+
+@medir("similaridade.salvar_indice")
+def salvar_indice_similaridade(
+    indice: IndiceSimilaridade, caminho: str = ARQUIVO_INDICE
+):
+    """
+    Persiste o índice de forma atômica em um arquivo .npz.
+
+    Args:
+        indice (IndiceSimilaridade): Índice construído.
+        caminho (str, optional): Arquivo de saída.
+    """
+    with gravar_atomico(caminho, "wb") as arquivo:
+        np.savez(
+            arquivo,
+            ids=indice.ids,
+            nomes=np.array(indice.nomes),
+            vetores=indice.vetores,
+            vizinhos=indice.vizinhos,
+            distancias=indice.distancias,
+            versao=np.array(indice.versao),
+        )
+    print(
+        f"✅ Índice de similaridade salvo em '{caminho}' "
+        f"({len(indice.ids)} Pokémon, {indice.vizinhos.shape[1]} vizinhos)."
+    )
+
+
+@medir("similaridade.carregar_indice")
+def carregar_indice_similaridade(caminho: str = ARQUIVO_INDICE):
+    """
+    Carrega o índice de similaridade do disco.
+
+    Args:
+        caminho (str, optional): Arquivo .npz gerado por `salvar_indice_similaridade`.
+
+    Returns:
+        IndiceSimilaridade ou None: Índice, ou None se o arquivo não existir.
+    """
+    if not os.path.exists(caminho):
+        return None
+    with np.load(caminho, allow_pickle=False) as dados:
+        return IndiceSimilaridade(
+            dados["ids"],
+            dados["nomes"],
+            dados["vetores"],
+            dados["vizinhos"],
+            dados["distancias"],
+            dados["versao"],
+        )
@@ -0,0 +1,429 @@
+"""
+Snapshot do Dashboard - Dados de Serviço Versionados e Mapeados em Memória
+
+A etapa `analyze` publica um snapshot imutável com tudo o que o dashboard
+exibe: resumo, figuras, estatísticas por Pokémon, combates ordenados para
+paginação, nomes e o índice de confrontos. Cada versão é um diretório em
+'out/snapshots/' com tabelas Arrow IPC sem compressão e um 'metadados.json':
+
+- Os processos do dashboard abrem as tabelas com `pyarrow.memory_map`
+  (zero-cópia): as páginas do arquivo ficam no cache do sistema operacional
+  e são compartilhadas entre todos os workers, em vez de uma cópia por
+  processo vinda do banco.
+- A versão atual é indicada pelo ponteiro 'out/snapshots/ATUAL.json',
+  substituído atomicamente após o diretório completo existir; os workers
+  passam a servir a nova versão na próxima requisição, sem reinício.
+- Servir a partir do snapshot não abre nenhuma conexão de banco: filtros,
+  ordenação e paginação usam `pyarrow.compute` e buscas binárias do NumPy.
+
+Versões antigas são removidas após a publicação (mantidas as mais recentes);
+no Linux, um worker que ainda mapeia uma versão removida continua lendo-a
+até trocar de ponteiro.
+
+Requer o pacote pyarrow; sem ele, nada é publicado e o dashboard lê do banco.
+
+Variáveis de ambiente:
+    DASHBOARD_SNAPSHOTS: Diretório dos snapshots (padrão: 'out/snapshots')
+    DASHBOARD_SNAPSHOTS_MANTIDOS: Versões mantidas em disco (padrão: 3)
+"""
+
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from checkpoint import gravar_atomico
+from consultas_paginadas import ORDENACOES_ESTATISTICAS, POR_PAGINA
+from indice_confrontos import IndiceConfrontos
+from instrumentacao import medir
+
+DIRETORIO_SNAPSHOTS = os.getenv("DASHBOARD_SNAPSHOTS", "out/snapshots")
+MANTIDOS = int(os.getenv("DASHBOARD_SNAPSHOTS_MANTIDOS", "3"))
+ARQUIVO_PONTEIRO = "ATUAL.json"
+TABELAS = ("estatisticas", "combates", "atributos", "pares")
+TABELAS_OPCIONAIS = ("ratings",)
+
+_cache = {"ponteiro": None, "assinatura": None, "snapshot": None}
+_lock = threading.Lock()
+
+
+# ------------------ Publicação ------------------ #
+
+
+def _tabelas_snapshot(df_estatisticas, df_combates, df_atributos, indice) -> dict:
+    """Monta as tabelas Arrow do snapshot (colunas NumPy contíguas, um bloco)."""
+    import pyarrow as pa
+
+    combates = df_combates[["first_pokemon", "second_pokemon", "winner"]]
+    combates = combates.to_numpy(dtype=np.int32)
+    # Ordenado por (first, second, winner): a posição da linha já é a ordem
+    # da paginação, e o lado 'first' de um Pokémon é um intervalo contíguo
+    combates = combates[np.lexsort(combates.T[::-1])]
+    tipo_ordem = np.int32 if len(combates) < 2**31 else np.int64
+    ordem_second = np.argsort(combates[:, 1], kind="stable").astype(tipo_ordem)
+
+    atributos = df_atributos[["ID", "Nome"]].drop_duplicates("ID").sort_values("ID")
+    return {
+        "estatisticas": pa.Table.from_pandas(df_estatisticas, preserve_index=False),
+        "combates": pa.table(
+            {
+                "first_pokemon": combates[:, 0].copy(),
+                "second_pokemon": combates[:, 1].copy(),
+                "winner": combates[:, 2].copy(),
+                # Lado 'second': permutação ordenada por second_pokemon e a
+                # coluna correspondente já ordenada (para searchsorted)
+                "ordem_second": ordem_second,
+                "second_ordenado": combates[ordem_second, 1],
+            }
+        ),
+        "atributos": pa.table(
+            {
+                "ID": atributos["ID"].to_numpy(dtype=np.int64),
+                "Nome": atributos["Nome"].astype(str).tolist(),
+            }
+        ),
+        "pares": pa.table(
+            {
+                "chave": indice.chaves,
+                "lutas": indice.lutas,
+                "vitorias_menor": indice.vitorias_menor,
+            }
+        ),
+    }
+
+
+@medir("snapshot.publicar_snapshot")
+def publicar_snapshot(
+    resumo: dict,
+    figuras: dict,
+    df_estatisticas: pd.DataFrame,
+    df_combates: pd.DataFrame,
+    df_atributos: pd.DataFrame,
+    indice: IndiceConfrontos,
+    df_ratings: pd.DataFrame = None,
+    diretorio: str = DIRETORIO_SNAPSHOTS,
+):
+    """
+    Publica uma nova versão do snapshot e aponta o ponteiro para ela.
+
+    Args:
+        resumo (dict): Resumo atual (`resumo_dashboard.gerar_resumo`).
+        figuras (dict): Figuras por tema (`figuras.obter_figuras`).
+        df_estatisticas (pd.DataFrame): Tabela `estatisticas_pokemon`.
+        df_combates (pd.DataFrame): Combates sem duplicados.
+        df_atributos (pd.DataFrame): Atributos (colunas ID e Nome).
+        indice (IndiceConfrontos): Índice de confrontos construído.
+        df_ratings (pd.DataFrame, optional): Ranking Elo (`rating_elo`).
+        diretorio (str, optional): Diretório dos snapshots.
+
+    Returns:
+        str ou None: Identificador da versão publicada, ou None sem pyarrow.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        print("⚠️ pyarrow não instalado: snapshot do dashboard não publicado.")
+        return None
+
+    versao = f"{datetime.now():%Y%m%dT%H%M%S%f}-{resumo['versao']}"
+    tabelas = _tabelas_snapshot(df_estatisticas, df_combates, df_atributos, indice)
+    if df_ratings is not None:
+        tabelas["ratings"] = pa.Table.from_pandas(df_ratings, preserve_index=False)
+    metadados = {
+        "versao": versao,
+        "versao_resumo": resumo["versao"],
+        "resumo": resumo,
+        "figuras": figuras,
+        "confrontos": {
+            "base": indice.base,
+            "tipos": indice.tipos,
+            "lutas_tipos": indice.lutas_tipos.tolist(),
+            "vitorias_tipos": indice.vitorias_tipos.tolist(),
+        },
+        "linhas": {nome: tabela.num_rows for nome, tabela in tabelas.items()},
+    }
+
+    # O diretório é montado com nome temporário e renomeado completo: leitores
+    # nunca enxergam uma versão pela metade
+    os.makedirs(diretorio, exist_ok=True)
+    temporario = os.path.join(diretorio, f".{versao}.tmp")
+    shutil.rmtree(temporario, ignore_errors=True)
+    os.makedirs(temporario)
+    try:
+        for nome, tabela in tabelas.items():
+            with pa.OSFile(os.path.join(temporario, f"{nome}.arrow"), "wb") as sink:
+                with pa.ipc.new_file(sink, tabela.schema) as escritor:
+                    escritor.write_table(tabela)
+        with open(
+            os.path.join(temporario, "metadados.json"), "w", encoding="utf-8"
+        ) as arquivo:
+            json.dump(metadados, arquivo, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporario, os.path.join(diretorio, versao))
+    except BaseException:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise
+
+    with gravar_atomico(
+        os.path.join(diretorio, ARQUIVO_PONTEIRO), encoding="utf-8"
+    ) as arquivo:
+        json.dump({"versao": versao}, arquivo)
+    remover_snapshots_antigos(diretorio)
+    print(f"✅ Snapshot do dashboard publicado (versão {versao}).")
+    return versao
+
+
+def remover_snapshots_antigos(diretorio: str = DIRETORIO_SNAPSHOTS, manter=MANTIDOS):
+    """
+    Remove as versões mais antigas, mantendo as `manter` mais recentes.
+
+    Args:
+        diretorio (str, optional): Diretório dos snapshots.
+        manter (int, optional): Quantidade de versões mantidas.
+    """
+    versoes = sorted(
+        nome
+        for nome in os.listdir(diretorio)
+        if not nome.startswith(".") and os.path.isdir(os.path.join(diretorio, nome))
+    )
+    for nome in versoes[: max(len(versoes) - manter, 0)]:
+        shutil.rmtree(os.path.join(diretorio, nome), ignore_errors=True)
+
+
+# ------------------ Leitura ------------------ #
+
+
+class SnapshotDashboard:
+    """
+    Versão do snapshot aberta por mapeamento de memória.
+
+    As colunas numéricas são expostas como arrays NumPy sem cópia sobre o
+    arquivo mapeado; só as linhas de uma página viram DataFrame.
+
+    Args:
+        caminho (str): Diretório da versão.
+    """
+
+    def __init__(self, caminho: str):
+        import pyarrow as pa
+
+        with open(os.path.join(caminho, "metadados.json"), encoding="utf-8") as f:
+            metadados = json.load(f)
+        self.caminho = caminho
+        self.versao = metadados["versao"]
+        self.resumo = metadados["resumo"]
+        self.figuras = metadados["figuras"]
+        self._confrontos = metadados["confrontos"]
+        self._indice = None
+
+        self.tabelas = {}
+        for nome in TABELAS + TABELAS_OPCIONAIS:
+            arquivo = os.path.join(caminho, f"{nome}.arrow")
+            if nome in TABELAS_OPCIONAIS and not os.path.exists(arquivo):
+                continue
+            mapa = pa.memory_map(arquivo, "r")
+            self.tabelas[nome] = pa.ipc.open_file(mapa).read_all()
+
+        combates = self.tabelas["combates"]
+        self._first, self._second, self._winner, self._ordem, self._second_ord = (
+            self._coluna(combates, nome)
+            for nome in (
+                "first_pokemon",
+                "second_pokemon",
+                "winner",
+                "ordem_second",
+                "second_ordenado",
+            )
+        )
+        self._ids = self._coluna(self.tabelas["atributos"], "ID")
+
+    @staticmethod
+    def _coluna(tabela, nome: str) -> np.ndarray:
+        """View NumPy sem cópia de uma coluna numérica (gravada em um bloco)."""
+        coluna = tabela.column(nome)
+        if coluna.num_chunks == 0:
+            return np.array([], dtype=coluna.type.to_pandas_dtype())
+        return coluna.chunk(0).to_numpy(zero_copy_only=True)
+
+    def ratings(self, limite: int = None):
+        """
+        Ranking Elo do snapshot.
+
+        Args:
+            limite (int, optional): Quantidade de posições (padrão: todas).
+
+        Returns:
+            pd.DataFrame ou None: Ranking, ou None se o snapshot não o contém.
+        """
+        tabela = self.tabelas.get("ratings")
+        if tabela is None:
+            return None
+        return (tabela if limite is None else tabela.slice(0, limite)).to_pandas()
+
+    def indice_confrontos(self) -> IndiceConfrontos:
+        """
+        Índice de confrontos montado sobre as colunas mapeadas.
+
+        Returns:
+            IndiceConfrontos: Índice (construído uma vez por versão e processo).
+        """
+        if self._indice is None:
+            pares = self.tabelas["pares"]
+            atributos = self.tabelas["atributos"]
+            self._indice = IndiceConfrontos(
+                self._coluna(pares, "chave"),
+                self._coluna(pares, "lutas"),
+                self._coluna(pares, "vitorias_menor"),
+                self._confrontos["base"],
+                self._confrontos["tipos"],
+                self._confrontos["lutas_tipos"],
+                self._confrontos["vitorias_tipos"],
+                self._ids,
+                atributos.column("Nome").to_pylist(),
+            )
+        return self._indice
+
+    @medir("snapshot.estatisticas")
+    def consultar_estatisticas(
+        self,
+        busca: str = "",
+        ordenar_por: str = "Lutas",
+        decrescente: bool = True,
+        pagina: int = 1,
+        por_pagina: int = None,
+        lutas_min: int = 0,
+    ) -> tuple:
+        """
+        Mesmo contrato de `consultas_paginadas.consultar_estatisticas`.
+
+        Returns:
+            tuple: (DataFrame da página, total de linhas que atendem ao filtro).
+        """
+        import pyarrow.compute as pc
+
+        if ordenar_por not in ORDENACOES_ESTATISTICAS:
+            raise ValueError(f"Ordenação inválida: {ordenar_por!r}")
+        tabela = self.tabelas["estatisticas"]
+        filtro = pc.greater_equal(tabela["Lutas"], lutas_min)
+        busca = busca.strip().lower()
+        if busca:
+            filtro = pc.and_(
+                filtro,
+                pc.match_substring(pc.utf8_lower(tabela["Pokemon"]), busca),
+            )
+        filtrada = tabela.filter(filtro)
+        ordenada = filtrada.sort_by(
+            [
+                (ordenar_por, "descending" if decrescente else "ascending"),
+                ("Pokemon", "ascending"),
+            ]
+        )
+        por_pagina = por_pagina or POR_PAGINA
+        inicio = max(pagina - 1, 0) * por_pagina
+        return ordenada.slice(inicio, por_pagina).to_pandas(), filtrada.num_rows
+
+    @medir("snapshot.combates")
+    def consultar_combates(
+        self,
+        pokemon_id: int,
+        oponente_id: int = None,
+        pagina: int = 1,
+        por_pagina: int = None,
+    ) -> tuple:
+        """
+        Mesmo contrato de `consultas_paginadas.consultar_combates`.
+
+        Os combates estão ordenados por (first, second, winner): o lado
+        'first' do Pokémon é um intervalo achado por busca binária, o lado
+        'second' vem da permutação ordenada, e a união das posições, já na
+        ordem da paginação, é fatiada antes de qualquer conversão.
+
+        Returns:
+            tuple: (DataFrame com Oponente, ID_Oponente e Resultado, total de combates).
+        """
+        pokemon_id = int(pokemon_id)
+        inicio, fim = np.searchsorted(self._first, [pokemon_id, pokemon_id + 1])
+        lado_first = np.arange(inicio, fim)
+        inicio, fim = np.searchsorted(self._second_ord, [pokemon_id, pokemon_id + 1])
+        lado_second = self._ordem[inicio:fim]
+        lado_second = lado_second[self._first[lado_second] != pokemon_id]
+        if oponente_id is not None:
+            lado_first = lado_first[self._second[lado_first] == oponente_id]
+            lado_second = lado_second[self._first[lado_second] == oponente_id]
+
+        posicoes = np.sort(np.concatenate([lado_first, lado_second]))
+        por_pagina = por_pagina or POR_PAGINA
+        inicio = max(pagina - 1, 0) * por_pagina
+        posicoes = posicoes[inicio : inicio + por_pagina]
+
+        first = self._first[posicoes]
+        oponente = np.where(first == pokemon_id, self._second[posicoes], first)
+        return (
+            pd.DataFrame(
+                {
+                    "Oponente": self._nomes(oponente),
+                    "ID_Oponente": oponente.astype(np.int64),
+                    "Resultado": np.where(
+                        self._winner[posicoes] == pokemon_id, "Vitória", "Derrota"
+                    ),
+                }
+            ),
+            len(lado_first) + len(lado_second),
+        )
+
+    def _nomes(self, ids: np.ndarray) -> list:
+        """Nomes dos IDs por busca binária na tabela de atributos (None se ausente)."""
+        posicoes = np.searchsorted(self._ids, ids).clip(0, max(len(self._ids) - 1, 0))
+        encontrados = (
+            self._ids[posicoes] == ids if len(self._ids) else np.zeros(len(ids), bool)
+        )
+        nomes = self.tabelas["atributos"].column("Nome").take(posicoes[encontrados])
+        resultado = [None] * len(ids)
+        for i, nome in zip(np.flatnonzero(encontrados), nomes.to_pylist()):
+            resultado[i] = nome
+        return resultado
+
+
+def _ler_ponteiro(diretorio: str):
+    """Versão indicada pelo ponteiro, ou None se ausente/ilegível."""
+    try:
+        caminho = os.path.join(diretorio, ARQUIVO_PONTEIRO)
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)["versao"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def snapshot_atual(diretorio: str = DIRETORIO_SNAPSHOTS):
+    """
+    Versão corrente do snapshot, reaberta apenas quando o ponteiro muda.
+
+    A verificação custa um `stat` do ponteiro por chamada; a versão aberta é
+    compartilhada por todas as sessões do processo.
+
+    Args:
+        diretorio (str, optional): Diretório dos snapshots.
+
+    Returns:
+        SnapshotDashboard ou None: Snapshot atual, ou None se não publicado.
+    """
+    with _lock:
+        try:
+            assinatura = os.stat(os.path.join(diretorio, ARQUIVO_PONTEIRO))
+            assinatura = (assinatura.st_mtime_ns, assinatura.st_ino)
+        except OSError:
+            return None
+        if assinatura == _cache["assinatura"] and _cache["ponteiro"] == diretorio:
+            return _cache["snapshot"]
+
+        versao = _ler_ponteiro(diretorio)
+        snapshot = _cache["snapshot"]
+        if versao is not None and (snapshot is None or snapshot.versao != versao):
+            try:
+                snapshot = SnapshotDashboard(os.path.join(diretorio, versao))
+            except (OSError, ImportError, ValueError):
+                # Versão removida ou ilegível: mantém a anterior (se houver)
+                return snapshot
+        _cache.update(ponteiro=diretorio, assinatura=assinatura, snapshot=snapshot)
+        return snapshot
@@ -6,15 +6,35 @@ Este módulo oferece funcionalidades para:
 - Converter tipos de colunas
 - Remover duplicados
 - Inserir dados em um banco de dados PostgreSQL via SQLAlchemy
+- Carga incremental (merge) por chave primária e hash de linha: apenas linhas
+  novas ou alteradas são gravadas, via INSERT ... ON CONFLICT DO UPDATE
 - Conectar-se ao banco e inserir dados de forma controlada
 
+Variáveis de ambiente:
+    DB_MODO_CARGA: 'merge' (padrão) ou 'replace' para as tabelas com chave
+        primária em CHAVES_PRIMARIAS; as demais são sempre substituídas.
+
 As funções foram desenhadas para trabalhar com Pandas DataFrames.
 """
 
 import io
+import os
 import pandas as pd
-from banco_conexao import obter_engine
-
+from banco_conexao import obter_engine, TAMANHO_LOTE
+from instrumentacao import medir, incrementar
+
+# Tabelas carregadas por merge e suas chaves primárias
+CHAVES_PRIMARIAS = {"pokemons": ["ID"], "atributos_pokemon": ["ID"]}
+COLUNAS_CONTROLE = ("hash_linha", "inserido_em", "atualizado_em")
+# Posição de cada combate no CSV coletado (ordem do feed), gravada pela etapa
+# load: leitores que dependem da ordem (rating Elo) ordenam por ela
+COLUNA_ORDEM_CARGA = "ordem_carga"
+# Views criadas pela etapa analyze sobre as tabelas carregadas: no PostgreSQL,
+# DROP TABLE falha enquanto elas existirem
+VIEWS_DEPENDENTES = {
+    "combates": ("combates_com_nomes",),
+    "atributos_pokemon": ("combates_com_nomes",),
+}
 
 # ------------------ Funções de Apoio ------------------ #
 
@@ -53,6 +73,7 @@ Registros Duplicados: {dataframe.duplicated().sum()}
 {desenhar_linha()}"""
 
 
+@medir("tratamento.informacoes_dataset")
 def informacoes_dataset(dataframe: pd.DataFrame, nome: str) -> str:
     """
     Retorna informações detalhadas sobre o dataset, incluindo:
@@ -129,6 +150,7 @@ def converter_tipos(df: pd.DataFrame, tipos: dict) -> pd.DataFrame:
     return df
 
 
+@medir("tratamento.remover_duplicados")
 def remover_duplicados(df: pd.DataFrame, subset=None, keep="first") -> pd.DataFrame:
     """
     Remove registros duplicados de um DataFrame.
@@ -145,6 +167,7 @@ def remover_duplicados(df: pd.DataFrame, subset=None, keep="first") -> pd.DataFr
     df_sem_dup = df.drop_duplicates(subset=subset, keep=keep)
     qtd_depois = len(df_sem_dup)
     removidos = qtd_antes - qtd_depois
+    incrementar("linhas_duplicadas_removidas", removidos)
 
     print(desenhar_linha("Remoção de Duplicados"))
     if subset:
@@ -160,6 +183,30 @@ def remover_duplicados(df: pd.DataFrame, subset=None, keep="first") -> pd.DataFr
 # ------------------ Inserção em Banco de Dados ------------------ #
 
 
+def remover_views_dependentes(engine, tabela):
+    """
+    Remove as views de VIEWS_DEPENDENTES que dependem de `tabela`, antes de
+    substituí-la. A etapa `analyze` as recria.
+
+    Args:
+        engine (Engine): Engine SQLAlchemy.
+        tabela (str): Tabela que será substituída.
+    """
+    from sqlalchemy import inspect, text
+
+    dependentes = VIEWS_DEPENDENTES.get(tabela, ())
+    if not dependentes:
+        return
+    existentes = set(inspect(engine).get_view_names())
+    views = [view for view in dependentes if view in existentes]
+    if not views:
+        return
+    with engine.begin() as conn:
+        for view in views:
+            conn.execute(text(f'DROP VIEW IF EXISTS "{view}"'))
+    print(f"♻️ Views removidas antes de substituir {tabela}: {', '.join(views)}")
+
+
 def inserir_dados(dataframe, engine, tabela):
     """
     Insere dados em uma tabela de banco via SQLAlchemy.
@@ -170,14 +217,205 @@ def inserir_dados(dataframe, engine, tabela):
         tabela (str): Nome da tabela no banco.
     """
     df = dataframe.copy()
-    df["inserido_em"] = pd.Timestamp.utcnow()  # controle temporal
-    df.to_sql(tabela, engine, if_exists="replace", index=False, method="multi")
+    if "inserido_em" not in df.columns:
+        df["inserido_em"] = pd.Timestamp.utcnow()  # controle temporal
+    remover_views_dependentes(engine, tabela)
+    with medir("banco.inserir_dados", tabela=tabela):
+        df.to_sql(
+            tabela,
+            engine,
+            if_exists="replace",
+            index=False,
+            method="multi",
+            chunksize=TAMANHO_LOTE,
+        )
+    incrementar("linhas_inseridas", len(df), tabela=tabela)
+    incrementar("bytes_inseridos", int(df.memory_usage(deep=True).sum()), tabela=tabela)
+
+
+def _texto_canonico(coluna: pd.Series) -> pd.Series:
+    """
+    Texto canônico de uma coluna para o hash: números inteiros sem '.0' (45 e
+    45.0 viram '45') e ausentes como texto vazio, qualquer que seja o dtype.
+    """
+    if pd.api.types.is_bool_dtype(coluna) or not pd.api.types.is_numeric_dtype(coluna):
+        texto = coluna.astype(str)
+    elif pd.api.types.is_integer_dtype(coluna):
+        texto = coluna.astype(str)
+    else:
+        numeros = coluna.astype("float64")
+        texto = numeros.astype(str)
+        inteiros = numeros.notna() & (numeros % 1 == 0)
+        texto[inteiros] = numeros[inteiros].astype("int64").astype(str)
+    return texto.where(coluna.notna(), "")
+
+
+def hash_linhas(df: pd.DataFrame) -> pd.Series:
+    """
+    Calcula um hash de 64 bits do conteúdo de cada linha.
+
+    Os valores são comparados como texto canônico (`_texto_canonico`), de modo
+    que o hash não depende do dtype inferido na leitura do CSV: uma coluna
+    inteira lida como float (por um valor ausente, por exemplo) não altera o
+    hash das demais linhas.
+
+    Args:
+        df (pd.DataFrame): Linhas a resumir (sem colunas de controle).
+
+    Returns:
+        pd.Series: Hash por linha (int64), alinhado ao índice de `df`.
+    """
+    canonico = pd.DataFrame(
+        {coluna: _texto_canonico(df[coluna]) for coluna in df.columns},
+        index=df.index,
+    )
+    return (
+        pd.util.hash_pandas_object(canonico, index=False)
+        .astype("int64")
+        .rename("hash_linha")
+    )
+
+
+def _preparar_tabela_merge(engine, tabela: str, df: pd.DataFrame, chave: list):
+    """
+    Garante colunas de controle e índice único da chave em uma tabela existente.
+
+    Returns:
+        bool: False se as colunas da tabela não comportam `df` (requer replace).
+    """
+    from sqlalchemy import inspect, text
+
+    colunas = {c["name"] for c in inspect(engine).get_columns(tabela)}
+    if not set(df.columns) <= colunas:
+        return False
+
+    tipo_data = (
+        "TIMESTAMP WITH TIME ZONE"
+        if engine.dialect.name == "postgresql"
+        else "TIMESTAMP"
+    )
+    tipos = {
+        "hash_linha": "BIGINT",
+        "inserido_em": tipo_data,
+        "atualizado_em": tipo_data,
+    }
+    with engine.begin() as conn:
+        for coluna in COLUNAS_CONTROLE:
+            if coluna not in colunas:
+                conn.execute(
+                    text(
+                        f'ALTER TABLE "{tabela}" ADD COLUMN "{coluna}" {tipos[coluna]}'
+                    )
+                )
+        colunas_chave = ", ".join(f'"{c}"' for c in chave)
+        conn.execute(
+            text(
+                f'CREATE UNIQUE INDEX IF NOT EXISTS "ux_{tabela}_chave" ON "{tabela}" ({colunas_chave})'
+            )
+        )
+    return True
+
+
+@medir("banco.mesclar_dados")
+def mesclar_dados(dataframe: pd.DataFrame, engine, tabela: str) -> dict:
+    """
+    Carga incremental: grava apenas as linhas novas ou alteradas.
+
+    As linhas recebidas são comparadas, pela chave primária de CHAVES_PRIMARIAS,
+    com o hash gravado no banco (lendo só chave e hash). Novas e alteradas são
+    enviadas em lotes de TAMANHO_LOTE com INSERT ... ON CONFLICT DO UPDATE:
+    `inserido_em` marca a primeira carga da linha e `atualizado_em` a última
+    alteração real. Linhas ausentes da carga não são removidas.
+
+    Args:
+        dataframe (pd.DataFrame): Dados completos do dataset.
+        engine (Engine): Engine SQLAlchemy (PostgreSQL ou SQLite).
+        tabela (str): Tabela com chave em CHAVES_PRIMARIAS.
+
+    Returns:
+        dict: Quantidade de linhas 'inseridas', 'atualizadas' e 'inalteradas'.
+    """
+    from sqlalchemy import MetaData, Table, inspect
+
+    chave = CHAVES_PRIMARIAS[tabela]
+    df = dataframe.drop(columns=[c for c in COLUNAS_CONTROLE if c in dataframe.columns])
+    df = df.drop_duplicates(subset=chave, keep="last").reset_index(drop=True)
+    df["hash_linha"] = hash_linhas(df)
+    agora = pd.Timestamp.utcnow()
+
+    if not inspect(engine).has_table(tabela) or not _preparar_tabela_merge(
+        engine, tabela, df.drop(columns="hash_linha"), chave
+    ):
+        # Primeira carga (ou esquema incompatível): cria a tabela completa
+        inserir_dados(df.assign(inserido_em=agora, atualizado_em=agora), engine, tabela)
+        _preparar_tabela_merge(engine, tabela, df, chave)
+        return {"inseridas": len(df), "atualizadas": 0, "inalteradas": 0}
+
+    colunas_chave = ", ".join(f'"{c}"' for c in chave)
+    existentes = pd.read_sql(
+        f'SELECT {colunas_chave}, hash_linha FROM "{tabela}"', engine
+    )
+    comparacao = df[chave + ["hash_linha"]].merge(
+        existentes, on=chave, how="left", suffixes=("", "_banco")
+    )
+    novas = comparacao["hash_linha_banco"].isna().to_numpy()
+    alteradas = (
+        ~novas & (comparacao["hash_linha"] != comparacao["hash_linha_banco"]).to_numpy()
+    )
+    resultado = {
+        "inseridas": int(novas.sum()),
+        "atualizadas": int(alteradas.sum()),
+        "inalteradas": int(len(df) - novas.sum() - alteradas.sum()),
+    }
+
+    mudancas = df[novas | alteradas].assign(inserido_em=agora, atualizado_em=agora)
+    if not mudancas.empty:
+        if engine.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        destino = Table(tabela, MetaData(), autoload_with=engine)
+        comando = insert(destino)
+        comando = comando.on_conflict_do_update(
+            index_elements=chave,
+            set_={
+                c: comando.excluded[c]
+                for c in mudancas.columns
+                if c not in chave and c != "inserido_em"
+            },
+        )
+        registros = (
+            mudancas.astype(object).where(mudancas.notna(), None).to_dict("records")
+        )
+        with engine.begin() as conn:
+            for inicio in range(0, len(registros), TAMANHO_LOTE):
+                conn.execute(comando, registros[inicio : inicio + TAMANHO_LOTE])
+
+    incrementar("linhas_inseridas", resultado["inseridas"], tabela=tabela)
+    incrementar("linhas_atualizadas", resultado["atualizadas"], tabela=tabela)
+    incrementar("linhas_inalteradas", resultado["inalteradas"], tabela=tabela)
+    return resultado
+
+
+def modo_carga(tabela: str) -> str:
+    """
+    Modo de carga da tabela: 'merge' para tabelas com chave primária (salvo
+    DB_MODO_CARGA=replace), 'replace' para as demais.
+    """
+    if tabela not in CHAVES_PRIMARIAS:
+        return "replace"
+    return os.getenv("DB_MODO_CARGA", "merge")
 
 
 def conectar_banco(dataframe, tabela, if_exists="replace"):
     """
     Conecta ao banco e insere dados.
 
+    Tabelas com chave em CHAVES_PRIMARIAS são carregadas por merge
+    (`mesclar_dados`), salvo DB_MODO_CARGA=replace. Falhas são relançadas:
+    uma carga incompleta não pode passar despercebida pelas etapas seguintes.
+
     Args:
         dataframe (pd.DataFrame): Dados a serem inseridos.
         tabela (str): Nome da tabela.
@@ -188,8 +426,17 @@ def conectar_banco(dataframe, tabela, if_exists="replace"):
     try:
         with engine.connect() as connection:
             print("✅ Conexão bem-sucedida")
+        if modo_carga(tabela) == "merge":
+            resultado = mesclar_dados(dataframe, engine, tabela)
+            print(
+                f"✅ Merge em {tabela}: {resultado['inseridas']} inseridas, "
+                f"{resultado['atualizadas']} atualizadas, "
+                f"{resultado['inalteradas']} inalteradas"
+            )
+        else:
             inserir_dados(dataframe, engine, tabela)
             print(f"✅ Dados inseridos na tabela {tabela}")
     except Exception as e:
         print("❌ Erro ao conectar ou inserir dados no banco")
         print(type(e).__name__, str(e))
+        raise
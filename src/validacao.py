@@ -0,0 +1,156 @@
+"""
+Validação dos Combates - Integridade Referencial e Sanidade Antes da Carga
+
+Verifica, em uma única passada vetorizada sobre os arrays NumPy do
+DataFrame (sem laço por linha), as regras que a análise assume:
+
+- first_pokemon, second_pokemon e winner são IDs inteiros preenchidos;
+- os três IDs existem em `atributos_pokemon` (pertinência vetorizada com
+  `np.isin` sobre o array único de IDs);
+- o vencedor é um dos dois Pokémon do combate;
+- um Pokémon não luta contra si mesmo.
+
+Linhas que violam alguma regra não seguem para o banco: vão para a
+quarentena em 'out/quarentena/combates.csv', com a coluna 'motivos'
+listando as regras violadas, e as contagens por regra são registradas em
+métricas e no log. Sem a validação, essas linhas viravam nomes NaN nos
+junções de `combates_com_nomes` e distorciam as estatísticas.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from checkpoint import gravar_atomico
+from instrumentacao import medir, incrementar, registrar_evento
+from tratamento_dados import desenhar_linha
+
+DIRETORIO_QUARENTENA = "out/quarentena"
+COLUNAS_COMBATES = ["first_pokemon", "second_pokemon", "winner"]
+
+# Regras na ordem do bit usado na máscara de violações
+REGRAS = (
+    "id_ausente",
+    "first_desconhecido",
+    "second_desconhecido",
+    "winner_desconhecido",
+    "winner_fora_do_combate",
+    "combate_consigo_mesmo",
+)
+
+
+# ------------------ Regras ------------------ #
+
+
+def violacoes_combates(df_combates: pd.DataFrame, ids_validos) -> np.ndarray:
+    """
+    Calcula a máscara de regras violadas por combate.
+
+    Args:
+        df_combates (pd.DataFrame): Colunas first_pokemon, second_pokemon e winner.
+        ids_validos (array-like): IDs existentes em `atributos_pokemon`.
+
+    Returns:
+        np.ndarray: Inteiro por linha; o bit i indica a violação de REGRAS[i]
+            (0 = combate válido).
+    """
+    colunas = df_combates[COLUNAS_COMBATES]
+    if all(pd.api.types.is_integer_dtype(tipo) for tipo in colunas.dtypes):
+        combates = colunas.to_numpy(dtype=np.int64)
+        ausente = np.zeros(len(combates), dtype=bool)
+    else:
+        # Texto, vazios ou decimais: só IDs inteiros preenchidos são aceitos
+        valores = colunas.apply(pd.to_numeric, errors="coerce").to_numpy(np.float64)
+        ausente = (np.isnan(valores) | (valores != np.round(valores))).any(axis=1)
+        combates = np.nan_to_num(valores, nan=-1).astype(np.int64)
+
+    ids = pd.to_numeric(pd.Series(ids_validos), errors="coerce").dropna()
+    ids = np.unique(ids.to_numpy(dtype=np.int64))
+    # Uma chamada para as três colunas; com IDs em faixa compacta o NumPy usa
+    # uma tabela de pertinência em vez de ordenar
+    conhecidos = np.isin(combates, ids)
+    first, second, winner = combates.T
+    regras = (
+        ausente,
+        ~ausente & ~conhecidos[:, 0],
+        ~ausente & ~conhecidos[:, 1],
+        ~ausente & ~conhecidos[:, 2],
+        ~ausente & (winner != first) & (winner != second),
+        ~ausente & (first == second),
+    )
+    mascara = np.zeros(len(combates), dtype=np.int64)
+    for bit, violada in enumerate(regras):
+        mascara |= violada.astype(np.int64) << bit
+    return mascara
+
+
+def _motivos(mascara: np.ndarray) -> pd.Series:
+    """Traduz cada máscara em 'regra_a,regra_b' (uma tradução por máscara distinta)."""
+    traducao = {
+        int(valor): ",".join(
+            regra for bit, regra in enumerate(REGRAS) if int(valor) >> bit & 1
+        )
+        for valor in np.unique(mascara)
+    }
+    return pd.Series(mascara).map(traducao)
+
+
+# ------------------ Etapa de Validação ------------------ #
+
+
+@medir("validacao.validar_combates")
+def validar_combates(
+    df_combates: pd.DataFrame,
+    df_atributos: pd.DataFrame,
+    quarentena: str = DIRETORIO_QUARENTENA,
+) -> pd.DataFrame:
+    """
+    Separa os combates válidos e envia os inválidos para a quarentena.
+
+    Args:
+        df_combates (pd.DataFrame): Combates (já sem duplicados).
+        df_atributos (pd.DataFrame): Atributos, com a coluna 'ID'.
+        quarentena (str, optional): Diretório da quarentena; None apenas
+            descarta as linhas inválidas, sem gravá-las.
+
+    Returns:
+        pd.DataFrame: Somente os combates válidos, com IDs inteiros.
+    """
+    mascara = violacoes_combates(df_combates, df_atributos["ID"])
+    invalidos = mascara != 0
+    contagens = {
+        regra: int((mascara >> bit & 1).sum()) for bit, regra in enumerate(REGRAS)
+    }
+
+    if quarentena:
+        caminho = os.path.join(quarentena, "combates.csv")
+        if invalidos.any():
+            rejeitados = df_combates[invalidos].assign(
+                motivos=_motivos(mascara[invalidos]).to_numpy()
+            )
+            with gravar_atomico(caminho, newline="", encoding="utf-8") as arquivo:
+                rejeitados.to_csv(arquivo, index=False)
+        elif os.path.exists(caminho):
+            os.remove(caminho)  # quarentena de uma carga anterior
+
+    for regra, quantidade in contagens.items():
+        if quantidade:
+            incrementar(
+                "linhas_quarentena", quantidade, dataset="combates", regra=regra
+            )
+    registrar_evento(
+        "validacao_combates",
+        total=len(df_combates),
+        rejeitados=int(invalidos.sum()),
+        **contagens,
+    )
+
+    print(desenhar_linha("Validação de Combates"))
+    print(f"Registros verificados: {len(df_combates)}")
+    print(f"Registros em quarentena: {int(invalidos.sum())}")
+    for regra, quantidade in contagens.items():
+        if quantidade:
+            print(f"  - {regra}: {quantidade}")
+    print(desenhar_linha())
+
+    validos = df_combates[~invalidos]
+    return validos.astype({coluna: "int64" for coluna in COLUNAS_COMBATES})